@@ -0,0 +1,82 @@
+"""
+Compare account-history queries over a synthetic ledger: scanning every transaction in Python
+(what answering "what did X send or receive over the last 30 days" took before) against the
+columnar TransactionColumns store. Also reports how long building the store takes.
+
+Usage:
+    python -m benchmarks.bench_history --transactions 1000000 --users 100000 --queries 200
+"""
+import argparse
+import random
+import time
+
+from src.storage.transaction_columns import TransactionColumns
+
+DAY = 86400.0
+
+
+def _ledger(transactions: int, users: int, days: float, seed: int) -> list:
+    rng = random.Random(seed)
+    start = time.time() - days * DAY
+    step = days * DAY / transactions
+    ledger = []
+    for i in range(transactions):
+        sender = rng.randrange(users)
+        receiver = (sender + 1 + rng.randrange(users - 1)) % users
+        ledger.append({"sender": f"user{sender}", "receiver": f"user{receiver}",
+                       "amount": round(rng.uniform(1, 500), 2), "timestamp": start + i * step})
+    return ledger
+
+
+def _scan(ledger: list, user: str, since: float) -> dict:
+    sent = received = 0.0
+    counterparties = {}
+    matches = []
+    for tx in ledger:
+        if tx["timestamp"] < since or user not in (tx["sender"], tx["receiver"]):
+            continue
+        matches.append(tx)
+        if tx["sender"] == user:
+            sent += tx["amount"]
+            other = tx["receiver"]
+        else:
+            received += tx["amount"]
+            other = tx["sender"]
+        counterparties[other] = counterparties.get(other, 0.0) + tx["amount"]
+    top = sorted(counterparties.items(), key=lambda item: -item[1])[:10]
+    return {"sent": sent, "received": received, "top": top, "transactions": matches[-100:][::-1]}
+
+
+def run(transactions: int, users: int, queries: int, days: float, seed: int) -> None:
+    ledger = _ledger(transactions, users, days * 3, seed)
+    columns = TransactionColumns()
+    started = time.perf_counter()
+    for i in range(0, len(ledger), 1000):
+        columns.append(ledger[i:i + 1000])
+    print(f"build ({transactions} txs, {users} users)   {time.perf_counter() - started:8.2f}s")
+
+    since = time.time() - days * DAY
+    rng = random.Random(seed + 1)
+    sample = [f"user{rng.randrange(users)}" for _ in range(queries)]
+    scan_queries = max(1, min(queries, 5))
+    started = time.perf_counter()
+    for user in sample[:scan_queries]:
+        _scan(ledger, user, since)
+    scan_ms = (time.perf_counter() - started) / scan_queries * 1000
+    started = time.perf_counter()
+    for user in sample:
+        columns.history(user, since=since, limit=100, top=10)
+    columnar_ms = (time.perf_counter() - started) / len(sample) * 1000
+    print(f"{days:g}-day history per query   scan {scan_ms:10.3f}ms   columnar {columnar_ms:8.3f}ms   "
+          f"x{scan_ms / columnar_ms:8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200, help="Columnar queries to time (the scan runs at most 5)")
+    parser.add_argument("--days", type=float, default=30.0, help="Query window; the ledger spans three times this")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    run(args.transactions, args.users, args.queries, args.days, args.seed)
@@ -0,0 +1,64 @@
+"""
+Measure the per-call logging overhead on the request thread: the previous style (eager
+f-string of the full payload through a synchronous StreamHandler) against the logging
+subsystem (queue handler, lazy summarized payload, sampled success logs).
+
+Usage:
+    python -m benchmarks.bench_logging --blocks 1000 --calls 2000
+"""
+import argparse
+import logging
+import os
+import time
+
+from src.utils.logging_config import configure_logging, log_success, summarize
+
+
+def _chain(blocks: int) -> dict:
+    return {
+        "chain": [{"index": i, "transactions": [{"transaction_id": f"{i:032x}", "sender": "alice",
+                                                 "receiver": "bob", "amount": 1.5, "timestamp": 1.7e9 + i}]}
+                  for i in range(blocks)],
+        "length": blocks,
+    }
+
+
+def _per_call_us(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main(blocks: int, calls: int) -> None:
+    devnull = open(os.devnull, "w")
+    data = _chain(blocks)
+
+    legacy = logging.getLogger("bench.legacy")
+    legacy.propagate = False
+    handler = logging.StreamHandler(devnull)
+    handler.setFormatter(logging.Formatter('[%(levelname)s] %(asctime)s - %(message)s'))
+    legacy.addHandler(handler)
+    legacy.setLevel(logging.INFO)
+
+    configure_logging("INFO", stream=devnull)
+    current = logging.getLogger("bench.current")
+
+    results = {
+        "eager f-string, full payload": _per_call_us(lambda: legacy.info(f"Fetched blockchain data: {data}"), calls),
+        "lazy summary, every call": _per_call_us(
+            lambda: current.info("Fetched blockchain data: %s", summarize(data)), calls),
+        "lazy summary, sampled": _per_call_us(
+            lambda: log_success(current, "Fetched blockchain data: %s", summarize(data)), calls),
+    }
+    print(f"payload: {blocks} blocks, {calls} calls")
+    for name, us in results.items():
+        print(f"  {name:32s} {us:10.2f} us/call")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blocks", type=int, default=1000, help="Blocks in the logged chain payload")
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.blocks, args.calls)
@@ -0,0 +1,47 @@
+"""
+Measure the network metrics history: the cost of recording one sample into every tier, the
+memory it holds (fixed, whatever the run length), and range queries at each resolution.
+
+Usage:
+    python -m benchmarks.bench_metrics_history --days 3 --queries 200
+"""
+import argparse
+import random
+import time
+
+from src.config.settings import settings
+from src.storage.metric_series import MetricSeries, parse_tiers
+
+HOUR = 3600.0
+
+
+def run(days: float, queries: int, tiers: str, seed: int) -> None:
+    rng = random.Random(seed)
+    series = MetricSeries(parse_tiers(tiers), max_fields=settings.METRICS_HISTORY_MAX_FIELDS)
+    samples = int(days * 24 * HOUR)
+    now = time.time()
+    started = time.perf_counter()
+    for i in range(samples):
+        series.add(now - samples + i, {"latency_ms": 5.0 + rng.random(), "throughput": 1000.0 + rng.random() * 50,
+                                       "packet_loss": rng.random() * 0.01, "peer_count": 8})
+    elapsed = time.perf_counter() - started
+    print(f"record {samples} samples ({days:g} days)   {elapsed / samples * 1e6:8.1f}us/sample   "
+          f"memory {series.nbytes / 1024:8.0f} KiB")
+
+    for label, span in (("10 minutes", 600), ("1 day", 24 * HOUR), ("all", days * 24 * HOUR)):
+        started = time.perf_counter()
+        for _ in range(queries):
+            result = series.query(now - span, now, now)
+        elapsed = (time.perf_counter() - started) / queries * 1000
+        points = len(result["fields"]["latency_ms"]["points"])
+        print(f"query {label:>10}   resolution {result['resolution']:6g}s   {points:5} points   {elapsed:8.3f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=float, default=3.0, help="Length of the simulated run, one sample per second")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--tiers", default=settings.METRICS_HISTORY_TIERS)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    run(args.days, args.queries, args.tiers, args.seed)
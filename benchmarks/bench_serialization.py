@@ -0,0 +1,81 @@
+"""
+Compare the response serialization paths on typical payloads: the previous one (plain dict
+through FastAPI's jsonable_encoder and JSONResponse's stdlib json) against FastJSONResponse
+rendering a validated model, and per-call against per-second timestamp formatting.
+
+Usage:
+    python -m benchmarks.bench_serialization --blocks 1000 --calls 2000
+"""
+import argparse
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.models.common_models import NetworkStatus, TransactionRecord, UserTransactions
+from src.utils.helper import format_timestamp
+from src.utils.responses import FastJSONResponse, dumps
+
+
+def _status(peers: int) -> dict:
+    return {
+        "node": {"hostname": "node-1", "ip": "7f000001", "port": "8443"},
+        "peer_count": peers,
+        "peers": [{"ip": f"10.0.{i // 256}.{i % 256}", "port": 8443, "supports_mtls": True} for i in range(peers)],
+    }
+
+
+def _chain(blocks: int) -> list:
+    return [{"index": i, "transactions": [{"transaction_id": f"{i:032x}", "sender": "alice", "receiver": "bob",
+                                           "amount": 1.5, "timestamp": 1.7e9 + i, "status": "success"}]}
+            for i in range(blocks)]
+
+
+def _per_call_us(fn, calls: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def _report(name: str, old_us: float, new_us: float) -> None:
+    print(f"{name:28} old {old_us:10.1f}us   new {new_us:10.1f}us   x{old_us / new_us:6.1f}")
+
+
+def run(blocks: int, peers: int, calls: int) -> None:
+    status = _status(peers)
+    _report(f"status ({peers} peers)",
+            _per_call_us(lambda: JSONResponse(jsonable_encoder(status)).body, calls),
+            _per_call_us(lambda: FastJSONResponse(NetworkStatus.model_validate(status)).body, calls))
+
+    chain = _chain(blocks)
+    transactions = {"user_id": "alice", "transactions": [block["transactions"][0] for block in chain]}
+    _report(f"ledger ({blocks} txs)",
+            _per_call_us(lambda: JSONResponse(jsonable_encoder(transactions)).body, max(1, calls // 10)),
+            _per_call_us(lambda: FastJSONResponse(UserTransactions.model_validate(transactions)).body,
+                         max(1, calls // 10)))
+    # Pre-validated records only pay for encoding.
+    records = UserTransactions(user_id="alice", transactions=[TransactionRecord(**tx) for tx in transactions["transactions"]])
+    _report("ledger, pre-validated",
+            _per_call_us(lambda: JSONResponse(jsonable_encoder(records)).body, max(1, calls // 10)),
+            _per_call_us(lambda: FastJSONResponse(records).body, max(1, calls // 10)))
+
+    _report(f"chain NDJSON ({blocks} blocks)",
+            _per_call_us(lambda: [json.dumps(b, separators=(",", ":")) + "\n" for b in chain], max(1, calls // 10)),
+            _per_call_us(lambda: [dumps(b) + b"\n" for b in chain], max(1, calls // 10)))
+
+    now = time.time()
+    _report("timestamp formatting",
+            _per_call_us(lambda: time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now)), calls * 10),
+            _per_call_us(lambda: format_timestamp(now), calls * 10))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--blocks", type=int, default=1000, help="Blocks/transactions in the chain payloads")
+    parser.add_argument("--peers", type=int, default=32, help="Peers in the status payload")
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+    run(args.blocks, args.peers, args.calls)
@@ -0,0 +1,166 @@
+"""
+Measure the cold start of the orchestrator API, so that startup regressions show up.
+
+Two numbers are reported, each as the median of --runs fresh processes:
+
+  import      seconds to import src.endpoints.system_api in a new interpreter, plus the slowest
+              top-level imports (from python -X importtime) and any of the modules that should be
+              deferred (the orchestrator and its HTTP client stack) that were loaded anyway;
+  first_response
+              seconds from spawning uvicorn to the first successful response of --path, served
+              through the fake upstreams of benchmarks.fake_upstreams.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5
+    python -m benchmarks.bench_startup --output after.json --baseline before.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List
+
+import httpx
+
+from benchmarks.load_test import _free_port, start_api, start_upstreams
+
+API_MODULE = "src.endpoints.system_api"
+# Modules that importing the API should not pull in: they are loaded when the lifespan hook
+# builds the orchestrator, or only by the blocking client methods.
+DEFERRED = ("src.orchestrator.orchestrator", "httpx", "requests", "numpy", "dotenv")
+
+_IMPORT_PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import {API_MODULE}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {DEFERRED!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import() -> dict:
+    output = subprocess.run([sys.executable, "-c", _IMPORT_PROBE], check=True, capture_output=True, text=True)
+    return json.loads(output.stdout)
+
+
+def slowest_imports(count: int) -> List[dict]:
+    """
+    The top-level imports of the API module ranked by cumulative import time.
+    """
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {API_MODULE}"],
+                            check=True, capture_output=True, text=True)
+    rows, pending = [], []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # Header line
+        # Nesting is shown by indentation and children are listed before their parent, so the
+        # one-level-deep lines just before the API module's own line are its direct imports.
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        if depth == 1:
+            pending.append({"module": name.strip(), "ms": round(int(cumulative) / 1000, 1)})
+        elif depth == 0:
+            if name.strip() == API_MODULE:
+                rows = pending
+            pending = []
+    return sorted(rows, key=lambda row: row["ms"], reverse=True)[:count]
+
+
+async def measure_first_response(urls: dict, path: str, timeout: float = 30.0) -> float:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as ledger_dir:
+        started = time.perf_counter()
+        api = start_api(urls, ledger_dir, port)
+        try:
+            async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+                while True:
+                    try:
+                        if (await client.get(path)).status_code == 200:
+                            return time.perf_counter() - started
+                    except httpx.TransportError:
+                        pass
+                    if time.perf_counter() - started > timeout:
+                        raise RuntimeError(f"No successful response from {path} within {timeout}s")
+                    await asyncio.sleep(0.005)
+        finally:
+            api.terminate()
+            api.wait()
+
+
+async def run(args) -> dict:
+    imports = [measure_import() for _ in range(args.runs)]
+    import_seconds = sorted(result["seconds"] for result in imports)
+    loaded = sorted({module for result in imports for module in result["loaded"]})
+    print(f"import        median {statistics.median(import_seconds) * 1000:8.1f}ms  "
+          f"min {import_seconds[0] * 1000:8.1f}ms", flush=True)
+    slowest = slowest_imports(args.top)
+    for row in slowest:
+        print(f"  {row['module']:40} {row['ms']:8.1f}ms")
+    if loaded:
+        print(f"  loaded at import but should be deferred: {', '.join(loaded)}")
+
+    upstreams, urls = start_upstreams(args)
+    try:
+        first = sorted([await measure_first_response(urls, args.path) for _ in range(args.runs)])
+    finally:
+        upstreams.stdin.close()
+        upstreams.wait()
+    print(f"first response median {statistics.median(first) * 1000:8.1f}ms  min {first[0] * 1000:8.1f}ms "
+          f"({args.path})", flush=True)
+
+    return {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {"runs": args.runs, "path": args.path, "latency": args.latency},
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "import": {
+            "median_ms": round(statistics.median(import_seconds) * 1000, 1),
+            "min_ms": round(import_seconds[0] * 1000, 1),
+            "slowest": slowest,
+            "loaded_deferred": loaded,
+        },
+        "first_response": {
+            "median_ms": round(statistics.median(first) * 1000, 1),
+            "min_ms": round(first[0] * 1000, 1),
+        },
+    }
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """
+    Print the change of the median import and first-response times against an earlier run.
+    """
+    print("\nchange against baseline:")
+    for key in ("import", "first_response"):
+        before, after = baseline[key]["median_ms"], report[key]["median_ms"]
+        if before:
+            print(f"{key:14} {before:8.1f}ms -> {after:8.1f}ms  {(after / before - 1) * 100:+7.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per measurement")
+    parser.add_argument("--path", default="/system/time", help="Route whose first response is timed")
+    parser.add_argument("--top", type=int, default=8, help="Slowest top-level imports to list")
+    parser.add_argument("--latency", type=float, default=0.005, help="Fake upstream base latency in seconds")
+    parser.add_argument("--output", default="startup_results.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+    # start_upstreams takes the load test's upstream options.
+    args.jitter, args.error_rate, args.seed = 0.0, 0.0, None
+
+    report = asyncio.run(run(args))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
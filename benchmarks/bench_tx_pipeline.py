@@ -0,0 +1,62 @@
+"""
+Compare transaction submission throughput with and without the batching pipeline,
+against the local fake blockchain.
+
+Usage:
+    python -m benchmarks.bench_tx_pipeline --transactions 2000 --latency 0.02
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from benchmarks.fake_blockchain import serve
+from src.api_clients.blockchain_client import BlockchainClient
+from src.api_clients.http_session import close_sessions
+from src.orchestrator.tx_pipeline import TransactionPipeline
+
+
+def _transactions(n: int) -> list:
+    return [{"sender": f"user{i % 50}", "receiver": f"user{(i + 1) % 50}", "amount": 1.0, "timestamp": time.time()}
+            for i in range(n)]
+
+
+async def run(n: int, concurrency: int, batch_size: int, linger: float, latency: float) -> None:
+    server, state = serve(latency=latency)
+    client = BlockchainClient(f"http://127.0.0.1:{server.server_address[1]}")
+    txs = _transactions(n)
+    gate = asyncio.Semaphore(concurrency)
+
+    async def unbatched(tx):
+        async with gate:
+            return await client.submit_transaction_async(tx)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(unbatched(tx) for tx in txs))
+    direct = time.perf_counter() - start
+    direct_requests, state.requests = state.requests, 0
+
+    pipeline = TransactionPipeline(client, max_queue_depth=n, max_batch_size=batch_size, linger=linger)
+    pipeline.start()
+    start = time.perf_counter()
+    records = await asyncio.gather(*(pipeline.submit(tx) for tx in txs))
+    batched = time.perf_counter() - start
+    await pipeline.stop()
+    assert len({r["transaction_id"] for r in records}) == n
+
+    print(f"unbatched: {n / direct:9.1f} tx/s  ({direct_requests} upstream requests, concurrency {concurrency})")
+    print(f"batched:   {n / batched:9.1f} tx/s  ({state.requests} upstream requests, batch {batch_size}, linger {linger}s)")
+    await close_sessions()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent unbatched submissions")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--linger", type=float, default=0.01)
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake upstream latency per request")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+    asyncio.run(run(args.transactions, args.concurrency, args.batch_size, args.linger, args.latency))
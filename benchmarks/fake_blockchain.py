@@ -0,0 +1,74 @@
+"""
+Local stand-in for the Chronos Blockchain API, for testing batching throughput offline.
+
+Every request costs a fixed latency regardless of how many transactions it carries, which is
+what makes bulk submission pay off against a real upstream.
+
+Usage:
+    python -m benchmarks.fake_blockchain --port 8601 --latency 0.02
+"""
+import argparse
+import threading
+import time
+import uuid
+
+from benchmarks.fake_upstreams import FakeUpstream, serve_upstream
+
+
+class FakeBlockchainState(FakeUpstream):
+    """
+    In-memory ledger shared by all request handlers.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = None):
+        super().__init__(latency, jitter, error_rate, seed)
+        self.chain = []
+
+    def record(self, tx: dict) -> dict:
+        record = {
+            "transaction_id": uuid.uuid4().hex,
+            "sender": tx.get("sender", ""),
+            "receiver": tx.get("receiver", ""),
+            "amount": tx.get("amount", 0),
+            "timestamp": tx.get("timestamp", time.time()),
+            "status": "success",
+        }
+        with self.lock:
+            self.chain.append({"index": len(self.chain), "transactions": [record]})
+        return record
+
+    def handle(self, method, path, query, body):
+        if method == "GET" and path == "/blockchain/chain":
+            start = int(query.get("start", ["0"])[0])
+            with self.lock:
+                chain, length = self.chain[start:], len(self.chain)
+            return 200, {"chain": chain, "length": length}
+        if method == "POST" and path == "/blockchain/transaction":
+            return 200, self.record(body)
+        if method == "POST" and path == "/blockchain/transactions":
+            return 200, {"transactions": [self.record(tx) for tx in body.get("transactions", [])]}
+        return 404, {"detail": "Not Found"}
+
+
+def serve(port: int = 0, latency: float = 0.0):
+    """
+    Start the fake upstream on a background thread.
+
+    Returns:
+        (server, state); server.server_address holds the bound port.
+    """
+    state = FakeBlockchainState(latency)
+    return serve_upstream(state, port), state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Chronos Blockchain API")
+    parser.add_argument("--port", type=int, default=8601)
+    parser.add_argument("--latency", type=float, default=0.02, help="Per-request latency in seconds")
+    args = parser.parse_args()
+    server, _ = serve(args.port, args.latency)
+    print(f"Fake blockchain listening on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,250 @@
+"""
+Local stand-ins for the Chronos Time, Currency, Blockchain and Network APIs, for load testing
+the orchestrator offline.
+
+Each fake answers the requests the API clients make with plausible payloads. Latency, jitter
+and an error rate are configurable per run; injected errors are answered with 503 so that they
+count as upstream failures in the resilience layer.
+
+Usage:
+    python -m benchmarks.fake_upstreams --latency 0.005 --jitter 0.005 --error-rate 0.01
+    python -m benchmarks.fake_upstreams --certfile server.crt --keyfile server.key --ca-file ca_cert.pem
+
+With --certfile/--keyfile the fakes serve https; adding --ca-file requires clients to present a
+certificate signed by that CA (mutual TLS).
+
+On startup one JSON line mapping each upstream's environment variable (TIME_API_URL, ...) to
+its URL is printed to stdout.
+"""
+import argparse
+import json
+import random
+import ssl
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+Reply = Tuple[int, dict]
+
+
+class FakeUpstream:
+    """
+    Behaviour shared by every fake upstream: per-request latency with jitter, random error
+    injection and request counting. Subclasses implement handle().
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.injected_errors = 0
+        self._random = random.Random(seed)
+
+    def admit(self) -> bool:
+        """
+        Count one request, sleep for its latency and decide whether it is served.
+
+        Returns:
+            False if an error should be injected for this request.
+        """
+        with self.lock:
+            self.requests += 1
+            delay = self.latency + (self._random.uniform(0.0, self.jitter) if self.jitter else 0.0)
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.injected_errors += 1
+        if delay > 0:
+            time.sleep(delay)
+        return not failed
+
+    def handle(self, method: str, path: str, query: Dict[str, list], body: dict) -> Reply:
+        raise NotImplementedError
+
+
+class FakeTimeState(FakeUpstream):
+    """
+    Chronos Time API: GET /chronos/cunix returns the local wall clock.
+    """
+
+    def handle(self, method, path, query, body):
+        if method == "GET" and path == "/chronos/cunix":
+            return 200, {"chronos_unix": time.time()}
+        return 404, {"detail": "Not Found"}
+
+
+class FakeCurrencyState(FakeUpstream):
+    """
+    Chronos Currency API: single and bulk balance lookups and transaction processing.
+    Balances are derived from the user id, so repeated runs see the same values.
+    """
+
+    @staticmethod
+    def balance(user_id: str) -> dict:
+        amount = zlib.crc32(user_id.encode()) % 100000 / 100
+        return {"balance": amount, "t_units": f"T⦀{int(amount // 30)}"}
+
+    def handle(self, method, path, query, body):
+        if method == "GET" and path == "/balance":
+            user_id = query.get("user_id", [""])[0]
+            return 200, self.balance(user_id)
+        if method == "POST" and path == "/balances":
+            return 200, {"balances": {user_id: self.balance(user_id) for user_id in body.get("user_ids", [])}}
+        if method == "POST" and path == "/transaction":
+            return 200, {"transaction_record": body, "status": "success"}
+        return 404, {"detail": "Not Found"}
+
+
+class FakeNetworkState(FakeUpstream):
+    """
+    Chronos Network API: peers, status, metrics and resync.
+    """
+
+    def __init__(self, *args, peers: int = 8, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.peers = [{"ip": f"10.0.0.{i + 1}", "port": 8443, "supports_mtls": True} for i in range(peers)]
+
+    def handle(self, method, path, query, body):
+        if method == "GET" and path == "/network/peers":
+            return 200, {"peers": self.peers}
+        if method == "GET" and path == "/network/status":
+            node = {"hostname": "fake-node", "ip": "7f000001", "port": "8443"}
+            return 200, {"node": node, "peer_count": len(self.peers), "peers": self.peers}
+        if method == "GET" and path == "/network/metrics":
+            return 200, {"latency_ms": 5.0 + self._random.random(), "throughput": 1000.0,
+                         "packet_loss": 0.0, "peer_count": len(self.peers)}
+        if method == "POST" and path == "/network/resync":
+            return 200, {"status": "resync started"}
+        return 404, {"detail": "Not Found"}
+
+
+def make_handler(state: FakeUpstream):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out in separate writes; with Nagle on, delayed ACKs add ~40ms.
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _dispatch(self, method: str) -> None:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            if not state.admit():
+                self._send(503, {"detail": "Injected failure"})
+                return
+            url = urlsplit(self.path)
+            self._send(*state.handle(method, url.path, parse_qs(url.query), body))
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+    return Handler
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Hedged and timed-out client requests are abandoned mid-response, and pooled TLS
+        # connections are dropped without close_notify; both are expected.
+        if not isinstance(sys.exc_info()[1], (ConnectionError, ssl.SSLError)):
+            super().handle_error(request, client_address)
+
+
+def server_ssl_context(certfile: str, keyfile: str, ca_file: Optional[str] = None) -> ssl.SSLContext:
+    """
+    TLS context for the fakes; with ca_file, clients must present a certificate signed by it.
+    """
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(certfile, keyfile)
+    if ca_file:
+        context.load_verify_locations(cafile=ca_file)
+        context.verify_mode = ssl.CERT_REQUIRED
+    return context
+
+
+def serve_upstream(state: FakeUpstream, port: int = 0,
+                   ssl_context: Optional[ssl.SSLContext] = None) -> ThreadingHTTPServer:
+    """
+    Serve a fake upstream on a background thread. server.server_address holds the bound port.
+    With ssl_context it serves https; the handshake runs on the connection's handler thread.
+    """
+    server = _Server(("127.0.0.1", port), make_handler(state))
+    if ssl_context is not None:
+        server.socket = ssl_context.wrap_socket(server.socket, server_side=True, do_handshake_on_connect=False)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def serve_all(latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+              seed: Optional[int] = None, ssl_context: Optional[ssl.SSLContext] = None,
+              ) -> Tuple[Dict[str, str], Dict[str, FakeUpstream], list]:
+    """
+    Start all four fake upstreams with the same behaviour.
+
+    Returns:
+        (urls, states, servers): urls maps each upstream's environment variable to its URL,
+        states maps the upstream name to its FakeUpstream.
+    """
+    from benchmarks.fake_blockchain import FakeBlockchainState
+
+    behaviour = {"latency": latency, "jitter": jitter, "error_rate": error_rate, "seed": seed}
+    states = {
+        "time": FakeTimeState(**behaviour),
+        "currency": FakeCurrencyState(**behaviour),
+        "blockchain": FakeBlockchainState(**behaviour),
+        "network": FakeNetworkState(**behaviour),
+    }
+    servers = {name: serve_upstream(state, ssl_context=ssl_context) for name, state in states.items()}
+    scheme = "https" if ssl_context is not None else "http"
+
+    def base(name: str) -> str:
+        return f"{scheme}://127.0.0.1:{servers[name].server_address[1]}"
+
+    urls = {
+        "TIME_API_URL": base("time") + "/chronos/cunix",
+        "CURRENCY_API_URL": base("currency"),
+        "BLOCKCHAIN_API_URL": base("blockchain"),
+        "NETWORK_API_URL": base("network"),
+    }
+    return urls, states, list(servers.values())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Chronos upstream APIs")
+    parser.add_argument("--latency", type=float, default=0.005, help="Base latency per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra uniform random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--certfile", default=None, help="Serve https with this certificate")
+    parser.add_argument("--keyfile", default=None, help="Private key of --certfile")
+    parser.add_argument("--ca-file", default=None, help="Require client certificates signed by this CA")
+    args = parser.parse_args()
+    context = server_ssl_context(args.certfile, args.keyfile, args.ca_file) if args.certfile else None
+    urls, _, servers = serve_all(args.latency, args.jitter, args.error_rate, args.seed, ssl_context=context)
+    print(json.dumps(urls), flush=True)
+    try:
+        # Exit with the parent: stdin closes when the process that started us goes away.
+        sys.stdin.read()
+    except KeyboardInterrupt:
+        pass
+    for server in servers:
+        server.shutdown()
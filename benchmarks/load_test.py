@@ -0,0 +1,257 @@
+"""
+Load test the system API routes against local fake upstreams and record throughput and latency.
+
+Three processes run on the local machine: the fake Time/Currency/Blockchain/Network upstreams,
+the orchestrator API under uvicorn, and this load generator. For every endpoint and every
+concurrency level, that many closed-loop workers issue requests back to back for --duration
+seconds; req/s and p50/p95/p99 latency are reported and written to a JSON file.
+
+Usage:
+    python -m benchmarks.load_test --concurrency 1,8,32 --duration 5 --latency 0.005 --jitter 0.005
+    python -m benchmarks.load_test --endpoints time,balance --output before.json
+    python -m benchmarks.load_test --output after.json --baseline before.json
+    python -m benchmarks.load_test --certfile server.crt --keyfile server.key --ca-file ca_cert.pem
+
+With --certfile/--keyfile/--ca-file the upstreams require mutual TLS and the API connects with
+USE_TLS on, using the same certificate as its client certificate; the TLS handshake counters
+are printed at the end of the run.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+# name -> builder of (method, path, json body) for the i-th request of a worker.
+Request = Tuple[str, str, Optional[dict]]
+ENDPOINTS: Dict[str, Callable[[int], Request]] = {
+    "time": lambda i: ("GET", "/system/time", None),
+    "balance": lambda i: ("GET", f"/system/balance?user_id=user{i % 1000}", None),
+    "balances": lambda i: ("POST", "/system/balances", {"user_ids": [f"user{(i + k) % 1000}" for k in range(10)]}),
+    "transaction": lambda i: ("POST", "/system/transaction",
+                              {"sender": f"user{i % 1000}", "receiver": f"user{(i + 1) % 1000}",
+                               "amount": 1.0, "timestamp": time.time()}),
+    "status": lambda i: ("GET", "/system/status", None),
+    "snapshot": lambda i: ("GET", f"/system/snapshot?user_id=user{i % 1000}", None),
+    "ledger": lambda i: ("GET", f"/system/ledger/transactions?user_id=user{i % 1000}&limit=20", None),
+}
+
+
+def create_app():
+    """
+    Application factory for uvicorn: the system API router mounted on a bare FastAPI app.
+    """
+    from fastapi import FastAPI
+    from src.endpoints.system_api import router
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_upstreams(args) -> Tuple[subprocess.Popen, Dict[str, str]]:
+    command = [sys.executable, "-m", "benchmarks.fake_upstreams", "--latency", str(args.latency),
+               "--jitter", str(args.jitter), "--error-rate", str(args.error_rate)]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+    if getattr(args, "certfile", None):
+        command += ["--certfile", args.certfile, "--keyfile", args.keyfile]
+        if args.ca_file:
+            command += ["--ca-file", args.ca_file]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    urls = json.loads(process.stdout.readline())
+    return process, urls
+
+
+def tls_env(args) -> Dict[str, str]:
+    """
+    Environment enabling mTLS from the API to the upstreams, when the run uses TLS.
+    """
+    if not getattr(args, "certfile", None):
+        return {}
+    return {"USE_TLS": "true", "CERTFILE": os.path.abspath(args.certfile), "KEYFILE": os.path.abspath(args.keyfile),
+            "CA_FILE": os.path.abspath(args.ca_file or args.certfile)}
+
+
+def start_api(urls: Dict[str, str], ledger_dir: str, port: int, extra_env: Dict[str, str] = None) -> subprocess.Popen:
+    env = dict(os.environ, **urls, **(extra_env or {}), LEDGER_DIR=ledger_dir,
+               OUTBOX_DIR=os.path.join(ledger_dir, "outbox"), LOG_LEVEL="WARNING")
+    command = [sys.executable, "-m", "uvicorn", "benchmarks.load_test:create_app", "--factory",
+               "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"]
+    return subprocess.Popen(command, env=env)
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while True:
+            try:
+                if (await client.get("/system/upstreams")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"API at {base_url} did not become ready within {timeout}s")
+            await asyncio.sleep(0.1)
+
+
+async def run_level(client: httpx.AsyncClient, endpoint: str, concurrency: int, duration: float) -> dict:
+    """
+    Drive one endpoint with `concurrency` closed-loop workers for `duration` seconds.
+    """
+    build = ENDPOINTS[endpoint]
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    stop_at = time.perf_counter() + duration
+
+    async def worker(worker_id: int) -> None:
+        i = worker_id
+        while time.perf_counter() < stop_at:
+            method, path, body = build(i)
+            i += concurrency
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if not status.startswith("2"))
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": statuses,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+async def run(args) -> dict:
+    endpoints = args.endpoints.split(",")
+    unknown = [name for name in endpoints if name not in ENDPOINTS]
+    if unknown:
+        raise SystemExit(f"Unknown endpoint(s): {', '.join(unknown)}; choose from {', '.join(ENDPOINTS)}")
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    upstreams, urls = start_upstreams(args)
+    port = _free_port()
+    with tempfile.TemporaryDirectory() as ledger_dir:
+        api = start_api(urls, ledger_dir, port, tls_env(args))
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            await wait_ready(base_url)
+            limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+            results = []
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+                for endpoint in endpoints:
+                    if args.warmup > 0:
+                        await run_level(client, endpoint, min(levels), args.warmup)
+                    for concurrency in levels:
+                        result = await run_level(client, endpoint, concurrency, args.duration)
+                        results.append(result)
+                        print(f"{endpoint:12} c={concurrency:<4} {result['rps']:9.1f} req/s  "
+                              f"p50 {result['p50_ms']:8.2f}ms  p95 {result['p95_ms']:8.2f}ms  "
+                              f"p99 {result['p99_ms']:8.2f}ms  errors {result['errors']}", flush=True)
+                if tls_env(args):
+                    metrics = (await client.get("/metrics")).text
+                    handshakes = [line for line in metrics.splitlines()
+                                  if line.startswith("chronos_tls_handshakes_total")]
+                    print("\n" + "\n".join(handshakes or ["no TLS handshakes recorded"]), flush=True)
+        finally:
+            api.terminate()
+            api.wait()
+            upstreams.stdin.close()
+            upstreams.wait()
+
+    return {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {
+            "endpoints": endpoints,
+            "concurrency": levels,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "error_rate": args.error_rate,
+            "seed": args.seed,
+        },
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict) -> None:
+    """
+    Print the req/s and p99 change of each (endpoint, concurrency) pair present in both runs.
+    """
+    previous = {(r["endpoint"], r["concurrency"]): r for r in baseline["results"]}
+    print("\nchange against baseline:")
+    for result in report["results"]:
+        before = previous.get((result["endpoint"], result["concurrency"]))
+        if before is None or not before["rps"] or not before["p99_ms"]:
+            continue
+        rps = (result["rps"] / before["rps"] - 1) * 100
+        p99 = (result["p99_ms"] / before["p99_ms"] - 1) * 100
+        print(f"{result['endpoint']:12} c={result['concurrency']:<4} req/s {rps:+7.1f}%  p99 {p99:+7.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma-separated endpoint names")
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per endpoint and concurrency level")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds of unrecorded load before each endpoint")
+    parser.add_argument("--latency", type=float, default=0.005, help="Fake upstream base latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Fake upstream extra random latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of upstream requests failing with 503")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for upstream jitter and error injection")
+    parser.add_argument("--output", default="load_test_results.json", help="Where to write the JSON report")
+    parser.add_argument("--baseline", default=None, help="Earlier JSON report to compare against")
+    parser.add_argument("--certfile", default=None, help="Serve the upstreams over mTLS with this certificate")
+    parser.add_argument("--keyfile", default=None, help="Private key of --certfile")
+    parser.add_argument("--ca-file", default=None, help="CA that signed --certfile (defaults to --certfile)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
@@ -0,0 +1,172 @@
+import logging
+import math
+import time
+from typing import Dict, Optional
+
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EwmaStats:
+    """
+    Exponentially weighted mean and variance of a stream of values, updated in O(1).
+
+    The anomaly score of a value is its distance from the running mean in running standard
+    deviations, measured before the value is folded in; it stays 0 until warmup values have
+    been seen, so the first few observations do not look anomalous against an empty history.
+    """
+    __slots__ = ("alpha", "warmup", "count", "mean", "variance", "last", "score")
+
+    def __init__(self, alpha: float, warmup: int):
+        self.alpha = alpha
+        self.warmup = warmup
+        self.count = 0
+        self.mean = 0.0
+        self.variance = 0.0
+        self.last = 0.0
+        self.score = 0.0
+
+    def update(self, value: float) -> float:
+        if self.count == 0:
+            self.mean = value
+        else:
+            diff = value - self.mean
+            std = math.sqrt(self.variance)
+            self.score = abs(diff) / std if self.count >= self.warmup and std > 0 else 0.0
+            increment = self.alpha * diff
+            self.mean += increment
+            self.variance = (1 - self.alpha) * (self.variance + diff * increment)
+        self.count += 1
+        self.last = value
+        return self.score
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class DecayingRate:
+    """
+    Events (or amounts) per second over a sliding exponential window, updated in O(1).
+
+    The accumulated total decays with the given half-life; at a steady rate r it settles at
+    r * half_life / ln 2, which is what rate() divides back out.
+    """
+    __slots__ = ("decay", "total", "updated_at")
+
+    def __init__(self, half_life: float):
+        self.decay = math.log(2) / half_life
+        self.total = 0.0
+        self.updated_at: Optional[float] = None
+
+    def add(self, amount: float, now: float) -> None:
+        self.total = self._decayed(now) + amount
+        self.updated_at = now
+
+    def _decayed(self, now: float) -> float:
+        if self.updated_at is None:
+            return 0.0
+        return self.total * math.exp(-self.decay * max(0.0, now - self.updated_at))
+
+    def rate(self, now: float) -> float:
+        return self._decayed(now) * self.decay
+
+
+class AIClient:
+    """
+    Local, streaming insights engine behind the AI insights endpoint.
+
+    Instead of a round trip to the Chronos AI API, insights are derived from what the
+    orchestrator already sees: accepted transactions, the latency and failures of every
+    upstream call, and the network metrics sampled by the metrics history collector. Each
+    observation updates a few running statistics in O(1), and get_insights() only formats
+    the current values, so it is served from memory.
+
+    Reported per stream: EWMA mean and standard deviation, the anomaly score of the latest
+    observation (see EwmaStats), and for event streams a decaying per-second rate. The overall
+    "anomaly_score" is the largest current score.
+    """
+
+    def __init__(self, alpha: float = None, half_life: float = None, warmup: int = None):
+        self.alpha = alpha or settings.AI_EWMA_ALPHA
+        self.half_life = half_life or settings.AI_RATE_HALF_LIFE
+        self.warmup = warmup or settings.AI_ANOMALY_WARMUP
+        self.tx_amount = self._stats()
+        self.tx_rate = DecayingRate(self.half_life)
+        self.tx_volume = DecayingRate(self.half_life)
+        self.latency: Dict[str, EwmaStats] = {}
+        self.errors: Dict[str, EwmaStats] = {}
+        self.network: Dict[str, EwmaStats] = {}
+        logger.info("AIClient computing insights locally (alpha=%s, half-life=%ss)", self.alpha, self.half_life)
+
+    def _stats(self) -> EwmaStats:
+        return EwmaStats(self.alpha, self.warmup)
+
+    def observe_transaction(self, amount: float, now: float = None) -> None:
+        now = now if now is not None else time.monotonic()
+        self.tx_amount.update(amount)
+        self.tx_rate.add(1.0, now)
+        self.tx_volume.add(amount, now)
+
+    def observe_latency(self, upstream: str, seconds: float, failed: bool) -> None:
+        """
+        Record one upstream call; only successful calls contribute latency samples.
+        """
+        errors = self.errors.get(upstream)
+        if errors is None:
+            errors = self.errors[upstream] = self._stats()
+            self.latency[upstream] = self._stats()
+        errors.update(1.0 if failed else 0.0)
+        if not failed:
+            self.latency[upstream].update(seconds * 1000)
+
+    def observe_network(self, metrics: dict) -> None:
+        """
+        Record the numeric fields of one network metrics sample.
+        """
+        for name, value in metrics.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            stats = self.network.get(name)
+            if stats is None:
+                stats = self.network[name] = self._stats()
+            stats.update(float(value))
+
+    def get_insights(self) -> dict:
+        """
+        Current insights.
+
+        Returns:
+            {"insights": {name: value}, "timestamp": ...}, matching the AIMetrics model.
+        """
+        now = time.monotonic()
+        insights = {
+            "tx_count": float(self.tx_amount.count),
+            "tx_rate_per_s": self.tx_rate.rate(now),
+            "tx_volume_per_s": self.tx_volume.rate(now),
+            "tx_amount_mean": self.tx_amount.mean,
+            "tx_amount_std": self.tx_amount.std,
+            "tx_amount_anomaly": self.tx_amount.score,
+        }
+        scores = [self.tx_amount.score]
+        for upstream, stats in list(self.latency.items()):
+            insights[f"upstream_{upstream}_latency_ms_mean"] = stats.mean
+            insights[f"upstream_{upstream}_latency_ms_std"] = stats.std
+            insights[f"upstream_{upstream}_latency_anomaly"] = stats.score
+            # The mean of 0/1 failure indicators is the recent error rate.
+            insights[f"upstream_{upstream}_error_rate"] = self.errors[upstream].mean
+            scores.append(stats.score)
+        for name, stats in list(self.network.items()):
+            insights[f"network_{name}_mean"] = stats.mean
+            insights[f"network_{name}_std"] = stats.std
+            insights[f"network_{name}_anomaly"] = stats.score
+            scores.append(stats.score)
+        insights["anomaly_score"] = max(scores)
+        return {"insights": insights, "timestamp": time.time()}
+
+    async def get_insights_async(self) -> dict:
+        """
+        Async variant of get_insights; nothing is awaited, as insights are kept in memory.
+        """
+        return self.get_insights()
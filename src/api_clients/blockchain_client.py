@@ -1,9 +1,18 @@
+import asyncio
 import os
-import requests
+from typing import AsyncIterator, Iterator
+
+import httpx
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(asctime)s - %(message)s')
+from src.api_clients.http_session import get_session
+from src.api_clients.endpoint_pool import EndpointPool, pool_urls
+from src.api_clients.resilience import get_guard, is_failure
+from src.utils.json_stream import JsonArrayStream
+from src.utils.logging_config import configure_logging, log_success, summarize
+from src.utils.metrics import instrumented
+
+logger = logging.getLogger(__name__)
 
 
 class BlockchainClient:
@@ -16,45 +25,218 @@ class BlockchainClient:
         """
         Initialize the BlockchainClient.
         The base_url is loaded from the environment variable BLOCKCHAIN_API_URL if not provided.
+        Additional read replicas are taken from the comma-separated BLOCKCHAIN_API_REPLICAS.
         """
         self.base_url = base_url or os.getenv("BLOCKCHAIN_API_URL", "https://chronosblockchain.example.com")
-        logging.info(f"BlockchainClient configured with base URL: {self.base_url}")
+        self.guard = get_guard("blockchain")
+        # Submissions get their own breaker and a fixed timeout, and are never hedged: a slow
+        # bulk POST must neither trip the breaker for reads nor be cut short by the read timeout.
+        self.write_guard = get_guard("blockchain_write", adaptive=False)
+        # Replicas serve reads; writes stay on base_url.
+        self.pool = EndpointPool("blockchain", pool_urls(self.base_url, os.getenv("BLOCKCHAIN_API_REPLICAS", "")))
+        # Flipped off the first time the upstream answers that it has no bulk submission endpoint.
+        self.bulk_supported = True
+        logger.info("BlockchainClient configured with base URL: %s", self.base_url)
 
+    @instrumented("blockchain_client")
     def get_chain(self) -> dict:
         """
         Retrieve the current blockchain ledger.
         Expects a JSON response, for example: {"chain": [...], "length": <int>}
         """
+        import requests  # Only the blocking methods use requests; keeps it off the API startup path
         try:
             url = f"{self.base_url}/blockchain/chain"
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
+            response = self.guard.request_sync(lambda timeout: requests.get(url, timeout=timeout))
+            data = response.json()
+            log_success(logger, "Fetched blockchain data: %s", summarize(data))
+            return data
+        except Exception as e:
+            logger.error("Failed to fetch blockchain data: %s", e)
+            raise
+
+    @instrumented("blockchain_client")
+    async def get_chain_async(self) -> dict:
+        """
+        Async variant of get_chain using the shared pooled session for this upstream.
+        """
+        try:
+            response = await self.guard.request(lambda: self.pool.send(
+                lambda base: get_session(base).get(f"{base}/blockchain/chain")))
             data = response.json()
-            logging.info(f"Fetched blockchain data: {data}")
+            log_success(logger, "Fetched blockchain data: %s", summarize(data))
             return data
         except Exception as e:
-            logging.error(f"Failed to fetch blockchain data: {e}")
+            logger.error("Failed to fetch blockchain data: %s", e)
             raise
 
+    def stream_chain(self, chunk_size: int = 65536) -> Iterator[dict]:
+        """
+        Stream the blockchain ledger block by block.
+        The response body is read and parsed incrementally, so memory stays bounded by the
+        largest block rather than the whole chain.
+
+        Yields:
+            Each block of the chain, in order.
+        """
+        url = f"{self.base_url}/blockchain/chain"
+        parser = JsonArrayStream("chain")
+        count = 0
+        import requests
+        try:
+            with requests.get(url, timeout=self.guard.timeout(), stream=True) as response:
+                response.raise_for_status()
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    for block in parser.feed(chunk):
+                        count += 1
+                        yield block
+            log_success(logger, "Streamed %s blocks from the blockchain", count)
+        except Exception as e:
+            logger.error("Failed to stream blockchain data after %s blocks: %s", count, e)
+            raise
+
+    async def stream_chain_async(self, start_height: int = 0) -> AsyncIterator[dict]:
+        """
+        Async variant of stream_chain using the shared pooled session.
+        Starts at start_height (see get_blocks_async for how the parameter is sent).
+
+        The request goes through the upstream's guard: an open circuit fails it at once, the
+        adaptive timeout bounds the wait for the response headers, and the outcome is counted
+        by the breaker. Blocks then arrive under the session's read timeout.
+
+        An upstream that ignores the parameter streams the whole ledger: recognised by a first
+        block with "index" 0, its first start_height blocks are skipped.
+        """
+        url = f"{self.base_url}/blockchain/chain"
+        session = get_session(self.base_url)
+
+        async def open_stream() -> httpx.Response:
+            response = await session.send(session.build_request("GET", url, params={"start": start_height}),
+                                          stream=True)
+            if response.is_error:
+                await response.aclose()
+            response.raise_for_status()
+            return response
+
+        parser = JsonArrayStream("chain")
+        count = 0
+        skip = None
+        response = None
+        try:
+            response = await self.guard.call(open_stream)
+            try:
+                async for chunk in response.aiter_bytes():
+                    for block in parser.feed(chunk):
+                        if skip is None:
+                            skip = start_height if start_height and block.get("index") == 0 else 0
+                        if skip:
+                            skip -= 1
+                            continue
+                        count += 1
+                        yield block
+            finally:
+                await response.aclose()
+            log_success(logger, "Streamed %s blocks from the blockchain", count)
+        except Exception as e:
+            if response is not None and is_failure(e):
+                # The guard only saw the headers arrive; a body cut short counts against the upstream too.
+                self.guard.breaker.record_failure()
+            logger.error("Failed to stream blockchain data after %s blocks: %s", count, e)
+            raise
+
+    @instrumented("blockchain_client")
+    async def get_blocks_async(self, start_height: int) -> list:
+        """
+        Retrieve only the blocks at or after start_height.
+
+        Sends GET /blockchain/chain?start=<start_height>. An upstream that ignores the parameter
+        returns the whole ledger (len(chain) == length), in which case the known prefix is dropped.
+        """
+        try:
+            response = await self.guard.request(lambda: self.pool.send(
+                lambda base: get_session(base).get(f"{base}/blockchain/chain", params={"start": start_height})))
+            data = response.json()
+            blocks = data.get("chain", [])
+            if start_height and len(blocks) == data.get("length"):
+                blocks = blocks[start_height:]
+            log_success(logger, "Fetched %s blocks from height %s", len(blocks), start_height)
+            return blocks
+        except Exception as e:
+            logger.error("Failed to fetch blocks from height %s: %s", start_height, e)
+            raise
+
+    @instrumented("blockchain_client")
     def submit_transaction(self, transaction_data: dict) -> dict:
         """
         Submit a transaction to the blockchain.
         Expects a POST endpoint that processes the transaction and returns a transaction record.
         """
+        import requests
         try:
             url = f"{self.base_url}/blockchain/transaction"
-            response = requests.post(url, json=transaction_data, timeout=5)
-            response.raise_for_status()
+            response = self.write_guard.request_sync(lambda timeout: requests.post(url, json=transaction_data, timeout=timeout))
+            data = response.json()
+            log_success(logger, "Transaction submitted: %s", summarize(data))
+            return data
+        except Exception as e:
+            logger.error("Failed to submit transaction: %s", e)
+            raise
+
+    @instrumented("blockchain_client")
+    async def submit_transaction_async(self, transaction_data: dict) -> dict:
+        """
+        Async variant of submit_transaction using the shared pooled session for this upstream.
+        """
+        try:
+            url = f"{self.base_url}/blockchain/transaction"
+            response = await self.write_guard.request(lambda: get_session(self.base_url).post(url, json=transaction_data))
             data = response.json()
-            logging.info(f"Transaction submitted: {data}")
+            log_success(logger, "Transaction submitted: %s", summarize(data))
             return data
         except Exception as e:
-            logging.error(f"Failed to submit transaction: {e}")
+            logger.error("Failed to submit transaction: %s", e)
             raise
 
+    @instrumented("blockchain_client")
+    async def submit_transactions_async(self, transactions: list) -> list:
+        """
+        Submit several transactions in one request.
+
+        Uses the bulk endpoint POST /blockchain/transactions, which expects
+        {"transactions": [...]} and returns {"transactions": [<record>, ...]} in the same order.
+        If the upstream does not offer the bulk endpoint, falls back to concurrent single
+        submissions over the pooled session.
+
+        Returns:
+            One entry per transaction: its record, or the Exception raised for it.
+        """
+        if self.bulk_supported:
+            try:
+                url = f"{self.base_url}/blockchain/transactions"
+                response = await self.write_guard.request(
+                    lambda: get_session(self.base_url).post(url, json={"transactions": transactions}))
+                records = response.json().get("transactions", [])
+                if len(records) != len(transactions):
+                    raise ValueError(f"Bulk submission returned {len(records)} records for {len(transactions)} transactions")
+                log_success(logger, "Submitted batch of %s transactions", len(records))
+                return records
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in (404, 405, 501):
+                    logger.error("Failed to submit batch of %s transactions: %s", len(transactions), e)
+                    raise
+                logger.warning("Blockchain API has no bulk submission endpoint; falling back to single submissions")
+                self.bulk_supported = False
+            except Exception as e:
+                logger.error("Failed to submit batch of %s transactions: %s", len(transactions), e)
+                raise
+
+        return list(await asyncio.gather(*(self.submit_transaction_async(tx) for tx in transactions),
+                                         return_exceptions=True))
+
 
 # Standalone demo:
 if __name__ == "__main__":
+    configure_logging()
     client = BlockchainClient()
     try:
         chain = client.get_chain()
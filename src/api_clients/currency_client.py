@@ -1,9 +1,15 @@
+import asyncio
 import os
-import requests
+import httpx
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(asctime)s - %(message)s')
+from src.api_clients.http_session import get_session
+from src.api_clients.endpoint_pool import EndpointPool, pool_urls
+from src.api_clients.resilience import get_guard
+from src.utils.logging_config import configure_logging, log_success, summarize
+from src.utils.metrics import instrumented
+
+logger = logging.getLogger(__name__)
 
 
 class CurrencyClient:
@@ -17,10 +23,20 @@ class CurrencyClient:
         Initialize the CurrencyClient.
 
         The base_url is loaded from the environment variable CURRENCY_API_URL if not provided.
+        Additional read replicas are taken from the comma-separated CURRENCY_API_REPLICAS.
         """
         self.base_url = base_url or os.getenv("CURRENCY_API_URL", "https://chronoscurrency.example.com")
-        logging.info(f"CurrencyClient configured with base URL: {self.base_url}")
-
+        self.guard = get_guard("currency")
+        # Writes get their own breaker and a fixed timeout (see UpstreamGuard): a slow write must
+        # neither be cut short by the read-fitted timeout nor count against reads.
+        self.write_guard = get_guard("currency_write", adaptive=False)
+        # Replicas serve reads; writes stay on base_url.
+        self.pool = EndpointPool("currency", pool_urls(self.base_url, os.getenv("CURRENCY_API_REPLICAS", "")))
+        # Flipped off the first time the upstream answers that it has no bulk balance endpoint.
+        self.bulk_supported = True
+        logger.info("CurrencyClient configured with base URL: %s", self.base_url)
+
+    @instrumented("currency_client")
     def get_balance(self, user_id: str) -> dict:
         """
         Retrieve the balance for a given user.
@@ -34,17 +50,71 @@ class CurrencyClient:
         Raises:
             Exception: if the request fails.
         """
+        import requests  # Only the blocking methods use requests; keeps it off the API startup path
         try:
             url = f"{self.base_url}/balance?user_id={user_id}"
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
+            response = self.guard.request_sync(lambda timeout: requests.get(url, timeout=timeout))
+            balance_data = response.json()
+            log_success(logger, "Fetched balance for %s: %s", user_id, summarize(balance_data))
+            return balance_data
+        except Exception as e:
+            logger.error("Failed to get balance for user %s: %s", user_id, e)
+            raise
+
+    @instrumented("currency_client")
+    async def get_balance_async(self, user_id: str) -> dict:
+        """
+        Async variant of get_balance using the shared pooled session for this upstream.
+        """
+        try:
+            response = await self.guard.request(lambda: self.pool.send(
+                lambda base: get_session(base).get(f"{base}/balance", params={"user_id": user_id})), hedge=True)
             balance_data = response.json()
-            logging.info(f"Fetched balance for {user_id}: {balance_data}")
+            log_success(logger, "Fetched balance for %s: %s", user_id, summarize(balance_data))
             return balance_data
         except Exception as e:
-            logging.error(f"Failed to get balance for user {user_id}: {e}")
+            logger.error("Failed to get balance for user %s: %s", user_id, e)
             raise
 
+    @instrumented("currency_client")
+    async def get_balances_async(self, user_ids: list) -> dict:
+        """
+        Retrieve the balances of several users in as few upstream requests as possible.
+
+        Uses the bulk endpoint POST /balances, which expects {"user_ids": [...]} and returns
+        {"balances": {<user_id>: {"balance": ..., "t_units": ...}, ...}}. If the upstream does
+        not offer the bulk endpoint, falls back to concurrent single lookups over the pooled session.
+
+        Returns:
+            A dictionary mapping each user id to its balance data, or to the Exception raised for it.
+        """
+        if self.bulk_supported:
+            try:
+                response = await self.guard.request(lambda: self.pool.send(
+                    lambda base: get_session(base).post(f"{base}/balances", json={"user_ids": list(user_ids)})),
+                    hedge=True)
+                balances = response.json().get("balances", {})
+                log_success(logger, "Fetched balances for %s of %s users", len(balances), len(user_ids))
+                return {
+                    user_id: balances[user_id] if user_id in balances
+                    else LookupError(f"No balance returned for user {user_id}")
+                    for user_id in user_ids
+                }
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in (404, 405, 501):
+                    logger.error("Failed to get balances for %s users: %s", len(user_ids), e)
+                    raise
+                logger.warning("Currency API has no bulk balance endpoint; falling back to single lookups")
+                self.bulk_supported = False
+            except Exception as e:
+                logger.error("Failed to get balances for %s users: %s", len(user_ids), e)
+                raise
+
+        results = await asyncio.gather(*(self.get_balance_async(user_id) for user_id in user_ids),
+                                       return_exceptions=True)
+        return dict(zip(user_ids, results))
+
+    @instrumented("currency_client")
     def process_transaction(self, transaction_data: dict) -> dict:
         """
         Process a currency transaction via the Chronos Currency API.
@@ -60,20 +130,36 @@ class CurrencyClient:
         Raises:
             Exception: if the transaction processing fails.
         """
+        import requests
+        try:
+            url = f"{self.base_url}/transaction"
+            response = self.write_guard.request_sync(lambda timeout: requests.post(url, json=transaction_data, timeout=timeout))
+            tx_data = response.json()
+            log_success(logger, "Processed transaction: %s", summarize(tx_data))
+            return tx_data
+        except Exception as e:
+            logger.error("Failed to process transaction: %s", e)
+            raise
+
+    @instrumented("currency_client")
+    async def process_transaction_async(self, transaction_data: dict) -> dict:
+        """
+        Async variant of process_transaction using the shared pooled session for this upstream.
+        """
         try:
             url = f"{self.base_url}/transaction"
-            response = requests.post(url, json=transaction_data, timeout=5)
-            response.raise_for_status()
+            response = await self.write_guard.request(lambda: get_session(self.base_url).post(url, json=transaction_data))
             tx_data = response.json()
-            logging.info(f"Processed transaction: {tx_data}")
+            log_success(logger, "Processed transaction: %s", summarize(tx_data))
             return tx_data
         except Exception as e:
-            logging.error(f"Failed to process transaction: {e}")
+            logger.error("Failed to process transaction: %s", e)
             raise
 
 
 # Standalone demo
 if __name__ == "__main__":
+    configure_logging()
     client = CurrencyClient()
 
     # Demo: Get balance for a dummy user.
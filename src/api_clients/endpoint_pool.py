@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import random
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+
+import httpx
+
+from src.api_clients.resilience import is_failure
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Endpoint:
+    """
+    One replica of an upstream API and its observed health.
+    """
+    __slots__ = ("base_url", "discovered", "ewma", "samples", "observed_at", "in_flight", "failures", "ejections",
+                 "ejected_until")
+
+    def __init__(self, base_url: str, discovered: bool = False):
+        self.base_url = base_url
+        self.discovered = discovered
+        self.ewma = 0.0             # Smoothed latency in seconds; 0 until the first sample, so new replicas get tried
+        self.samples = 0
+        self.observed_at = 0.0
+        self.in_flight = 0
+        self.failures = 0           # Consecutive failures
+        self.ejections = 0          # Consecutive ejections, to back off replicas that keep failing
+        self.ejected_until = 0.0
+
+    def is_available(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def load(self, now: float, half_life: float) -> float:
+        # Latency weighted by queue depth: a fast replica that is already busy looks slower.
+        # The estimate fades while the replica is not used, so one bad sample is not held
+        # against it forever and it gets probed again.
+        idle = now - self.observed_at
+        return self.ewma * 0.5 ** (idle / half_life) * (self.in_flight + 1)
+
+
+class EndpointPool:
+    """
+    Routes requests across the replicas of one upstream.
+
+    Each request goes to the less loaded of two randomly picked available replicas (power of
+    two choices), where load is the EWMA latency times in-flight requests. A read that fails
+    on one replica is retried once on another. Replicas are ejected
+    for a while after consecutive failures or when their latency is an outlier against the pool
+    median; ejection backs off for replicas that keep failing and never removes more than
+    max_ejected_fraction of the pool.
+
+    The first configured URL is the primary; writes should go there so they are not spread
+    over replicas.
+    """
+
+    def __init__(self, name: str, base_urls: Iterable[str],
+                 alpha: float = None,
+                 half_life: float = None,
+                 eject_failures: int = None,
+                 eject_duration: float = None,
+                 outlier_factor: float = None,
+                 max_ejected_fraction: float = None):
+        self.name = name
+        self.alpha = alpha or settings.ENDPOINT_EWMA_ALPHA
+        self.half_life = half_life or settings.ENDPOINT_EWMA_HALF_LIFE
+        self.eject_failures = eject_failures or settings.ENDPOINT_EJECT_FAILURES
+        self.eject_duration = eject_duration or settings.ENDPOINT_EJECT_DURATION
+        self.outlier_factor = outlier_factor or settings.ENDPOINT_OUTLIER_FACTOR
+        self.max_ejected_fraction = (max_ejected_fraction if max_ejected_fraction is not None
+                                     else settings.ENDPOINT_MAX_EJECTED_FRACTION)
+        self._endpoints: Dict[str, Endpoint] = {}
+        for base_url in base_urls:
+            self._endpoints.setdefault(base_url.rstrip("/"), Endpoint(base_url.rstrip("/")))
+        if not self._endpoints:
+            raise ValueError(f"Endpoint pool '{name}' needs at least one base URL")
+        self.primary = next(iter(self._endpoints.values()))
+
+    def endpoints(self) -> List[Endpoint]:
+        return list(self._endpoints.values())
+
+    def choose(self, exclude: Optional[Endpoint] = None) -> Endpoint:
+        """
+        Pick the replica for the next request, avoiding exclude if there is any alternative.
+        """
+        now = time.monotonic()
+        endpoints = [e for e in self._endpoints.values() if e is not exclude] or list(self._endpoints.values())
+        candidates = [e for e in endpoints if e.is_available(now)] or endpoints
+        if len(candidates) == 1:
+            return candidates[0]
+        first, second = random.sample(candidates, 2)
+        return first if first.load(now, self.half_life) <= second.load(now, self.half_life) else second
+
+    async def send(self, request: Callable[[str], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Issue the read request(base_url) against the chosen replica and record how it went.
+        Transport errors and 5xx responses count as failures of that replica and are retried
+        once on another replica.
+        """
+        endpoint = self.choose()
+        try:
+            response = await self._send_to(endpoint, request)
+        except Exception as e:
+            if not is_failure(e) or len(self._endpoints) < 2:
+                raise
+            return await self._send_to(self.choose(exclude=endpoint), request)
+        if response.status_code >= 500 and len(self._endpoints) > 1:
+            return await self._send_to(self.choose(exclude=endpoint), request)
+        return response
+
+    async def _send_to(self, endpoint: Endpoint, request: Callable[[str], Awaitable[httpx.Response]]) -> httpx.Response:
+        endpoint.in_flight += 1
+        started = time.monotonic()
+        try:
+            response = await request(endpoint.base_url)
+        except asyncio.CancelledError:
+            # Lost a hedge race or hit the deadline: at least this slow, but not a failure.
+            self._observe(endpoint, time.monotonic() - started, only_if_slower=True)
+            raise
+        except Exception as e:
+            if is_failure(e):
+                self._fail(endpoint)
+            raise
+        finally:
+            endpoint.in_flight -= 1
+        if response.status_code >= 500:
+            self._fail(endpoint)
+        else:
+            self._observe(endpoint, time.monotonic() - started)
+        return response
+
+    def _observe(self, endpoint: Endpoint, latency: float, only_if_slower: bool = False) -> None:
+        if only_if_slower and latency <= endpoint.ewma:
+            return
+        endpoint.ewma = latency if endpoint.samples == 0 else endpoint.ewma + self.alpha * (latency - endpoint.ewma)
+        endpoint.samples += 1
+        endpoint.observed_at = time.monotonic()
+        if not only_if_slower:
+            endpoint.failures = 0
+            endpoint.ejections = 0
+        self._check_outlier(endpoint)
+
+    def _fail(self, endpoint: Endpoint) -> None:
+        endpoint.failures += 1
+        if endpoint.failures >= self.eject_failures:
+            self._eject(endpoint, f"{endpoint.failures} consecutive failures")
+
+    def _check_outlier(self, endpoint: Endpoint) -> None:
+        now = time.monotonic()
+        peers = [e.ewma for e in self._endpoints.values() if e is not endpoint and e.samples and e.is_available(now)]
+        if len(peers) < 2 or endpoint.samples < 5:
+            return
+        median = statistics.median(peers)
+        if median > 0 and endpoint.ewma > self.outlier_factor * median:
+            self._eject(endpoint, f"latency {endpoint.ewma * 1000:.1f}ms vs pool median {median * 1000:.1f}ms")
+
+    def _eject(self, endpoint: Endpoint, reason: str) -> None:
+        now = time.monotonic()
+        ejected = sum(1 for e in self._endpoints.values() if not e.is_available(now))
+        if not endpoint.is_available(now) or (ejected + 1) > self.max_ejected_fraction * len(self._endpoints):
+            return
+        endpoint.ejections += 1
+        endpoint.ejected_until = now + self.eject_duration * min(2 ** (endpoint.ejections - 1), 16)
+        endpoint.failures = 0
+        # Start over when it comes back, rather than carry the latency that got it ejected.
+        endpoint.samples = 0
+        endpoint.ewma = 0.0
+        logger.warning("Ejected %s endpoint %s for %.0fs: %s", self.name, endpoint.base_url,
+                       endpoint.ejected_until - now, reason)
+
+    def update_discovered(self, base_urls: Iterable[str]) -> None:
+        """
+        Replace the dynamically discovered replicas; configured ones are always kept.
+        """
+        wanted = {base_url.rstrip("/") for base_url in base_urls}
+        for base_url, endpoint in list(self._endpoints.items()):
+            if endpoint.discovered and base_url not in wanted:
+                del self._endpoints[base_url]
+        added = [base_url for base_url in wanted if base_url not in self._endpoints]
+        for base_url in added:
+            self._endpoints[base_url] = Endpoint(base_url, discovered=True)
+        if added:
+            logger.info("Added %s discovered %s endpoint(s): %s", len(added), self.name, ", ".join(sorted(added)))
+
+    def snapshot(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {
+                "base_url": e.base_url,
+                "discovered": e.discovered,
+                "ewma_ms": round(e.ewma * 1000, 3),
+                "in_flight": e.in_flight,
+                "available": e.is_available(now),
+                "ejected_for": round(max(0.0, e.ejected_until - now), 3),
+            }
+            for e in self._endpoints.values()
+        ]
+
+
+def pool_urls(base_url: str, replicas: str) -> List[str]:
+    """
+    The configured base URL followed by the comma-separated replica URLs from Settings.
+    """
+    return [base_url] + [url.strip() for url in (replicas or "").split(",") if url.strip()]
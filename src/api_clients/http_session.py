@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.api_clients.tls import context_stats, upstream_ssl_context
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# One pooled AsyncClient per upstream origin (scheme://host:port), shared by every API client.
+_sessions: Dict[str, httpx.AsyncClient] = {}
+
+
+def _origin(base_url: str) -> str:
+    """
+    Reduce a base URL to its origin so that clients pointing at different paths
+    of the same upstream share a single connection pool.
+    """
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_session(base_url: str) -> httpx.AsyncClient:
+    """
+    Return the shared, keep-alive AsyncClient for the upstream serving base_url.
+    The client is created on first use with the pool limits from Settings.
+
+    With USE_TLS, https upstreams are reached over mutual TLS through the origin's
+    UpstreamSSLContext, and idle connections are kept for TLS_KEEPALIVE_EXPIRY seconds so
+    steady traffic does not reconnect; reconnects resume the previous TLS session.
+    """
+    origin = _origin(base_url)
+    session = _sessions.get(origin)
+    if session is None or session.is_closed:
+        mtls = settings.USE_TLS and origin.startswith("https://")
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.TLS_KEEPALIVE_EXPIRY if mtls else settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        verify = upstream_ssl_context(origin) if mtls else True
+        session = httpx.AsyncClient(limits=limits, timeout=settings.SOCKET_TIMEOUT, verify=verify)
+        _sessions[origin] = session
+        logger.info("Opened pooled HTTP%s session for %s", " (mTLS)" if mtls else "", origin)
+    return session
+
+
+def tls_stats(base_url: str) -> Optional[dict]:
+    """
+    Handshake counts of the mTLS context for the upstream serving base_url, or None if
+    it is not reached over mTLS.
+    """
+    return context_stats(_origin(base_url))
+
+
+async def close_sessions() -> None:
+    """
+    Close every pooled session. Intended for application shutdown.
+    """
+    sessions = list(_sessions.values())
+    _sessions.clear()
+    await asyncio.gather(*(session.aclose() for session in sessions), return_exceptions=True)
+    logger.info("Closed %s pooled HTTP session(s)", len(sessions))
@@ -1,9 +1,16 @@
 import os
-import requests
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(asctime)s - %(message)s')
+from src.api_clients.http_session import get_session
+from src.api_clients.endpoint_pool import EndpointPool, pool_urls
+from src.api_clients.resilience import get_guard
+from src.config.settings import settings
+from src.utils.cache import SWRCache, CachedValue
+from src.utils.logging_config import configure_logging, log_success, summarize
+from src.utils.metrics import instrumented
+from src.utils.shared_cache import get_shared_store
+
+logger = logging.getLogger(__name__)
 
 
 class NetworkClient:
@@ -17,74 +24,177 @@ class NetworkClient:
         """
         Initialize the NetworkClient.
         The base_url is loaded from the environment variable NETWORK_API_URL if not provided.
+        Additional read replicas are taken from the comma-separated NETWORK_API_REPLICAS.
         """
         self.base_url = base_url or os.getenv("NETWORK_API_URL", "https://chronosnetwork.example.com")
-        logging.info(f"NetworkClient configured with base URL: {self.base_url}")
+        self.guard = get_guard("network")
+        # Writes get their own breaker and a fixed timeout (see UpstreamGuard): a slow write must
+        # neither be cut short by the read-fitted timeout nor count against reads.
+        self.write_guard = get_guard("network_write", adaptive=False)
+        # Replicas serve reads; writes stay on base_url.
+        self.pool = EndpointPool("network", pool_urls(self.base_url, os.getenv("NETWORK_API_REPLICAS", "")))
+        # Status, peers and metrics change on a timescale of seconds; reads go through this cache.
+        self.cache = SWRCache(
+            "network",
+            ttl=settings.NETWORK_CACHE_TTL,
+            max_stale=settings.NETWORK_CACHE_MAX_STALE,
+            negative_ttl=settings.NETWORK_CACHE_NEGATIVE_TTL,
+            max_entries=settings.NETWORK_CACHE_MAX_ENTRIES,
+            shared=get_shared_store(),
+        )
+        logger.info("NetworkClient configured with base URL: %s", self.base_url)
 
+    @instrumented("network_client")
     def get_peers(self) -> dict:
         """
         Retrieve the list of currently discovered peers.
         Expects a JSON response like: {"peers": [<peer_info>, ...]}
         """
+        import requests  # Only the blocking methods use requests; keeps it off the API startup path
         try:
             url = f"{self.base_url}/network/peers"
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
+            response = self.guard.request_sync(lambda timeout: requests.get(url, timeout=timeout))
             data = response.json()
-            logging.info(f"Fetched peers: {data}")
+            log_success(logger, "Fetched peers: %s", summarize(data))
             return data
         except Exception as e:
-            logging.error(f"Failed to get peers: {e}")
+            logger.error("Failed to get peers: %s", e)
             raise
 
+    @instrumented("network_client")
+    async def get_peers_async(self) -> dict:
+        """
+        Async variant of get_peers using the shared pooled session for this upstream.
+        """
+        try:
+            response = await self.guard.request(lambda: self.pool.send(
+                lambda base: get_session(base).get(f"{base}/network/peers")))
+            data = response.json()
+            log_success(logger, "Fetched peers: %s", summarize(data))
+            return data
+        except Exception as e:
+            logger.error("Failed to get peers: %s", e)
+            raise
+
+    @instrumented("network_client")
     def get_status(self) -> dict:
         """
         Retrieve the network status, including node information and peer count.
         """
+        import requests
         try:
             url = f"{self.base_url}/network/status"
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
+            response = self.guard.request_sync(lambda timeout: requests.get(url, timeout=timeout))
+            data = response.json()
+            log_success(logger, "Fetched network status: %s", summarize(data))
+            return data
+        except Exception as e:
+            logger.error("Failed to get network status: %s", e)
+            raise
+
+    @instrumented("network_client")
+    async def get_status_async(self) -> dict:
+        """
+        Async variant of get_status using the shared pooled session for this upstream.
+        """
+        try:
+            response = await self.guard.request(lambda: self.pool.send(
+                lambda base: get_session(base).get(f"{base}/network/status")), hedge=True)
             data = response.json()
-            logging.info(f"Fetched network status: {data}")
+            log_success(logger, "Fetched network status: %s", summarize(data))
             return data
         except Exception as e:
-            logging.error(f"Failed to get network status: {e}")
+            logger.error("Failed to get network status: %s", e)
             raise
 
+    @instrumented("network_client")
     def get_metrics(self) -> dict:
         """
         Retrieve real-time network performance metrics.
         """
+        import requests
         try:
             url = f"{self.base_url}/network/metrics"
-            response = requests.get(url, timeout=5)
-            response.raise_for_status()
+            response = self.guard.request_sync(lambda timeout: requests.get(url, timeout=timeout))
             data = response.json()
-            logging.info(f"Fetched network metrics: {data}")
+            log_success(logger, "Fetched network metrics: %s", summarize(data))
             return data
         except Exception as e:
-            logging.error(f"Failed to get network metrics: {e}")
+            logger.error("Failed to get network metrics: %s", e)
             raise
 
+    @instrumented("network_client")
+    async def get_metrics_async(self) -> dict:
+        """
+        Async variant of get_metrics using the shared pooled session for this upstream.
+        """
+        try:
+            response = await self.guard.request(lambda: self.pool.send(
+                lambda base: get_session(base).get(f"{base}/network/metrics")))
+            data = response.json()
+            log_success(logger, "Fetched network metrics: %s", summarize(data))
+            return data
+        except Exception as e:
+            logger.error("Failed to get network metrics: %s", e)
+            raise
+
+    @instrumented("network_client")
+    async def get_peers_cached(self) -> CachedValue:
+        """
+        Cached variant of get_peers_async. Returns the peers together with their age in seconds.
+        """
+        return await self.cache.get("peers", self.get_peers_async)
+
+    @instrumented("network_client")
+    async def get_status_cached(self) -> CachedValue:
+        """
+        Cached variant of get_status_async. Returns the status together with its age in seconds.
+        """
+        return await self.cache.get("status", self.get_status_async)
+
+    @instrumented("network_client")
+    async def get_metrics_cached(self) -> CachedValue:
+        """
+        Cached variant of get_metrics_async. Returns the metrics together with their age in seconds.
+        """
+        return await self.cache.get("metrics", self.get_metrics_async)
+
+    @instrumented("network_client")
     def resync_network(self) -> dict:
         """
         Trigger a resynchronization of the network.
         """
+        import requests
+        try:
+            url = f"{self.base_url}/network/resync"
+            response = self.write_guard.request_sync(lambda timeout: requests.post(url, timeout=timeout))
+            data = response.json()
+            log_success(logger, "Network resync initiated: %s", summarize(data))
+            return data
+        except Exception as e:
+            logger.error("Failed to resync network: %s", e)
+            raise
+
+    @instrumented("network_client")
+    async def resync_network_async(self) -> dict:
+        """
+        Async variant of resync_network using the shared pooled session for this upstream.
+        """
         try:
             url = f"{self.base_url}/network/resync"
-            response = requests.post(url, timeout=5)
-            response.raise_for_status()
+            response = await self.write_guard.request(lambda: get_session(self.base_url).post(url))
             data = response.json()
-            logging.info(f"Network resync initiated: {data}")
+            self.cache.invalidate()
+            log_success(logger, "Network resync initiated: %s", summarize(data))
             return data
         except Exception as e:
-            logging.error(f"Failed to resync network: {e}")
+            logger.error("Failed to resync network: %s", e)
             raise
 
 
 # Standalone demo:
 if __name__ == "__main__":
+    configure_logging()
     client = NetworkClient()
     try:
         peers = client.get_peers()
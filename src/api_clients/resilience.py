@@ -0,0 +1,346 @@
+import asyncio
+import bisect
+import logging
+import sys
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from src.config.settings import settings
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling an upstream whose circuit breaker is open.
+    """
+
+    def __init__(self, upstream: str, retry_in: float):
+        super().__init__(f"Circuit for upstream '{upstream}' is open, retry in {retry_in:.1f}s")
+        self.upstream = upstream
+        self.retry_in = retry_in
+
+
+def is_failure(exc: BaseException) -> bool:
+    """
+    Whether an exception says the upstream is unhealthy. Client errors (4xx) do not.
+    """
+    if isinstance(exc, _status_error_types()) and exc.response is not None:
+        return exc.response.status_code >= 500
+    return True
+
+
+def is_transient(exc: BaseException) -> bool:
+    """
+    Whether the same call may succeed if retried: timeouts, transport errors, an open circuit,
+    5xx and 429 responses. Other errors (a 4xx, or a request that could not even be built)
+    would fail the same way again.
+    """
+    if isinstance(exc, _status_error_types()) and exc.response is not None:
+        status = exc.response.status_code
+        return status >= 500 or status == 429
+    if isinstance(exc, (asyncio.TimeoutError, CircuitOpenError, OSError)):
+        return True
+    return isinstance(exc, _transport_error_types())
+
+
+def _status_error_types() -> tuple:
+    # Only an HTTP library that has been imported can have raised, so look them up rather than
+    # import both here: this module sits on the API's import path and requests is only needed
+    # by the blocking client methods.
+    types = []
+    for module, name in (("httpx", "HTTPStatusError"), ("requests", "HTTPError")):
+        if module in sys.modules:
+            types.append(getattr(sys.modules[module], name))
+    return tuple(types)
+
+
+def _transport_error_types() -> tuple:
+    # requests' transport errors are OSErrors already; httpx's are not.
+    httpx = sys.modules.get("httpx")
+    return (httpx.TransportError,) if httpx is not None else ()
+
+
+class LatencyTracker:
+    """
+    Keeps the most recent successful call latencies and derives percentiles from them.
+
+    A sorted copy of the window is maintained on every record (a bisect insert and remove), so
+    percentile() is an index lookup instead of a sort per call.
+    """
+
+    def __init__(self, window: int = 256):
+        self._samples = deque(maxlen=window)
+        self._sorted: List[float] = []
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            if len(self._samples) == self._samples.maxlen:
+                del self._sorted[bisect.bisect_left(self._sorted, self._samples[0])]
+            self._samples.append(seconds)
+            bisect.insort(self._sorted, seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            samples = self._sorted
+            if not samples:
+                return None
+            return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after failure_threshold consecutive failures; open -> half-open after
+    reset_timeout, where a single probe call decides between closed and open again.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go through now. In half-open state only one probe is let through.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning("Circuit for upstream '%s' opened after %s consecutive failures", self.name, self.failures)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """
+        Give back a half-open probe slot when the call ended without a verdict (e.g. a 4xx).
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class UpstreamGuard:
+    """
+    Resilience policy for one upstream Chronos module: a timeout derived from observed
+    latency percentiles, a circuit breaker, and optional hedging of idempotent reads.
+
+    A guard created with adaptive=False always allows SOCKET_TIMEOUT. It is meant for
+    non-idempotent writes: a timeout fitted to fast reads would give up on a slow write that
+    the upstream may still apply, and the caller resubmitting it would duplicate it.
+    """
+
+    def __init__(self, name: str, adaptive: bool = True):
+        self.name = name
+        self.adaptive = adaptive
+        self.latency = LatencyTracker(settings.RESILIENCE_LATENCY_WINDOW)
+        self.breaker = CircuitBreaker(name, settings.BREAKER_FAILURE_THRESHOLD, settings.BREAKER_RESET_TIMEOUT)
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    def timeout(self) -> float:
+        """
+        Current per-call timeout: a multiple of the observed tail latency, clamped between
+        RESILIENCE_MIN_TIMEOUT and SOCKET_TIMEOUT (which is also used until enough samples exist).
+        """
+        if not self.adaptive or len(self.latency) < settings.RESILIENCE_MIN_SAMPLES:
+            return settings.SOCKET_TIMEOUT
+        tail = self.latency.percentile(settings.RESILIENCE_TIMEOUT_PERCENTILE)
+        return min(settings.SOCKET_TIMEOUT,
+                   max(settings.RESILIENCE_MIN_TIMEOUT, tail * settings.RESILIENCE_TIMEOUT_MULTIPLIER))
+
+    def hedge_delay(self) -> Optional[float]:
+        if not settings.HEDGE_ENABLED or len(self.latency) < settings.RESILIENCE_MIN_SAMPLES:
+            return None
+        return self.latency.percentile(settings.HEDGE_PERCENTILE)
+
+    def _check(self) -> None:
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.name, self.breaker.retry_in())
+
+    def _settle(self, exc: Optional[BaseException], started: float) -> None:
+        elapsed = time.monotonic() - started
+        for observer in _call_observers:
+            observer(self.name, elapsed, exc is not None)
+        if exc is None:
+            self.latency.record(elapsed)
+            self.breaker.record_success()
+        elif is_failure(exc):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
+
+    async def call(self, fn: Callable[[], Awaitable[T]], hedge: bool = False) -> T:
+        """
+        Run fn under the breaker and the adaptive timeout. With hedge=True (idempotent reads
+        only), a duplicate call is started if the first has not finished after the p95 delay,
+        and whichever succeeds first wins.
+
+        Raises:
+            CircuitOpenError if the breaker is open; asyncio.TimeoutError on timeout;
+            otherwise whatever fn raised.
+        """
+        self._check()
+        started = time.monotonic()
+        timeout = self.timeout()
+        try:
+            delay = self.hedge_delay() if hedge else None
+            if delay is None or delay >= timeout:
+                result = await asyncio.wait_for(fn(), timeout)
+            else:
+                result = await asyncio.wait_for(self._hedged(fn, delay), timeout)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                self._settle(e, started)
+            else:
+                self.breaker.release()
+            raise
+        self._settle(None, started)
+        return result
+
+    async def _hedged(self, fn: Callable[[], Awaitable[T]], delay: float) -> T:
+        primary = asyncio.ensure_future(fn())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.hedges_sent += 1
+                tasks.add(asyncio.ensure_future(fn()))
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedges_won += 1
+                        return task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def call_sync(self, fn: Callable[[float], T]) -> T:
+        """
+        Blocking variant of call for the synchronous client methods; fn receives the timeout.
+        """
+        self._check()
+        started = time.monotonic()
+        try:
+            result = fn(self.timeout())
+        except Exception as e:
+            self._settle(e, started)
+            raise
+        self._settle(None, started)
+        return result
+
+    async def request(self, send: Callable[[], Awaitable["httpx.Response"]], hedge: bool = False) -> "httpx.Response":
+        """
+        Guarded HTTP request: send() issues the request, non-2xx responses raise HTTPStatusError.
+        """
+        async def checked() -> "httpx.Response":
+            response = await send()
+            response.raise_for_status()
+            return response
+        return await self.call(checked, hedge=hedge)
+
+    def request_sync(self, send: Callable[[float], "requests.Response"]) -> "requests.Response":
+        """
+        Blocking variant of request; send(timeout) issues the request with the adaptive timeout.
+        """
+        def checked(timeout: float) -> "requests.Response":
+            response = send(timeout)
+            response.raise_for_status()
+            return response
+        return self.call_sync(checked)
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "retry_in": round(self.breaker.retry_in(), 3) if self.breaker.state != CircuitBreaker.CLOSED else 0.0,
+            "timeout": round(self.timeout(), 4),
+            "p50": self.latency.percentile(50),
+            "p95": self.latency.percentile(95),
+            "p99": self.latency.percentile(99),
+            "samples": len(self.latency),
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+        }
+
+
+_guards: Dict[str, UpstreamGuard] = {}
+# Called with (upstream, seconds, failed) after every guarded call.
+_call_observers: List[Callable[[str, float, bool], None]] = []
+
+
+def add_call_observer(observer: Callable[[str, float, bool], None]) -> None:
+    """
+    Have observer called with the upstream name, duration and whether it failed after every
+    guarded upstream call. Observers run inline and must be cheap.
+    """
+    if observer not in _call_observers:
+        _call_observers.append(observer)
+
+
+def remove_call_observer(observer: Callable[[str, float, bool], None]) -> None:
+    if observer in _call_observers:
+        _call_observers.remove(observer)
+
+
+def get_guard(name: str, adaptive: bool = True) -> UpstreamGuard:
+    """
+    Return the shared guard for an upstream, creating it on first use (see UpstreamGuard for
+    adaptive).
+    """
+    guard = _guards.get(name)
+    if guard is None:
+        guard = _guards.setdefault(name, UpstreamGuard(name, adaptive))
+    return guard
+
+
+def guard_states() -> Dict[str, dict]:
+    """
+    Breaker state, timeout and latency percentiles of every upstream seen so far.
+    """
+    return {name: guard.snapshot() for name, guard in _guards.items()}
@@ -1,9 +1,13 @@
 import os
-import requests
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(asctime)s - %(message)s')
+from src.api_clients.http_session import get_session
+from src.api_clients.endpoint_pool import EndpointPool, pool_urls
+from src.api_clients.resilience import get_guard
+from src.utils.logging_config import configure_logging, log_success
+from src.utils.metrics import instrumented
+
+logger = logging.getLogger(__name__)
 
 
 class TimeClient:
@@ -17,11 +21,16 @@ class TimeClient:
         Initialize the TimeClient.
 
         The base_url is loaded from the environment variable TIME_API_URL if not provided.
+        Additional read replicas are taken from the comma-separated TIME_API_REPLICAS.
         """
         # Use provided base_url or load from environment (with a default fallback)
         self.base_url = base_url or os.getenv("TIME_API_URL", "https://chronostime.example.com/chronos/cunix")
-        logging.info(f"TimeClient configured with base URL: {self.base_url}")
+        self.guard = get_guard("time")
+        # Replicas serve reads; writes stay on base_url.
+        self.pool = EndpointPool("time", pool_urls(self.base_url, os.getenv("TIME_API_REPLICAS", "")))
+        logger.info("TimeClient configured with base URL: %s", self.base_url)
 
+    @instrumented("time_client")
     def get_current_time(self) -> float:
         """
         Fetch the current Chronos cunix time from the API.
@@ -33,21 +42,38 @@ class TimeClient:
         Raises:
             Exception: if the request fails or the response is invalid.
         """
+        import requests  # Only the blocking methods use requests; keeps it off the API startup path
         try:
-            response = requests.get(self.base_url, timeout=5)
-            response.raise_for_status()
+            response = self.guard.request_sync(lambda timeout: requests.get(self.base_url, timeout=timeout))
             data = response.json()
             # Convert the value to float
             current_time = float(data.get("chronos_unix"))
-            logging.info(f"Fetched current Chronos time: {current_time}")
+            log_success(logger, "Fetched current Chronos time: %s", current_time)
+            return current_time
+        except Exception as e:
+            logger.error("Failed to fetch Chronos time: %s", e)
+            raise
+
+    @instrumented("time_client")
+    async def get_current_time_async(self) -> float:
+        """
+        Async variant of get_current_time using the shared pooled session for this upstream.
+        """
+        try:
+            response = await self.guard.request(lambda: self.pool.send(
+                lambda base: get_session(base).get(base)), hedge=True)
+            data = response.json()
+            current_time = float(data.get("chronos_unix"))
+            log_success(logger, "Fetched current Chronos time: %s", current_time)
             return current_time
         except Exception as e:
-            logging.error(f"Failed to fetch Chronos time: {e}")
+            logger.error("Failed to fetch Chronos time: %s", e)
             raise
 
 
 # Standalone demo
 if __name__ == "__main__":
+    configure_logging()
     client = TimeClient()
     current_time = client.get_current_time()
     print(f"Current Chronos time: {current_time}")
@@ -0,0 +1,119 @@
+import logging
+import ssl
+import time
+from typing import Dict, Optional
+
+from src.config.settings import settings
+from src.utils.metrics import REGISTRY, Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+TLS_HANDSHAKES = REGISTRY.register(Counter(
+    "chronos_tls_handshakes_total", "Completed TLS handshakes with upstreams, by whether the session was resumed.",
+    ("origin", "resumed")))
+TLS_HANDSHAKE_DURATION = REGISTRY.register(Histogram(
+    "chronos_tls_handshake_seconds", "Duration of TLS handshakes with upstreams.", ("origin",)))
+
+
+class _ResumingSSLObject(ssl.SSLObject):
+    """
+    SSLObject created by UpstreamSSLContext. Times its handshake and hands the negotiated
+    session back to the context so the next connection can resume it.
+    """
+
+    def do_handshake(self) -> None:
+        # Called repeatedly on a non-blocking BIO until the handshake completes, so the time
+        # from the first call includes the network round trips.
+        if self._handshake_started is None:
+            self._handshake_started = time.perf_counter()
+        super().do_handshake()
+        self.context.record_handshake(self, time.perf_counter() - self._handshake_started)
+
+    def read(self, len: int = 1024, buffer=None):
+        data = super().read(len, buffer)
+        if not self._session_saved:
+            # TLS 1.3 tickets arrive after the handshake, with the first application data.
+            self._session_saved = self.context.save_session(self)
+        return data
+
+
+class UpstreamSSLContext(ssl.SSLContext):
+    """
+    Client SSLContext for one upstream origin.
+
+    It remembers the last TLS session negotiated with the origin and offers it on every new
+    connection, so reconnects resume the session (TLS 1.2 session ids or TLS 1.3 tickets)
+    instead of paying for a full handshake. Handshake counts and durations are recorded per
+    origin.
+    """
+    sslobject_class = _ResumingSSLObject
+    origin = ""
+    resume_sessions = True
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        if session is None and self.resume_sessions:
+            session = self._session
+        ssl_object = super().wrap_bio(incoming, outgoing, server_side=server_side,
+                                      server_hostname=server_hostname, session=session)
+        ssl_object._handshake_started = None
+        ssl_object._session_saved = False
+        return ssl_object
+
+    def record_handshake(self, ssl_object: ssl.SSLObject, duration: float) -> None:
+        resumed = ssl_object.session_reused
+        self._handshakes += 1
+        self._resumed += int(resumed)
+        self._handshake_seconds += duration
+        TLS_HANDSHAKES.labels(self.origin, "true" if resumed else "false").inc()
+        TLS_HANDSHAKE_DURATION.labels(self.origin).observe(duration)
+        if ssl_object.version() != "TLSv1.3":
+            ssl_object._session_saved = self.save_session(ssl_object)
+
+    def save_session(self, ssl_object: ssl.SSLObject) -> bool:
+        session = ssl_object.session
+        if session is None or (ssl_object.version() == "TLSv1.3" and not session.has_ticket):
+            return False
+        self._session = session
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "handshakes": self._handshakes,
+            "resumed": self._resumed,
+            "avg_handshake_ms": round(self._handshake_seconds / self._handshakes * 1000, 3) if self._handshakes else 0.0,
+        }
+
+
+# One context per upstream origin, shared by every connection to it.
+_contexts: Dict[str, UpstreamSSLContext] = {}
+
+
+def upstream_ssl_context(origin: str) -> UpstreamSSLContext:
+    """
+    Return the mutual-TLS context for origin, building it on first use: the server is verified
+    against CA_FILE and the client presents CERTFILE/KEYFILE.
+    """
+    context = _contexts.get(origin)
+    if context is None:
+        context = UpstreamSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.minimum_version = ssl.TLSVersion.TLSv1_2
+        context.load_verify_locations(cafile=settings.CA_FILE)
+        context.load_cert_chain(settings.CERTFILE, settings.KEYFILE)
+        context.origin = origin
+        context.resume_sessions = settings.TLS_SESSION_RESUMPTION
+        context._session = None
+        context._handshakes = 0
+        context._resumed = 0
+        context._handshake_seconds = 0.0
+        _contexts[origin] = context
+        logger.info("Built mTLS context for %s (session resumption %s)",
+                    origin, "on" if context.resume_sessions else "off")
+    return context
+
+
+def context_stats(origin: str) -> Optional[dict]:
+    """
+    Handshake counts for origin, or None if no TLS context has been built for it.
+    """
+    context = _contexts.get(origin)
+    return context.stats() if context is not None else None
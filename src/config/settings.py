@@ -1,8 +1,27 @@
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+
+def _find_env_file() -> str:
+    """
+    The nearest .env file in this directory or its parents (where load_dotenv() would look),
+    or "" if there is none.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(directory, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return ""
+        directory = parent
+
+
+# Load environment variables from .env file; python-dotenv is only imported when there is one.
+_env_file = _find_env_file()
+if _env_file:
+    from dotenv import load_dotenv
+    load_dotenv(_env_file)
 
 
 class Settings:
@@ -13,6 +32,12 @@ class Settings:
     NETWORK_API_URL: str = os.getenv("NETWORK_API_URL", "https://chronosnetwork.example.com")
     AI_API_URL: str = os.getenv("AI_API_URL", "https://chronosai.example.com")
 
+    # Extra read replicas per upstream (comma-separated base URLs)
+    TIME_API_REPLICAS: str = os.getenv("TIME_API_REPLICAS", "")
+    CURRENCY_API_REPLICAS: str = os.getenv("CURRENCY_API_REPLICAS", "")
+    BLOCKCHAIN_API_REPLICAS: str = os.getenv("BLOCKCHAIN_API_REPLICAS", "")
+    NETWORK_API_REPLICAS: str = os.getenv("NETWORK_API_REPLICAS", "")
+
     # Orchestrator and network configuration
     HOST: str = os.getenv("HOST", "127.0.0.1")
     PORT: int = int(os.getenv("PORT", "8443"))
@@ -20,6 +45,130 @@ class Settings:
     USE_TLS: bool = os.getenv("USE_TLS", "false").lower() == "true"
     SOCKET_TIMEOUT: float = float(os.getenv("SOCKET_TIMEOUT", "5.0"))
 
+    # Pooled HTTP sessions to upstream Chronos modules (one pool per upstream)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30.0"))
+    # Idle mTLS connections are kept longer: reopening one costs a TLS handshake.
+    TLS_KEEPALIVE_EXPIRY: float = float(os.getenv("TLS_KEEPALIVE_EXPIRY", "300.0"))
+    TLS_SESSION_RESUMPTION: bool = os.getenv("TLS_SESSION_RESUMPTION", "true").lower() == "true"
+
+    # Local Chronos clock: background sampling of the Time API
+    TIME_SYNC_INTERVAL: float = float(os.getenv("TIME_SYNC_INTERVAL", "16.0"))
+    TIME_SYNC_MAX_AGE: float = float(os.getenv("TIME_SYNC_MAX_AGE", "64.0"))
+    TIME_SYNC_WINDOW: int = int(os.getenv("TIME_SYNC_WINDOW", "8"))
+    TIME_SYNC_MAX_DRIFT_PPM: float = float(os.getenv("TIME_SYNC_MAX_DRIFT_PPM", "100.0"))
+
+    # Balance lookups: coalescing window (seconds) and maximum users per upstream request
+    BALANCE_BATCH_WINDOW: float = float(os.getenv("BALANCE_BATCH_WINDOW", "0.005"))
+    BALANCE_BATCH_MAX_SIZE: int = int(os.getenv("BALANCE_BATCH_MAX_SIZE", "100"))
+
+    # Network status/peers/metrics cache (seconds); stale data is served while refreshing
+    NETWORK_CACHE_TTL: float = float(os.getenv("NETWORK_CACHE_TTL", "2.0"))
+    NETWORK_CACHE_MAX_STALE: float = float(os.getenv("NETWORK_CACHE_MAX_STALE", "30.0"))
+    NETWORK_CACHE_NEGATIVE_TTL: float = float(os.getenv("NETWORK_CACHE_NEGATIVE_TTL", "1.0"))
+    NETWORK_CACHE_MAX_ENTRIES: int = int(os.getenv("NETWORK_CACHE_MAX_ENTRIES", "256"))
+
+    # Transaction submission pipeline: queue bound, batch size and linger time (seconds)
+    TX_QUEUE_MAX_DEPTH: int = int(os.getenv("TX_QUEUE_MAX_DEPTH", "10000"))
+    TX_BATCH_MAX_SIZE: int = int(os.getenv("TX_BATCH_MAX_SIZE", "200"))
+    TX_BATCH_LINGER: float = float(os.getenv("TX_BATCH_LINGER", "0.01"))
+    TX_MAX_IN_FLIGHT_BATCHES: int = int(os.getenv("TX_MAX_IN_FLIGHT_BATCHES", "4"))
+
+    # Local ledger replica: on-disk block store and incremental sync interval (seconds)
+    LEDGER_DIR: str = os.getenv("LEDGER_DIR", "data/ledger")
+    LEDGER_SYNC_INTERVAL: float = float(os.getenv("LEDGER_SYNC_INTERVAL", "5.0"))
+
+    # Transaction outbox: accepted transactions are fsynced locally in group commits and sent
+    # upstream in the background; retry backoff bounds and status retention are in seconds
+    OUTBOX_ENABLED: bool = os.getenv("OUTBOX_ENABLED", "true").lower() == "true"
+    OUTBOX_DIR: str = os.getenv("OUTBOX_DIR", "data/outbox")
+    OUTBOX_MAX_PENDING: int = int(os.getenv("OUTBOX_MAX_PENDING", "100000"))
+    OUTBOX_MAX_IN_FLIGHT: int = int(os.getenv("OUTBOX_MAX_IN_FLIGHT", "256"))
+    OUTBOX_RETRY_BASE: float = float(os.getenv("OUTBOX_RETRY_BASE", "0.5"))
+    OUTBOX_RETRY_MAX: float = float(os.getenv("OUTBOX_RETRY_MAX", "30.0"))
+    OUTBOX_RETENTION: float = float(os.getenv("OUTBOX_RETENTION", "86400.0"))
+    OUTBOX_COMPACT_BYTES: int = int(os.getenv("OUTBOX_COMPACT_BYTES", str(64 * 1024 * 1024)))
+    # Recent transaction statuses shared between worker processes (slots, bytes per slot)
+    OUTBOX_STATUS_SLOTS: int = int(os.getenv("OUTBOX_STATUS_SLOTS", "8192"))
+    OUTBOX_STATUS_SLOT_SIZE: int = int(os.getenv("OUTBOX_STATUS_SLOT_SIZE", "2048"))
+
+    # Upstream resilience: adaptive timeouts (bounded above by SOCKET_TIMEOUT),
+    # circuit breakers and hedged idempotent reads
+    RESILIENCE_LATENCY_WINDOW: int = int(os.getenv("RESILIENCE_LATENCY_WINDOW", "256"))
+    RESILIENCE_MIN_SAMPLES: int = int(os.getenv("RESILIENCE_MIN_SAMPLES", "20"))
+    RESILIENCE_TIMEOUT_PERCENTILE: float = float(os.getenv("RESILIENCE_TIMEOUT_PERCENTILE", "99"))
+    RESILIENCE_TIMEOUT_MULTIPLIER: float = float(os.getenv("RESILIENCE_TIMEOUT_MULTIPLIER", "3.0"))
+    RESILIENCE_MIN_TIMEOUT: float = float(os.getenv("RESILIENCE_MIN_TIMEOUT", "0.25"))
+    BREAKER_FAILURE_THRESHOLD: int = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+    BREAKER_RESET_TIMEOUT: float = float(os.getenv("BREAKER_RESET_TIMEOUT", "10.0"))
+    HEDGE_ENABLED: bool = os.getenv("HEDGE_ENABLED", "true").lower() == "true"
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "95"))
+
+    # Aggregate snapshot: deadline (seconds) applied to each section independently
+    SNAPSHOT_SECTION_DEADLINE: float = float(os.getenv("SNAPSHOT_SECTION_DEADLINE", "1.0"))
+
+    # Logging: level, 1-in-N sampling of successful-call logs, and payload summary length
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_SUCCESS_SAMPLE_EVERY: int = int(os.getenv("LOG_SUCCESS_SAMPLE_EVERY", "100"))
+    LOG_PAYLOAD_MAX: int = int(os.getenv("LOG_PAYLOAD_MAX", "512"))
+
+    # Transaction validation: largest accepted amount and tolerated timestamp skew (seconds)
+    TX_MAX_AMOUNT: float = float(os.getenv("TX_MAX_AMOUNT", "1000000000"))
+    TX_MAX_PAST_SKEW: float = float(os.getenv("TX_MAX_PAST_SKEW", "300.0"))
+    TX_MAX_FUTURE_SKEW: float = float(os.getenv("TX_MAX_FUTURE_SKEW", "30.0"))
+
+    # Idempotent submission: how long (seconds) completed submissions are remembered, and how many
+    IDEMPOTENCY_TTL: float = float(os.getenv("IDEMPOTENCY_TTL", "600.0"))
+    IDEMPOTENCY_MAX_ENTRIES: int = int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "100000"))
+
+    # Cache shared by the worker processes of one host (memory-mapped file, mode 0600; empty
+    # path = a per-user 0700 directory in /dev/shm)
+    SHARED_CACHE_ENABLED: bool = os.getenv("SHARED_CACHE_ENABLED", "true").lower() == "true"
+    SHARED_CACHE_PATH: str = os.getenv("SHARED_CACHE_PATH", "")
+    SHARED_CACHE_SLOTS: int = int(os.getenv("SHARED_CACHE_SLOTS", "1024"))
+    SHARED_CACHE_SLOT_SIZE: int = int(os.getenv("SHARED_CACHE_SLOT_SIZE", "65536"))
+    SHARED_CACHE_LEASE: float = float(os.getenv("SHARED_CACHE_LEASE", "5.0"))
+
+    # Server-sent updates: one poller per topic, shared by all subscribers
+    PUSH_INTERVAL: float = float(os.getenv("PUSH_INTERVAL", "1.0"))
+    PUSH_HEARTBEAT: float = float(os.getenv("PUSH_HEARTBEAT", "15.0"))
+    PUSH_MAX_LAG: float = float(os.getenv("PUSH_MAX_LAG", "30.0"))
+    PUSH_MAX_SUBSCRIBERS: int = int(os.getenv("PUSH_MAX_SUBSCRIBERS", "10000"))
+
+    # Admission control: concurrent requests, CoDel target queueing delay and interval (seconds),
+    # longest wait, queue bound, and per-route-class limit overrides ("balance=64,status=4")
+    ADMISSION_ENABLED: bool = os.getenv("ADMISSION_ENABLED", "true").lower() == "true"
+    ADMISSION_MAX_CONCURRENCY: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "64"))
+    ADMISSION_TARGET_DELAY: float = float(os.getenv("ADMISSION_TARGET_DELAY", "0.05"))
+    ADMISSION_INTERVAL: float = float(os.getenv("ADMISSION_INTERVAL", "0.5"))
+    ADMISSION_MAX_WAIT: float = float(os.getenv("ADMISSION_MAX_WAIT", "2.0"))
+    ADMISSION_MAX_QUEUE: int = int(os.getenv("ADMISSION_MAX_QUEUE", "1000"))
+    ADMISSION_ROUTE_LIMITS: str = os.getenv("ADMISSION_ROUTE_LIMITS", "")
+
+    # Replica routing: EWMA smoothing, outlier ejection, and which upstreams take discovered peers
+    ENDPOINT_EWMA_ALPHA: float = float(os.getenv("ENDPOINT_EWMA_ALPHA", "0.3"))
+    ENDPOINT_EWMA_HALF_LIFE: float = float(os.getenv("ENDPOINT_EWMA_HALF_LIFE", "5.0"))
+    ENDPOINT_EJECT_FAILURES: int = int(os.getenv("ENDPOINT_EJECT_FAILURES", "3"))
+    ENDPOINT_EJECT_DURATION: float = float(os.getenv("ENDPOINT_EJECT_DURATION", "10.0"))
+    ENDPOINT_OUTLIER_FACTOR: float = float(os.getenv("ENDPOINT_OUTLIER_FACTOR", "5.0"))
+    ENDPOINT_MAX_EJECTED_FRACTION: float = float(os.getenv("ENDPOINT_MAX_EJECTED_FRACTION", "0.5"))
+    DISCOVERY_UPSTREAMS: str = os.getenv("DISCOVERY_UPSTREAMS", "")  # e.g. "time,currency,blockchain"
+    DISCOVERY_INTERVAL: float = float(os.getenv("DISCOVERY_INTERVAL", "30.0"))
+
+    # Network metrics history: sampling interval (seconds), ring-buffer tiers as
+    # "resolution seconds:slots" pairs, and how many distinct metrics are kept
+    METRICS_HISTORY_ENABLED: bool = os.getenv("METRICS_HISTORY_ENABLED", "true").lower() == "true"
+    METRICS_HISTORY_INTERVAL: float = float(os.getenv("METRICS_HISTORY_INTERVAL", "1.0"))
+    METRICS_HISTORY_TIERS: str = os.getenv("METRICS_HISTORY_TIERS", "1:3600,60:1440,3600:720")
+    METRICS_HISTORY_MAX_FIELDS: int = int(os.getenv("METRICS_HISTORY_MAX_FIELDS", "16"))
+
+    # Local AI insights: EWMA weight of each new observation, half-life (seconds) of the
+    # transaction rates, and observations needed before anomaly scores are reported
+    AI_EWMA_ALPHA: float = float(os.getenv("AI_EWMA_ALPHA", "0.05"))
+    AI_RATE_HALF_LIFE: float = float(os.getenv("AI_RATE_HALF_LIFE", "60.0"))
+    AI_ANOMALY_WARMUP: int = int(os.getenv("AI_ANOMALY_WARMUP", "20"))
+
     # TLS settings (for secure communications)
     CERTFILE: str = os.getenv("CERTFILE", "server.crt")
     KEYFILE: str = os.getenv("KEYFILE", "server.key")
@@ -40,11 +189,95 @@ if __name__ == "__main__":
     print(f"BLOCKCHAIN_API_URL: {settings.BLOCKCHAIN_API_URL}")
     print(f"NETWORK_API_URL: {settings.NETWORK_API_URL}")
     print(f"AI_API_URL: {settings.AI_API_URL}")
+    print(f"TIME_API_REPLICAS: {settings.TIME_API_REPLICAS}")
+    print(f"CURRENCY_API_REPLICAS: {settings.CURRENCY_API_REPLICAS}")
+    print(f"BLOCKCHAIN_API_REPLICAS: {settings.BLOCKCHAIN_API_REPLICAS}")
+    print(f"NETWORK_API_REPLICAS: {settings.NETWORK_API_REPLICAS}")
     print(f"HOST: {settings.HOST}")
     print(f"PORT: {settings.PORT}")
     print(f"SERVICE_NAME: {settings.SERVICE_NAME}")
     print(f"USE_TLS: {settings.USE_TLS}")
     print(f"SOCKET_TIMEOUT: {settings.SOCKET_TIMEOUT}")
+    print(f"HTTP_MAX_CONNECTIONS: {settings.HTTP_MAX_CONNECTIONS}")
+    print(f"HTTP_MAX_KEEPALIVE_CONNECTIONS: {settings.HTTP_MAX_KEEPALIVE_CONNECTIONS}")
+    print(f"HTTP_KEEPALIVE_EXPIRY: {settings.HTTP_KEEPALIVE_EXPIRY}")
+    print(f"TLS_KEEPALIVE_EXPIRY: {settings.TLS_KEEPALIVE_EXPIRY}")
+    print(f"TLS_SESSION_RESUMPTION: {settings.TLS_SESSION_RESUMPTION}")
+    print(f"TIME_SYNC_INTERVAL: {settings.TIME_SYNC_INTERVAL}")
+    print(f"TIME_SYNC_MAX_AGE: {settings.TIME_SYNC_MAX_AGE}")
+    print(f"TIME_SYNC_WINDOW: {settings.TIME_SYNC_WINDOW}")
+    print(f"TIME_SYNC_MAX_DRIFT_PPM: {settings.TIME_SYNC_MAX_DRIFT_PPM}")
+    print(f"BALANCE_BATCH_WINDOW: {settings.BALANCE_BATCH_WINDOW}")
+    print(f"BALANCE_BATCH_MAX_SIZE: {settings.BALANCE_BATCH_MAX_SIZE}")
+    print(f"NETWORK_CACHE_TTL: {settings.NETWORK_CACHE_TTL}")
+    print(f"NETWORK_CACHE_MAX_STALE: {settings.NETWORK_CACHE_MAX_STALE}")
+    print(f"NETWORK_CACHE_NEGATIVE_TTL: {settings.NETWORK_CACHE_NEGATIVE_TTL}")
+    print(f"NETWORK_CACHE_MAX_ENTRIES: {settings.NETWORK_CACHE_MAX_ENTRIES}")
+    print(f"TX_QUEUE_MAX_DEPTH: {settings.TX_QUEUE_MAX_DEPTH}")
+    print(f"TX_BATCH_MAX_SIZE: {settings.TX_BATCH_MAX_SIZE}")
+    print(f"TX_BATCH_LINGER: {settings.TX_BATCH_LINGER}")
+    print(f"TX_MAX_IN_FLIGHT_BATCHES: {settings.TX_MAX_IN_FLIGHT_BATCHES}")
+    print(f"LEDGER_DIR: {settings.LEDGER_DIR}")
+    print(f"LEDGER_SYNC_INTERVAL: {settings.LEDGER_SYNC_INTERVAL}")
+    print(f"OUTBOX_ENABLED: {settings.OUTBOX_ENABLED}")
+    print(f"OUTBOX_DIR: {settings.OUTBOX_DIR}")
+    print(f"OUTBOX_MAX_PENDING: {settings.OUTBOX_MAX_PENDING}")
+    print(f"OUTBOX_MAX_IN_FLIGHT: {settings.OUTBOX_MAX_IN_FLIGHT}")
+    print(f"OUTBOX_RETRY_BASE: {settings.OUTBOX_RETRY_BASE}")
+    print(f"OUTBOX_RETRY_MAX: {settings.OUTBOX_RETRY_MAX}")
+    print(f"OUTBOX_RETENTION: {settings.OUTBOX_RETENTION}")
+    print(f"OUTBOX_COMPACT_BYTES: {settings.OUTBOX_COMPACT_BYTES}")
+    print(f"OUTBOX_STATUS_SLOTS: {settings.OUTBOX_STATUS_SLOTS}")
+    print(f"OUTBOX_STATUS_SLOT_SIZE: {settings.OUTBOX_STATUS_SLOT_SIZE}")
+    print(f"RESILIENCE_LATENCY_WINDOW: {settings.RESILIENCE_LATENCY_WINDOW}")
+    print(f"RESILIENCE_MIN_SAMPLES: {settings.RESILIENCE_MIN_SAMPLES}")
+    print(f"RESILIENCE_TIMEOUT_PERCENTILE: {settings.RESILIENCE_TIMEOUT_PERCENTILE}")
+    print(f"RESILIENCE_TIMEOUT_MULTIPLIER: {settings.RESILIENCE_TIMEOUT_MULTIPLIER}")
+    print(f"RESILIENCE_MIN_TIMEOUT: {settings.RESILIENCE_MIN_TIMEOUT}")
+    print(f"BREAKER_FAILURE_THRESHOLD: {settings.BREAKER_FAILURE_THRESHOLD}")
+    print(f"BREAKER_RESET_TIMEOUT: {settings.BREAKER_RESET_TIMEOUT}")
+    print(f"HEDGE_ENABLED: {settings.HEDGE_ENABLED}")
+    print(f"HEDGE_PERCENTILE: {settings.HEDGE_PERCENTILE}")
+    print(f"SNAPSHOT_SECTION_DEADLINE: {settings.SNAPSHOT_SECTION_DEADLINE}")
+    print(f"LOG_LEVEL: {settings.LOG_LEVEL}")
+    print(f"LOG_SUCCESS_SAMPLE_EVERY: {settings.LOG_SUCCESS_SAMPLE_EVERY}")
+    print(f"LOG_PAYLOAD_MAX: {settings.LOG_PAYLOAD_MAX}")
+    print(f"TX_MAX_AMOUNT: {settings.TX_MAX_AMOUNT}")
+    print(f"TX_MAX_PAST_SKEW: {settings.TX_MAX_PAST_SKEW}")
+    print(f"TX_MAX_FUTURE_SKEW: {settings.TX_MAX_FUTURE_SKEW}")
+    print(f"IDEMPOTENCY_TTL: {settings.IDEMPOTENCY_TTL}")
+    print(f"IDEMPOTENCY_MAX_ENTRIES: {settings.IDEMPOTENCY_MAX_ENTRIES}")
+    print(f"SHARED_CACHE_ENABLED: {settings.SHARED_CACHE_ENABLED}")
+    print(f"SHARED_CACHE_PATH: {settings.SHARED_CACHE_PATH}")
+    print(f"SHARED_CACHE_SLOTS: {settings.SHARED_CACHE_SLOTS}")
+    print(f"SHARED_CACHE_SLOT_SIZE: {settings.SHARED_CACHE_SLOT_SIZE}")
+    print(f"SHARED_CACHE_LEASE: {settings.SHARED_CACHE_LEASE}")
+    print(f"PUSH_INTERVAL: {settings.PUSH_INTERVAL}")
+    print(f"PUSH_HEARTBEAT: {settings.PUSH_HEARTBEAT}")
+    print(f"PUSH_MAX_LAG: {settings.PUSH_MAX_LAG}")
+    print(f"PUSH_MAX_SUBSCRIBERS: {settings.PUSH_MAX_SUBSCRIBERS}")
+    print(f"ADMISSION_ENABLED: {settings.ADMISSION_ENABLED}")
+    print(f"ADMISSION_MAX_CONCURRENCY: {settings.ADMISSION_MAX_CONCURRENCY}")
+    print(f"ADMISSION_TARGET_DELAY: {settings.ADMISSION_TARGET_DELAY}")
+    print(f"ADMISSION_INTERVAL: {settings.ADMISSION_INTERVAL}")
+    print(f"ADMISSION_MAX_WAIT: {settings.ADMISSION_MAX_WAIT}")
+    print(f"ADMISSION_MAX_QUEUE: {settings.ADMISSION_MAX_QUEUE}")
+    print(f"ADMISSION_ROUTE_LIMITS: {settings.ADMISSION_ROUTE_LIMITS}")
+    print(f"ENDPOINT_EWMA_ALPHA: {settings.ENDPOINT_EWMA_ALPHA}")
+    print(f"ENDPOINT_EWMA_HALF_LIFE: {settings.ENDPOINT_EWMA_HALF_LIFE}")
+    print(f"ENDPOINT_EJECT_FAILURES: {settings.ENDPOINT_EJECT_FAILURES}")
+    print(f"ENDPOINT_EJECT_DURATION: {settings.ENDPOINT_EJECT_DURATION}")
+    print(f"ENDPOINT_OUTLIER_FACTOR: {settings.ENDPOINT_OUTLIER_FACTOR}")
+    print(f"ENDPOINT_MAX_EJECTED_FRACTION: {settings.ENDPOINT_MAX_EJECTED_FRACTION}")
+    print(f"DISCOVERY_UPSTREAMS: {settings.DISCOVERY_UPSTREAMS}")
+    print(f"DISCOVERY_INTERVAL: {settings.DISCOVERY_INTERVAL}")
+    print(f"METRICS_HISTORY_ENABLED: {settings.METRICS_HISTORY_ENABLED}")
+    print(f"METRICS_HISTORY_INTERVAL: {settings.METRICS_HISTORY_INTERVAL}")
+    print(f"METRICS_HISTORY_TIERS: {settings.METRICS_HISTORY_TIERS}")
+    print(f"METRICS_HISTORY_MAX_FIELDS: {settings.METRICS_HISTORY_MAX_FIELDS}")
+    print(f"AI_EWMA_ALPHA: {settings.AI_EWMA_ALPHA}")
+    print(f"AI_RATE_HALF_LIFE: {settings.AI_RATE_HALF_LIFE}")
+    print(f"AI_ANOMALY_WARMUP: {settings.AI_ANOMALY_WARMUP}")
     print(f"CERTFILE: {settings.CERTFILE}")
     print(f"KEYFILE: {settings.KEYFILE}")
     print(f"CA_FILE: {settings.CA_FILE}")
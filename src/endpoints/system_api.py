@@ -1,69 +1,409 @@
-from fastapi import APIRouter, HTTPException, Request
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from typing import TYPE_CHECKING, Optional
+import asyncio
+import functools
+import math
 import time
 import logging
 
-# Import the orchestrator (assumed to be implemented in src/orchestrator/orchestrator.py)
-from src.orchestrator.orchestrator import ChronosSystemOrchestrator
+from src.orchestrator.outbox import OutboxUnavailableError
+from src.orchestrator.push import SubscriberLimitError
+from src.orchestrator.tx_pipeline import PipelineFullError
+from src.orchestrator.validation import TransactionValidationError
+from src.api_clients.resilience import CircuitOpenError
+from src.config.settings import settings
+from src.utils.cache import IdempotencyConflictError
+from src.models.common_models import (
+    AccountHistory, AIMetrics, BalanceResponse, BulkBalanceRequest, BulkBalanceResponse, BulkTransactionRequest, MetricsHistory,
+    NetworkStatus,
+    TimeResponse, TransactionRecord, TransactionResult, TransactionStatus, UserTransactions,
+)
+from src.utils.admission import AdmissionController, AdmissionRejected
+from src.utils.logging_config import configure_logging
+from src.utils.metrics import REGISTRY
+from src.utils.responses import FastJSONResponse, dumps
 
-# Configure logging for the API layer
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(asctime)s - %(message)s')
+if TYPE_CHECKING:
+    from src.orchestrator.orchestrator import ChronosSystemOrchestrator
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# Instantiate the orchestrator
-orchestrator = ChronosSystemOrchestrator()
+_orchestrator: Optional["ChronosSystemOrchestrator"] = None
+
+
+def get_orchestrator() -> "ChronosSystemOrchestrator":
+    """
+    Return the process's orchestrator, configuring logging and building it on first use.
+
+    The orchestrator and the client stack behind it are imported here rather than at module
+    level, so importing the API (and forking workers) stays cheap. The lifespan hook builds it
+    before the first request is served.
+    """
+    global _orchestrator
+    if _orchestrator is None:
+        from src.orchestrator.orchestrator import ChronosSystemOrchestrator
+        configure_logging()
+        _orchestrator = ChronosSystemOrchestrator()
+    return _orchestrator
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Application lifespan: build the orchestrator and start background tasks on startup,
+    release pooled upstream connections on shutdown.
+    """
+    orchestrator = get_orchestrator()
+    await orchestrator.start()
+    yield
+    await orchestrator.aclose()
+
+
+router = APIRouter(lifespan=lifespan, default_response_class=FastJSONResponse)
+
+admission = AdmissionController()
+
+
+def admitted(route: str):
+    """
+    Run the decorated route inside an admission slot of the given route class (see
+    src.utils.admission.ROUTE_CLASSES). Requests that are shed, wait too long or find the
+    queue full are answered with 503 or 429 and a Retry-After header, without running the
+    route. Streaming and monitoring routes are left undecorated.
+    """
+    def decorator(fn):
+        if not settings.ADMISSION_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            try:
+                await admission.acquire(route)
+            except AdmissionRejected as e:
+                raise HTTPException(status_code=e.status_code, detail=str(e),
+                                    headers={"Retry-After": str(e.retry_after)})
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                admission.release(route)
+        return wrapper
+    return decorator
+
+
+def upstream_error(e: Exception, status_code: int = 500) -> HTTPException:
+    """
+    Map an orchestrator failure to an HTTP error. Open circuits fail fast with 503 and
+    upstream timeouts become 504; anything else uses status_code.
+    """
+    if isinstance(e, CircuitOpenError):
+        return HTTPException(status_code=503, detail=str(e),
+                             headers={"Retry-After": str(max(1, int(e.retry_in + 0.999)))})
+    if isinstance(e, asyncio.TimeoutError):
+        return HTTPException(status_code=504, detail="Upstream request timed out")
+    return HTTPException(status_code=status_code, detail=str(e))
 
 @router.get("/system/time")
-def get_time():
+@admitted("time")
+async def get_time():
     """
     Endpoint to get the current Chronos time.
+    Served from the local clock estimate, with its error bound and sync age.
     """
     try:
-        current_time = orchestrator.sync_time()
-        return {"chronos_time": current_time, "timestamp": time.time()}
+        reading = await get_orchestrator().read_clock_async()
+        return FastJSONResponse(TimeResponse(
+            chronos_time=reading.chronos_time,
+            chronos_time_us=reading.chronos_time_us,
+            error_bound_us=reading.error_bound_us,
+            sync_age=reading.sync_age,
+            timestamp=time.time(),
+        ))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise upstream_error(e)
 
 @router.get("/system/balance")
-def get_balance(user_id: str):
+@admitted("balance")
+async def get_balance(user_id: str):
     """
     Endpoint to retrieve the balance for a given user.
     """
     try:
-        balance = orchestrator.get_balance(user_id)
-        return balance
+        balance = await get_orchestrator().get_balance_async(user_id)
+        return FastJSONResponse(BalanceResponse.model_validate(balance))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise upstream_error(e)
+
+@router.post("/system/balances")
+@admitted("balance")
+async def get_balances(request: BulkBalanceRequest):
+    """
+    Endpoint to retrieve the balances of many users in one call.
+    Users whose lookup failed are listed under "errors" instead of failing the whole request.
+    """
+    try:
+        balances = await get_orchestrator().get_balances_async(request.user_ids)
+        return FastJSONResponse(BulkBalanceResponse.model_validate(balances))
+    except Exception as e:
+        raise upstream_error(e)
 
 @router.post("/system/transaction")
-def process_transaction(transaction: dict):
+@admitted("transaction")
+async def process_transaction(transaction: dict, idempotency_key: str = Header(None)):
     """
     Endpoint to process a currency transaction.
+    Invalid transactions are rejected with 422 before any upstream call; returns 429 with
+    a Retry-After header when the submission queue is full.
+    With the outbox enabled the transaction is answered with 202 and status "accepted" as
+    soon as it is stored durably; GET /system/transaction/{tx_id} follows its submission.
+    503 means it could not be stored.
+    Retries carrying the same Idempotency-Key header (or, without one, the same content)
+    get the original transaction record instead of a second submission; reusing a key for
+    a different transaction is a 409.
     """
+    orchestrator = get_orchestrator()
     try:
-        tx_record = orchestrator.process_transaction(transaction)
-        return {"transaction_record": tx_record, "status": "success"}
+        tx_record = await orchestrator.process_transaction_async(transaction, idempotency_key)
+        if orchestrator.outbox is not None:
+            return FastJSONResponse(TransactionResult(
+                transaction_record=TransactionRecord.model_validate(tx_record), status="accepted"), status_code=202)
+        return FastJSONResponse(TransactionResult(
+            transaction_record=TransactionRecord.model_validate(tx_record), status="success"))
+    except TransactionValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except PipelineFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except OutboxUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        raise upstream_error(e, status_code=400)
+
+@router.get("/system/transaction/{tx_id}")
+@admitted("ledger")
+async def get_transaction_status(tx_id: str):
+    """
+    Endpoint to follow a transaction accepted into the outbox: "accepted" while it waits to
+    be submitted, then "submitted" with the blockchain's record, or "failed" with the reason.
+    """
+    try:
+        status = await get_orchestrator().get_transaction_status_async(tx_id)
+        return FastJSONResponse(TransactionStatus.model_validate(status))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise upstream_error(e)
+
+@router.post("/system/transactions")
+@admitted("transaction")
+async def process_transactions(request: BulkTransactionRequest):
+    """
+    Endpoint to process several transactions in one call.
+    The batch is validated in one pass; each transaction gets its own result, in order.
+    """
+    try:
+        return FastJSONResponse(await get_orchestrator().process_transactions_async(request.transactions))
+    except TransactionValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    except IdempotencyConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except PipelineFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except OutboxUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        raise upstream_error(e, status_code=400)
+
+@router.get("/system/chain")
+async def stream_chain(start: int = 0):
+    """
+    Endpoint to stream the blockchain ledger as NDJSON, one block per line.
+    Blocks are forwarded as they are parsed from the upstream response.
+    """
+    blocks = get_orchestrator().stream_chain_async(start)
+    try:
+        # Pull the first block before answering so upstream failures still map to an error status.
+        first = await blocks.__anext__()
+    except StopAsyncIteration:
+        first = None
+    except Exception as e:
+        raise upstream_error(e, status_code=502)
+
+    async def ndjson():
+        try:
+            if first is not None:
+                yield dumps(first) + b"\n"
+                async for block in blocks:
+                    yield dumps(block) + b"\n"
+        finally:
+            await blocks.aclose()
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+@router.get("/system/ledger/transactions")
+@admitted("ledger")
+async def get_user_transactions(user_id: str, limit: int = None):
+    """
+    Endpoint to list a user's transactions, served from the local ledger replica.
+    """
+    try:
+        transactions = await get_orchestrator().get_user_transactions_async(user_id, limit=limit)
+        return FastJSONResponse(UserTransactions.model_validate({"user_id": user_id, "transactions": transactions}))
+    except Exception as e:
+        raise upstream_error(e)
+
+@router.get("/system/history")
+@admitted("ledger")
+async def get_account_history(user_id: str, days: float = Query(30.0, gt=0), since: float = None, until: float = None,
+                              limit: int = Query(100, ge=0, le=1000), top: int = Query(10, ge=0, le=100)):
+    """
+    Endpoint summarizing what a user sent and received, served from the local ledger replica:
+    totals, top counterparties by volume and the most recent transactions. The window is
+    [since, until) when since is given, otherwise the last `days` days.
+    """
+    if since is None:
+        since = (until if until is not None else time.time()) - days * 86400
+    try:
+        history = await get_orchestrator().get_account_history_async(user_id, since, until, limit=limit, top=top)
+        return FastJSONResponse(AccountHistory.model_validate(history))
+    except Exception as e:
+        raise upstream_error(e)
+
+@router.get("/system/ledger/transactions/{tx_id}")
+@admitted("ledger")
+async def lookup_transaction(tx_id: str):
+    """
+    Endpoint to look up a single transaction by id in the local ledger replica.
+    """
+    try:
+        transaction = await get_orchestrator().lookup_transaction_async(tx_id)
+        return FastJSONResponse(TransactionRecord.model_validate(transaction))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise upstream_error(e)
 
 @router.get("/system/status")
-def get_status():
+@admitted("status")
+async def get_status():
     """
     Endpoint to get the network status.
+    The status may be served from cache; the Age header gives its age in seconds.
     """
     try:
-        status = orchestrator.get_network_status()
-        return status
+        cached = await get_orchestrator().get_network_status_cached_async()
+        return FastJSONResponse(NetworkStatus.model_validate(cached.value), headers={"Age": str(int(cached.age))})
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise upstream_error(e)
+
+@router.get("/system/metrics/history")
+@admitted("status")
+async def get_metrics_history(fields: str = None, minutes: float = Query(60.0, gt=0), since: float = None,
+                              until: float = None, resolution: float = Query(None, gt=0)):
+    """
+    Endpoint returning network metrics history recorded locally by the background collector.
+    fields is a comma-separated list of metrics (default: all). The range is [since, until)
+    when since is given, otherwise the last `minutes` minutes. Each metric has its points
+    ([bucket start, avg, min, max]) and min/max/avg/p50/p90/p99 over the range; the
+    resolution is the finest tier (1s, 1m, 1h) that still covers the range unless given.
+    since and until must be finite and not in the future (400 otherwise).
+    """
+    now = time.time()
+    if until is None:
+        until = now
+    if since is None:
+        since = until - minutes * 60
+    if not (math.isfinite(since) and math.isfinite(until)) or since > now or until > now:
+        raise HTTPException(status_code=400, detail="since and until must be finite and not in the future")
+    names = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    try:
+        history = await get_orchestrator().get_metrics_history_async(since, until, fields=names, resolution=resolution)
+        return FastJSONResponse(MetricsHistory.model_validate(history))
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise upstream_error(e)
+
+@router.get("/system/stream")
+async def stream_updates(topics: str = "time,status,balance", user_id: str = None):
+    """
+    Endpoint pushing time, network status and balance updates as Server-Sent Events.
+    topics is a comma-separated subset of time, status and balance (balance needs user_id;
+    it is skipped without one). Each topic first sends a "snapshot" event with the full value,
+    then "delta" events with only the changed keys (removed keys are null). Every event's data
+    is {"topic": ..., "data": ...}. Slow clients receive coalesced updates.
+    """
+    keys = []
+    for topic in (name.strip() for name in topics.split(",") if name.strip()):
+        if topic == "balance":
+            if user_id:
+                keys.append(f"balance:{user_id}")
+        else:
+            keys.append(topic)
+    if not keys:
+        raise HTTPException(status_code=400, detail="No topics to subscribe to")
+    hub = get_orchestrator().push
+    try:
+        subscriber = await hub.subscribe(keys)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SubscriberLimitError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    async def events():
+        async for update in hub.updates(subscriber):
+            if update is None:
+                yield b": keepalive\n\n"
+                continue
+            topic, event, data = update
+            yield b"event: " + event.encode() + b"\ndata: " + dumps({"topic": topic, "data": data}) + b"\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/system/snapshot")
+@admitted("snapshot")
+async def get_snapshot(user_id: str = None, deadline: float = None):
+    """
+    Endpoint to fetch time, balance, network status and AI insights in one round trip.
+    Sections are fetched concurrently; those that miss the deadline are listed in "timed_out".
+    """
+    return FastJSONResponse(await get_orchestrator().get_snapshot_async(user_id, deadline))
+
+@router.get("/system/upstreams")
+async def get_upstreams():
+    """
+    Endpoint to inspect per-upstream circuit breakers, adaptive timeouts and latency percentiles.
+    """
+    return FastJSONResponse(get_orchestrator().get_upstream_health())
+
+@router.get("/system/admission")
+async def get_admission():
+    """
+    Endpoint to inspect admission control: running requests and limits per route class,
+    queued requests per priority and which priorities are currently being shed.
+    """
+    return FastJSONResponse(admission.snapshot())
 
 @router.get("/system/ai-insights")
-def get_ai_insights():
+@admitted("insights")
+async def get_ai_insights():
     """
-    Endpoint to retrieve AI insights (placeholder until AI module is implemented).
+    Endpoint to retrieve AI insights, computed locally from transaction flow, upstream
+    latencies and network metrics: EWMA means and deviations, rates and anomaly scores.
     """
     try:
-        insights = orchestrator.get_ai_insights()
-        return insights
+        insights = await get_orchestrator().get_ai_insights_async()
+        return FastJSONResponse(AIMetrics.model_validate(insights))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise upstream_error(e)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Endpoint exposing call latencies, error counts, in-flight gauges and cache counters
+    in the Prometheus text format.
+    """
+    return PlainTextResponse(REGISTRY.expose(), media_type="text/plain; version=0.0.4")
@@ -7,6 +7,9 @@ class TimeResponse(BaseModel):
     """
     chronos_time: float  # The current Chronos cunix time
     timestamp: float     # Local timestamp when the time was fetched
+    chronos_time_us: Optional[int] = None  # Chronos cunix time in microseconds
+    error_bound_us: Optional[int] = None   # Error bound of the local clock estimate
+    sync_age: Optional[float] = None       # Seconds since the last Time API sample
 
 class BalanceResponse(BaseModel):
     """
@@ -15,6 +18,19 @@ class BalanceResponse(BaseModel):
     balance: float       # Raw Chronos Currency (C₡) balance
     t_units: str         # Display value in T‑Units (e.g., "T⦀24" for one month)
 
+class BulkBalanceRequest(BaseModel):
+    """
+    Represents a request for the balances of several users.
+    """
+    user_ids: List[str]
+
+class BulkBalanceResponse(BaseModel):
+    """
+    Represents the balances of several users, with failures reported per user.
+    """
+    balances: Dict[str, BalanceResponse]
+    errors: Dict[str, str]  # user_id -> error message
+
 class Transaction(BaseModel):
     """
     Represents a currency transaction request.
@@ -24,6 +40,13 @@ class Transaction(BaseModel):
     amount: float
     timestamp: float     # The time when the transaction was initiated
 
+class BulkTransactionRequest(BaseModel):
+    """
+    Represents several transactions submitted in one request. Each entry is validated
+    individually, so it is kept as a raw object here.
+    """
+    transactions: list
+
 class TransactionRecord(BaseModel):
     """
     Represents the record returned by the blockchain after processing a transaction.
@@ -35,6 +58,72 @@ class TransactionRecord(BaseModel):
     timestamp: float
     status: str          # e.g., "success", "failed"
 
+class TransactionResult(BaseModel):
+    """
+    Represents the response to a submitted transaction.
+    """
+    transaction_record: TransactionRecord
+    status: str
+
+class TransactionStatus(BaseModel):
+    """
+    Represents the progress of a transaction accepted into the local outbox.
+    """
+    transaction_id: str
+    status: str          # "accepted" (durable, not yet submitted), "submitted" or "failed"
+    transaction: Transaction
+    accepted_at: float
+    settled_at: Optional[float]
+    attempts: int
+    record: Optional[TransactionRecord]   # As returned by the blockchain once submitted
+    error: Optional[str]
+
+class UserTransactions(BaseModel):
+    """
+    Represents the transactions of one user, as recorded in the local ledger replica.
+    """
+    user_id: str
+    transactions: List[TransactionRecord]
+
+class HistoryEntry(BaseModel):
+    """
+    Represents one transaction in an account history.
+    """
+    sender: str
+    receiver: str
+    amount: float
+    timestamp: float
+
+class HistorySummary(BaseModel):
+    """
+    Represents the totals of an account history window.
+    """
+    sent_count: int
+    sent_total: float
+    received_count: int
+    received_total: float
+    net: float           # received_total - sent_total
+
+class Counterparty(BaseModel):
+    """
+    Represents the volume exchanged with one counterparty.
+    """
+    user_id: str
+    count: int
+    sent: float          # Sent to the counterparty
+    received: float      # Received from the counterparty
+
+class AccountHistory(BaseModel):
+    """
+    Represents what a user sent and received within a time window, from the local ledger replica.
+    """
+    user_id: str
+    since: Optional[float]
+    until: Optional[float]
+    summary: HistorySummary
+    top_counterparties: List[Counterparty]
+    transactions: List[HistoryEntry]  # Most recent first
+
 class PeerInfo(BaseModel):
     """
     Represents information about a discovered peer.
@@ -51,6 +140,28 @@ class NetworkStatus(BaseModel):
     peer_count: int
     peers: List[PeerInfo]
 
+class MetricAggregate(BaseModel):
+    """
+    Represents the history of one network metric over a time range.
+    """
+    count: int                 # Samples in the range
+    min: Optional[float]
+    max: Optional[float]
+    avg: Optional[float]
+    p50: Optional[float]       # Percentiles of the per-bucket averages
+    p90: Optional[float]
+    p99: Optional[float]
+    points: List[List[float]]  # [bucket start, avg, min, max], oldest first
+
+class MetricsHistory(BaseModel):
+    """
+    Represents network metrics history at one resolution, as kept by the local collector.
+    """
+    resolution: float          # Bucket width in seconds
+    since: float
+    until: float
+    fields: Dict[str, MetricAggregate]
+
 class AIMetrics(BaseModel):
     """
     Represents AI-generated insights or metrics.
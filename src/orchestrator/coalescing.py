@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set
+
+from src.utils.metrics import cache_result
+
+logger = logging.getLogger(__name__)
+
+# A batch function receives distinct keys and returns, per key, either a result or an Exception.
+BatchFunction = Callable[[List[Hashable]], Awaitable[Dict[Hashable, object]]]
+
+
+class CoalescingLoader:
+    """
+    Coalesces concurrent lookups of the same key into one in-flight call (single-flight)
+    and micro-batches distinct keys that arrive within a short window into one call
+    to the batch function.
+
+    Results are not cached: once a batch completes, the next lookup of a key goes upstream again.
+    """
+
+    def __init__(self, name: str, batch_fn: BatchFunction, window: float, max_batch_size: int):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._pending: List[Hashable] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batches: Set[asyncio.Task] = set()
+
+    async def load(self, key: Hashable):
+        """
+        Return the result for key, sharing any lookup of the same key that is already in flight.
+        """
+        future = self._in_flight.get(key)
+        cache_result(self.name, "miss" if future is None else "coalesced")
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._in_flight[key] = future
+            self._pending.append(key)
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.window, self._flush)
+        # Shield so that one cancelled caller does not cancel the lookup for everyone else.
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: List[Hashable]) -> Dict[Hashable, object]:
+        """
+        Look up several keys at once. Failures are returned per key as Exception instances
+        instead of failing the whole call.
+        """
+        unique = list(dict.fromkeys(keys))
+        results = await asyncio.gather(*(self.load(key) for key in unique), return_exceptions=True)
+        return dict(zip(unique, results))
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # Referenced until done: the loop itself only keeps a weak reference to its tasks.
+            task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List[Hashable]) -> None:
+        results = None
+        try:
+            results = await self.batch_fn(batch)
+            if not isinstance(results, dict):
+                raise TypeError(f"Batch function of {self.name} returned {type(results).__name__}, not a dict")
+        except Exception as e:
+            results = {key: e for key in batch}
+        finally:
+            # Runs on cancellation too, so that no caller is left waiting on its key.
+            for key in batch:
+                future = self._in_flight.pop(key, None)
+                if future is None or future.done():
+                    continue
+                if results is None:
+                    future.cancel()
+                    continue
+                result = results.get(key, LookupError(f"No result returned for {key!r}"))
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    async def stop(self) -> None:
+        """
+        Cancel the batches in flight and the lookups still waiting for one.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for key in self._pending:
+            future = self._in_flight.pop(key, None)
+            if future is not None:
+                future.cancel()
+        self._pending = []
+        tasks = list(self._batches)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from src.api_clients.endpoint_pool import EndpointPool
+from src.api_clients.network_client import NetworkClient
+from src.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def peer_urls(peers: List[dict], template: str) -> List[str]:
+    """
+    Base URLs for the discovered peers, reusing the path of the configured template URL.
+    Peers that support mTLS are reached over https, the others over http.
+    """
+    path = urlsplit(template).path.rstrip("/")
+    urls = []
+    for peer in peers:
+        ip, port = peer.get("ip"), peer.get("port")
+        if not ip or not port:
+            continue
+        scheme = "https" if peer.get("supports_mtls") else "http"
+        urls.append(f"{scheme}://{ip}:{port}{path}")
+    return urls
+
+
+class PeerDiscovery:
+    """
+    Periodically feeds the peers known to the Chronos Network API into the endpoint pools
+    of the upstreams listed in DISCOVERY_UPSTREAMS, so reads can use them as replicas.
+    """
+
+    def __init__(self, network_client: NetworkClient, pools: Dict[str, EndpointPool], interval: float = None):
+        self.network_client = network_client
+        self.pools = pools
+        self.interval = interval or settings.DISCOVERY_INTERVAL
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> None:
+        """
+        Fetch the current peers and update every participating pool.
+        """
+        cached = await self.network_client.get_peers_cached()
+        peers = cached.value.get("peers", [])
+        for pool in self.pools.values():
+            pool.update_discovered(peer_urls(peers, pool.primary.base_url))
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Peer discovery failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """
+        Start periodic discovery on the running event loop; a no-op without participating pools.
+        """
+        if self.pools and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info("Peer discovery started for %s (interval=%ss)", ", ".join(self.pools), self.interval)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from src.api_clients.blockchain_client import BlockchainClient
+from src.config.settings import settings
+from src.storage.block_store import BlockStore
+
+if TYPE_CHECKING:
+    from src.storage.transaction_columns import TransactionColumns
+
+logger = logging.getLogger(__name__)
+
+
+_HISTORY_CHUNK = 16384
+
+
+def _build_columns(history: "TransactionColumns", store: BlockStore, height: int) -> "TransactionColumns":
+    # Appended in large chunks rather than per block: each append merges into the tail index.
+    chunk = []
+    for block in store.iter_blocks(0, height):
+        chunk.extend(block.get("transactions", []))
+        if len(chunk) >= _HISTORY_CHUNK:
+            history.append(chunk)
+            chunk = []
+    history.append(chunk)
+    return history
+
+
+def summarize_history(transactions: List[dict], user: str, since: float = None, until: float = None,
+                      limit: int = 100, top: int = 10) -> dict:
+    """
+    Plain-Python equivalent of TransactionColumns.history over one user's transactions (in
+    ledger order), used while the columnar copy is being built.
+    """
+    sent_count = received_count = 0
+    sent_total = received_total = 0.0
+    counterparties: Dict[str, list] = {}
+    window = []
+    for tx in transactions:
+        try:
+            sender, receiver = tx["sender"], tx["receiver"]
+            amount, timestamp = float(tx["amount"]), float(tx["timestamp"])
+        except (KeyError, TypeError, ValueError, OverflowError):
+            continue
+        if (since is not None and timestamp < since) or (until is not None and timestamp >= until):
+            continue
+        window.append({"sender": sender, "receiver": receiver, "amount": amount, "timestamp": timestamp})
+        totals = counterparties.setdefault(receiver if sender == user else sender, [0, 0.0, 0.0])
+        totals[0] += 1
+        if sender == user:
+            sent_count += 1
+            sent_total += amount
+            totals[1] += amount
+        else:
+            totals[2] += amount
+        if receiver == user:
+            received_count += 1
+            received_total += amount
+    ranked = sorted(counterparties.items(), key=lambda item: -(item[1][1] + item[1][2]))[:max(top, 0)]
+    return {
+        "summary": {
+            "sent_count": sent_count,
+            "sent_total": sent_total,
+            "received_count": received_count,
+            "received_total": received_total,
+            "net": received_total - sent_total,
+        },
+        "top_counterparties": [{"user_id": other, "count": count, "sent": sent, "received": received}
+                               for other, (count, sent, received) in ranked],
+        "transactions": window[::-1][:limit] if limit > 0 else [],
+    }
+
+
+class LedgerReplica:
+    """
+    Local, incrementally synchronized copy of the Chronos blockchain.
+
+    Each sync fetches only the blocks after the last stored height and appends them to the
+    on-disk BlockStore, so transaction lookups are served locally instead of re-downloading
+    the chain. Account-history queries use a columnar copy of the transactions, built from
+    the store in a worker thread on first use and extended by every later sync; until it is
+    ready they are answered from the store's per-user index.
+
+    When several worker processes share the directory, only the one holding the store's
+    write lock fetches from the Blockchain API; the others' syncs pick up what it stored.
+    """
+
+    def __init__(self, blockchain_client: BlockchainClient, directory: str = None, interval: float = None):
+        self.blockchain_client = blockchain_client
+        self.directory = directory or settings.LEDGER_DIR
+        self.interval = interval or settings.LEDGER_SYNC_INTERVAL
+        self._store: Optional[BlockStore] = None
+        self._history: Optional["TransactionColumns"] = None
+        self._history_task: Optional[asyncio.Task] = None
+        self._task: Optional[asyncio.Task] = None
+        self._sync_lock: Optional[asyncio.Lock] = None
+        self._open_lock: Optional[asyncio.Lock] = None
+
+    @property
+    def store(self) -> BlockStore:
+        """
+        The opened block store; see open().
+        """
+        if self._store is None:
+            raise RuntimeError("Ledger replica is not open yet")
+        return self._store
+
+    async def open(self) -> BlockStore:
+        """
+        Open the block store on first use. Opening re-indexes every stored block, so it runs in
+        a worker thread rather than on the event loop.
+        """
+        if self._store is None:
+            if self._open_lock is None:
+                self._open_lock = asyncio.Lock()
+            async with self._open_lock:
+                if self._store is None:
+                    self._store = await asyncio.to_thread(BlockStore, self.directory)
+        return self._store
+
+    def history(self) -> Optional["TransactionColumns"]:
+        """
+        The columnar copy of the ledger, or None while it is being built. The first call starts
+        building it in the background.
+        """
+        if self._history is None and (self._history_task is None or self._history_task.done()):
+            self._history_task = asyncio.get_running_loop().create_task(self._build_history())
+        return self._history
+
+    async def _build_history(self) -> None:
+        # numpy is only imported once history is queried; it is not needed to serve the API.
+        from src.storage.transaction_columns import TransactionColumns
+        store = await self.open()
+        started = time.perf_counter()
+        height = store.height
+        try:
+            history = await asyncio.to_thread(_build_columns, TransactionColumns(), store, height)
+        except Exception as e:
+            logger.error("Building account history failed: %s", e)
+            return
+        if self._store is not store:
+            return   # Stopped meanwhile
+        # Catch up with blocks synced while the thread ran; nothing can interleave from here on.
+        history.append(tx for block in store.iter_blocks(height) for tx in block.get("transactions", []))
+        self._history = history
+        logger.info("Built account history of %s transactions for %s users in %.2fs",
+                    len(history), history.user_count, time.perf_counter() - started)
+
+    async def sync(self) -> int:
+        """
+        Fetch and store the blocks added upstream since the last sync, or, in a process that is
+        not the store's writer, load the blocks the writer has stored since.
+
+        Returns:
+            The number of new blocks stored.
+        """
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+        async with self._sync_lock:
+            store = await self.open()
+            start = store.height
+            blocks = store.refresh()
+            if store.writable:
+                fetched = await self.blockchain_client.get_blocks_async(store.height)
+                store.append(fetched)
+                blocks += fetched
+            if self._history is not None:
+                self._history.append(tx for block in blocks for tx in block.get("transactions", []))
+            if blocks:
+                logger.info("Ledger replica advanced from height %s to %s", start, store.height)
+            return len(blocks)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Ledger replica sync failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """
+        Start periodic background synchronization on the running event loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._history_task is not None:
+            self._history_task.cancel()
+            await asyncio.gather(self._history_task, return_exceptions=True)
+            self._history_task = None
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        self._history = None
+
+    async def find_transaction(self, tx_id: str) -> Optional[dict]:
+        return (await self.open()).find_transaction(tx_id)
+
+    async def transactions_for(self, user_id: str, limit: int = None) -> List[dict]:
+        return (await self.open()).transactions_for(user_id, limit=limit)
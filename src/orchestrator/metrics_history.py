@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+from src.api_clients.network_client import NetworkClient
+from src.config.settings import settings
+
+if TYPE_CHECKING:
+    from src.storage.metric_series import MetricSeries
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsHistory:
+    """
+    Samples the Chronos Network API's metrics in the background and keeps their history.
+
+    One upstream poll per interval feeds a MetricSeries with tiers set by
+    METRICS_HISTORY_TIERS (1s/1m/1h by default), so trend queries are answered locally
+    instead of every chart polling upstream and keeping its own history. Failed polls leave
+    a gap rather than repeating the last value. on_sample, if given, is also called with each
+    sample.
+    """
+
+    def __init__(self, network_client: NetworkClient, interval: float = None, tiers: str = None,
+                 max_fields: int = None, on_sample: Callable[[dict], None] = None):
+        self.network_client = network_client
+        self.interval = interval or settings.METRICS_HISTORY_INTERVAL
+        self.tiers = tiers or settings.METRICS_HISTORY_TIERS
+        self.max_fields = max_fields or settings.METRICS_HISTORY_MAX_FIELDS
+        self.on_sample = on_sample
+        self._series: Optional["MetricSeries"] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def series(self) -> "MetricSeries":
+        if self._series is None:
+            # numpy is only imported once metrics history is in use; it is not needed to serve the API.
+            from src.storage.metric_series import MetricSeries, parse_tiers
+            self._series = MetricSeries(parse_tiers(self.tiers), max_fields=self.max_fields)
+            logger.info("Metrics history allocated %s bytes for tiers %s", self._series.nbytes, self.tiers)
+        return self._series
+
+    async def sample(self) -> None:
+        """
+        Poll the current metrics once and record them.
+        """
+        metrics = await self.network_client.get_metrics_async()
+        self.series.add(time.time(), metrics)
+        if self.on_sample is not None:
+            self.on_sample(metrics)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sample()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Sampling network metrics failed: %s", e)
+            # Aligned to interval boundaries so each sample lands in its own finest-tier bucket.
+            await asyncio.sleep(self.interval - time.time() % self.interval)
+
+    def query(self, since: float, until: float, fields: List[str] = None, resolution: float = None) -> dict:
+        """
+        History of fields (default: all) within [since, until); see MetricSeries.query.
+        """
+        return self.series.query(since, until, time.time(), fields=fields, resolution=resolution)
+
+    def start(self) -> None:
+        """
+        Start sampling on the running event loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info("Metrics history started (interval=%ss, tiers=%s)", self.interval, self.tiers)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -1,15 +1,32 @@
+import asyncio
 import logging
 import time
+from typing import AsyncIterator, Awaitable, List, Optional
 
 # Import API clients from the api_clients package.
 from src.api_clients.time_client import TimeClient
 from src.api_clients.currency_client import CurrencyClient
 from src.api_clients.blockchain_client import BlockchainClient
 from src.api_clients.network_client import NetworkClient
-# from src.api_clients.ai_client import AIClient
+from src.api_clients.http_session import close_sessions, tls_stats
+from src.api_clients.resilience import add_call_observer, guard_states, remove_call_observer
+from src.api_clients.ai_client import AIClient
+from src.orchestrator.time_sync import ClockSynchronizer, ClockReading
+from src.orchestrator.coalescing import CoalescingLoader
+from src.orchestrator.tx_pipeline import TransactionPipeline
+from src.orchestrator.outbox import TransactionOutbox
+from src.orchestrator.ledger_replica import LedgerReplica, summarize_history
+from src.orchestrator.discovery import PeerDiscovery
+from src.orchestrator.metrics_history import MetricsHistory
+from src.orchestrator.push import PushHub
+from src.orchestrator.validation import TransactionValidationError, TransactionValidator, ValidatedTransaction
+from src.utils.cache import CachedValue, IdempotencyCache, IdempotencyConflictError
+from src.config.settings import settings
+from src.utils.logging_config import configure_logging, summarize
+from src.utils.metrics import instrumented
+from src.utils.shared_cache import get_shared_store
 
-# Configure logging.
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(asctime)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 
 class ChronosSystemOrchestrator:
@@ -22,8 +39,42 @@ class ChronosSystemOrchestrator:
         self.currency_client = CurrencyClient()
         self.blockchain_client = BlockchainClient()
         self.network_client = NetworkClient()
-        # self.ai_client = AIClient()  # Placeholder for future AI integration
+        self.clock = ClockSynchronizer(self.time_client, shared=get_shared_store())
+        self.balance_loader = CoalescingLoader(
+            "balance",
+            self.currency_client.get_balances_async,
+            window=settings.BALANCE_BATCH_WINDOW,
+            max_batch_size=settings.BALANCE_BATCH_MAX_SIZE,
+        )
+        self.validator = TransactionValidator()
+        self.submissions = IdempotencyCache(
+            "transactions",
+            ttl=settings.IDEMPOTENCY_TTL,
+            max_entries=settings.IDEMPOTENCY_MAX_ENTRIES,
+        )
+        self.tx_pipeline = TransactionPipeline(self.blockchain_client)
+        self.outbox = TransactionOutbox(self.tx_pipeline) if settings.OUTBOX_ENABLED else None
+        self.ledger = LedgerReplica(self.blockchain_client)
+        clients = {
+            "time": self.time_client,
+            "currency": self.currency_client,
+            "blockchain": self.blockchain_client,
+            "network": self.network_client,
+        }
+        self.pools = {name: client.pool for name, client in clients.items()}
+        discovered = [name.strip() for name in settings.DISCOVERY_UPSTREAMS.split(",") if name.strip() in clients]
+        self.discovery = PeerDiscovery(self.network_client, {name: self.pools[name] for name in discovered})
+        # Insights are computed locally from transactions, upstream calls and network metrics.
+        self.ai_client = AIClient()
+        self.metrics_history = (MetricsHistory(self.network_client, on_sample=self.ai_client.observe_network)
+                                if settings.METRICS_HISTORY_ENABLED else None)
+        self.push = PushHub({
+            "time": self._push_time,
+            "status": self._push_status,
+            "balance": self.get_balance_async,
+        })
 
+    @instrumented("orchestrator")
     def sync_time(self) -> float:
         """
         Synchronize the system time by fetching the current Chronos cunix time from the Chronos Time API.
@@ -36,12 +87,39 @@ class ChronosSystemOrchestrator:
         """
         try:
             current_time = self.time_client.get_current_time()
-            logging.info(f"Synchronized Chronos time: {current_time}")
+            logger.debug("Synchronized Chronos time: %s", current_time)
             return current_time
         except Exception as e:
-            logging.error(f"Time synchronization failed: {e}")
+            logger.error("Time synchronization failed: %s", e)
             raise
 
+    @instrumented("orchestrator")
+    async def sync_time_async(self) -> float:
+        """
+        Async variant of sync_time. Served from the local clock estimate; the Time API is
+        only contacted when the estimate is stale.
+        """
+        reading = await self.read_clock_async()
+        return reading.chronos_time
+
+    @instrumented("orchestrator")
+    async def read_clock_async(self) -> ClockReading:
+        """
+        Read the locally synchronized Chronos clock.
+
+        Returns:
+            A ClockReading with the time in microseconds, its error bound and the sync age.
+
+        Raises:
+            Exception if no estimate exists and the live fetch fails.
+        """
+        try:
+            return await self.clock.now()
+        except Exception as e:
+            logger.error("Time synchronization failed: %s", e)
+            raise
+
+    @instrumented("orchestrator")
     def get_balance(self, user_id: str) -> dict:
         """
         Retrieve the balance for a given user via the Chronos Currency API.
@@ -57,34 +135,169 @@ class ChronosSystemOrchestrator:
         """
         try:
             balance = self.currency_client.get_balance(user_id)
-            logging.info(f"Retrieved balance for user {user_id}: {balance}")
+            logger.debug("Retrieved balance for user %s: %s", user_id, summarize(balance))
             return balance
         except Exception as e:
-            logging.error(f"Failed to retrieve balance for user {user_id}: {e}")
+            logger.error("Failed to retrieve balance for user %s: %s", user_id, e)
             raise
 
-    def process_transaction(self, transaction_data: dict) -> dict:
+    @instrumented("orchestrator")
+    async def get_balance_async(self, user_id: str) -> dict:
+        """
+        Async variant of get_balance. Concurrent lookups of the same user share one upstream
+        call, and lookups arriving within BALANCE_BATCH_WINDOW are batched together.
+        """
+        try:
+            balance = await self.balance_loader.load(user_id)
+            logger.debug("Retrieved balance for user %s: %s", user_id, summarize(balance))
+            return balance
+        except Exception as e:
+            logger.error("Failed to retrieve balance for user %s: %s", user_id, e)
+            raise
+
+    @instrumented("orchestrator")
+    async def get_balances_async(self, user_ids: list) -> dict:
+        """
+        Retrieve the balances of many users, coalesced into as few upstream requests as possible.
+
+        Args:
+            user_ids: The identifiers of the users.
+
+        Returns:
+            A dictionary {"balances": {<user_id>: <balance>}, "errors": {<user_id>: <message>}}.
+            A failing user is reported in "errors" without failing the rest of the batch.
+        """
+        results = await self.balance_loader.load_many(user_ids)
+        balances, errors = {}, {}
+        for user_id, result in results.items():
+            if isinstance(result, Exception):
+                errors[user_id] = str(result)
+            else:
+                balances[user_id] = result
+        logger.debug("Retrieved %s balances (%s failed)", len(balances), len(errors))
+        return {"balances": balances, "errors": errors}
+
+    @instrumented("orchestrator")
+    def process_transaction(self, transaction_data: dict, idempotency_key: Optional[str] = None) -> dict:
         """
         Process a currency transaction by submitting it to the Chronos Blockchain API.
 
         Args:
             transaction_data: A dictionary containing transaction details.
+            idempotency_key: Identifies retries of the same submission; defaults to a hash of
+                the transaction's content. A remembered key returns the stored record.
 
         Returns:
             A dictionary with the transaction record.
 
         Raises:
+            TransactionValidationError if the transaction is rejected locally.
+            IdempotencyConflictError if idempotency_key was used for a different transaction.
             Exception if the transaction processing fails.
         """
+        transaction = self.validator.validate(transaction_data)
+        key, fingerprint = self._idempotency_key(transaction, idempotency_key)
+        tx_record = self.submissions.get(key, fingerprint)
+        if tx_record is not None:
+            return tx_record
         try:
-            # Optionally, add transaction validation logic here.
-            tx_record = self.blockchain_client.submit_transaction(transaction_data)
-            logging.info(f"Processed transaction: {tx_record}")
+            tx_record = self.blockchain_client.submit_transaction(transaction.to_dict())
+            self.submissions.remember(key, fingerprint, tx_record)
+            self.ai_client.observe_transaction(transaction.amount)
+            logger.debug("Processed transaction: %s", summarize(tx_record))
             return tx_record
         except Exception as e:
-            logging.error(f"Transaction processing failed: {e}")
+            logger.error("Transaction processing failed: %s", e)
             raise
 
+    @instrumented("orchestrator")
+    async def process_transaction_async(self, transaction_data: dict, idempotency_key: Optional[str] = None) -> dict:
+        """
+        Async variant of process_transaction.
+
+        With the outbox enabled, the transaction is recorded durably and submitted in the
+        background; the returned record carries the outbox id and status "accepted" (see
+        get_transaction_status_async). Otherwise it is submitted through the micro-batching
+        pipeline and the caller receives its own transaction record. A duplicate of a
+        submission still in flight waits for that submission's record.
+
+        Raises:
+            TransactionValidationError if the transaction is rejected locally.
+            IdempotencyConflictError if idempotency_key was used for a different transaction.
+            PipelineFullError if the submission queue (or the outbox) is full.
+            OutboxUnavailableError if the transaction could not be recorded.
+            Exception if the transaction processing fails.
+        """
+        transaction = self.validator.validate(transaction_data)
+        key, fingerprint = self._idempotency_key(transaction, idempotency_key)
+        try:
+            tx_record = await self.submissions.run(key, fingerprint, lambda: self._submit(transaction, key, fingerprint))
+            logger.debug("Processed transaction: %s", summarize(tx_record))
+            return tx_record
+        except IdempotencyConflictError:
+            raise
+        except Exception as e:
+            logger.error("Transaction processing failed: %s", e)
+            raise
+
+    @instrumented("orchestrator")
+    async def process_transactions_async(self, transactions: list) -> dict:
+        """
+        Validate a batch of transactions in one pass and submit the valid ones, through the
+        outbox when it is enabled or else the micro-batching pipeline. Invalid transactions
+        never reach the Chronos Blockchain API.
+
+        Returns:
+            {"results": [...]} with one entry per input, in order: {"status": "accepted" (outbox)
+            or "success", "transaction_record": ...} or {"status": "rejected" | "failed", "error": ...}.
+        """
+        validated = self.validator.validate_batch(transactions)
+
+        async def submit(transaction) -> dict:
+            if isinstance(transaction, TransactionValidationError):
+                return {"status": "rejected", "error": str(transaction)}
+            key, fingerprint = self._idempotency_key(transaction)
+            try:
+                tx_record = await self.submissions.run(
+                    key, fingerprint, lambda: self._submit(transaction, key, fingerprint))
+                return {"status": "accepted" if self.outbox is not None else "success", "transaction_record": tx_record}
+            except Exception as e:
+                return {"status": "failed", "error": str(e)}
+
+        results = await asyncio.gather(*(submit(transaction) for transaction in validated))
+        logger.debug("Processed %s transactions (%s rejected)", len(results),
+                     sum(result["status"] == "rejected" for result in results))
+        return {"results": results}
+
+    async def _submit(self, transaction: ValidatedTransaction, key: str, fingerprint: str) -> dict:
+        if self.outbox is None:
+            tx_record = await self.tx_pipeline.submit(transaction.to_dict())
+            self.ai_client.observe_transaction(transaction.amount)
+            return tx_record
+        entry = await self.outbox.accept(transaction.to_dict(), key, fingerprint)
+        self.ai_client.observe_transaction(transaction.amount)
+        return {"transaction_id": entry["transaction_id"], **entry["transaction"], "status": entry["status"]}
+
+    @instrumented("orchestrator")
+    async def get_transaction_status_async(self, tx_id: str) -> dict:
+        """
+        Report the progress of a transaction accepted into the outbox: whether it is still
+        waiting, was submitted (with the blockchain's record) or was refused.
+
+        Raises:
+            LookupError if the id is unknown, has expired or the outbox is disabled.
+        """
+        status = self.outbox.status(tx_id) if self.outbox is not None else None
+        if status is None:
+            raise LookupError(f"Transaction {tx_id} is not in the outbox")
+        return status
+
+    @staticmethod
+    def _idempotency_key(transaction: ValidatedTransaction, idempotency_key: Optional[str] = None):
+        fingerprint = transaction.fingerprint()
+        return idempotency_key or fingerprint, fingerprint
+
+    @instrumented("orchestrator")
     def get_network_status(self) -> dict:
         """
         Retrieve the current network status (node info, peer count, etc.) via the Chronos Network API.
@@ -97,34 +310,297 @@ class ChronosSystemOrchestrator:
         """
         try:
             status = self.network_client.get_status()
-            logging.info(f"Network status: {status}")
+            logger.debug("Network status: %s", summarize(status))
             return status
         except Exception as e:
-            logging.error(f"Failed to get network status: {e}")
+            logger.error("Failed to get network status: %s", e)
+            raise
+
+    def stream_chain_async(self, start_height: int = 0) -> AsyncIterator[dict]:
+        """
+        Stream the blockchain ledger block by block without buffering it in the orchestrator.
+
+        Args:
+            start_height: Height of the first block to stream.
+
+        Returns:
+            An async iterator over the blocks.
+        """
+        return self.blockchain_client.stream_chain_async(start_height)
+
+    @instrumented("orchestrator")
+    async def get_user_transactions_async(self, user_id: str, limit: int = None) -> list:
+        """
+        Retrieve the transactions sent or received by a user from the local ledger replica.
+
+        Args:
+            user_id: The identifier of the user.
+            limit: Maximum number of transactions to return (oldest first).
+
+        Returns:
+            A list of transaction records.
+        """
+        try:
+            if (await self.ledger.open()).height == 0:
+                await self.ledger.sync()
+            transactions = await self.ledger.transactions_for(user_id, limit=limit)
+            logger.debug("Found %s ledger transactions for user %s", len(transactions), user_id)
+            return transactions
+        except Exception as e:
+            logger.error("Failed to look up transactions for user %s: %s", user_id, e)
             raise
 
+    @instrumented("orchestrator")
+    async def get_account_history_async(self, user_id: str, since: float = None, until: float = None,
+                                        limit: int = 100, top: int = 10) -> dict:
+        """
+        Summarize what a user sent and received within [since, until) from the columnar copy of
+        the local ledger replica, without scanning the chain.
+
+        Args:
+            user_id: The identifier of the user.
+            since: Start of the window as a Unix timestamp (unbounded when omitted).
+            until: End of the window, exclusive (unbounded when omitted).
+            limit: Maximum number of transactions to list, most recent first.
+            top: Number of counterparties to rank by volume.
+
+        Returns:
+            A dictionary with the window, a summary, the top counterparties and the transactions.
+        """
+        try:
+            store = await self.ledger.open()
+            if store.height == 0:
+                await self.ledger.sync()
+            columns = self.ledger.history()
+            if columns is not None:
+                history = columns.history(user_id, since=since, until=until, limit=limit, top=top)
+            else:
+                # The columnar copy is still being built: answer from the store's per-user index,
+                # in a worker thread like the build itself, as a busy account reads many blocks.
+                history = await asyncio.to_thread(
+                    lambda: summarize_history(store.transactions_for(user_id), user_id, since=since, until=until,
+                                              limit=limit, top=top))
+            return {"user_id": user_id, "since": since, "until": until, **history}
+        except Exception as e:
+            logger.error("Failed to build account history for user %s: %s", user_id, e)
+            raise
+
+    @instrumented("orchestrator")
+    async def lookup_transaction_async(self, tx_id: str) -> dict:
+        """
+        Look up a transaction by id in the local ledger replica. If it is not known locally,
+        the replica is synchronized once before giving up.
+
+        Raises:
+            LookupError if the transaction does not exist.
+        """
+        transaction = await self.ledger.find_transaction(tx_id)
+        if transaction is None:
+            await self.ledger.sync()
+            transaction = await self.ledger.find_transaction(tx_id)
+        if transaction is None:
+            raise LookupError(f"Transaction {tx_id} not found")
+        return transaction
+
+    @instrumented("orchestrator")
+    async def get_network_status_async(self) -> dict:
+        """
+        Async variant of get_network_status, served from the network cache.
+        """
+        cached = await self.get_network_status_cached_async()
+        return cached.value
+
+    @instrumented("orchestrator")
+    async def get_network_status_cached_async(self) -> CachedValue:
+        """
+        Retrieve the network status from the stale-while-revalidate cache.
+
+        Returns:
+            A CachedValue holding the status and its age in seconds.
+
+        Raises:
+            Exception if no usable status is cached and the upstream fetch fails.
+        """
+        try:
+            cached = await self.network_client.get_status_cached()
+            logger.debug("Network status (age %.2fs): %s", cached.age, summarize(cached.value))
+            return cached
+        except Exception as e:
+            logger.error("Failed to get network status: %s", e)
+            raise
+
+    @instrumented("orchestrator")
+    async def get_metrics_history_async(self, since: float, until: float, fields: Optional[List[str]] = None,
+                                        resolution: float = None) -> dict:
+        """
+        Network metrics recorded by the background collector within [since, until), with
+        min/max/avg and percentiles per metric, without calling the Network API.
+
+        Args:
+            since: Start of the range as a Unix timestamp.
+            until: End of the range, exclusive.
+            fields: Metrics to return (default: all recorded ones).
+            resolution: Bucket width in seconds; by default the finest tier covering the range.
+
+        Returns:
+            A dictionary with the resolution used, the range and the history of each metric.
+
+        Raises:
+            LookupError if metrics history is disabled.
+        """
+        if self.metrics_history is None:
+            raise LookupError("Metrics history is disabled")
+        try:
+            return self.metrics_history.query(since, until, fields=fields, resolution=resolution)
+        except Exception as e:
+            logger.error("Failed to query metrics history: %s", e)
+            raise
+
+    @instrumented("orchestrator")
     def get_ai_insights(self) -> dict:
         """
-        Retrieve AI insights from the Chronos AI API.
-        (This is a placeholder method until the AI module is fully implemented.)
+        Retrieve AI insights from the local streaming insights engine: rates and running
+        statistics of transaction flow, upstream latencies and network metrics, with anomaly
+        scores.
 
         Returns:
-            A dictionary with AI-generated insights.
+            A dictionary with the insights and their timestamp.
 
         Raises:
             Exception if the AI insights retrieval fails.
         """
         try:
             insights = self.ai_client.get_insights()
-            logging.info(f"AI insights: {insights}")
+            logger.debug("AI insights: %s", summarize(insights))
+            return insights
+        except Exception as e:
+            logger.error("Failed to get AI insights: %s", e)
+            raise
+
+    @instrumented("orchestrator")
+    async def get_ai_insights_async(self) -> dict:
+        """
+        Async variant of get_ai_insights.
+        """
+        try:
+            insights = await self.ai_client.get_insights_async()
+            logger.debug("AI insights: %s", summarize(insights))
             return insights
         except Exception as e:
-            logging.error(f"Failed to get AI insights: {e}")
+            logger.error("Failed to get AI insights: %s", e)
             raise
 
+    @instrumented("orchestrator")
+    async def get_snapshot_async(self, user_id: Optional[str] = None, deadline: float = None) -> dict:
+        """
+        Assemble time, balance, network status and AI insights in one call. All sections are
+        fetched concurrently, so total latency is that of the slowest section rather than the sum.
+
+        Args:
+            user_id: Whose balance to include; the balance section is skipped when omitted.
+            deadline: Per-section deadline in seconds (defaults to SNAPSHOT_SECTION_DEADLINE).
+
+        Returns:
+            A dictionary with one entry per section, each {"status": "ok", "data": ...},
+            {"status": "timeout"} or {"status": "error", "error": ...}, plus the list of
+            sections that timed out.
+        """
+        deadline = deadline or settings.SNAPSHOT_SECTION_DEADLINE
+        sections = {
+            "time": self._snapshot_time(),
+            "status": self.get_network_status_async(),
+            "ai_insights": self.get_ai_insights_async(),
+        }
+        if user_id is not None:
+            sections["balance"] = self.get_balance_async(user_id)
+
+        async def run(name: str, section: Awaitable) -> dict:
+            try:
+                return {"status": "ok", "data": await asyncio.wait_for(section, deadline)}
+            except asyncio.TimeoutError:
+                logger.warning("Snapshot section '%s' missed its %ss deadline", name, deadline)
+                return {"status": "timeout"}
+            except Exception as e:
+                return {"status": "error", "error": str(e)}
+
+        results = await asyncio.gather(*(run(name, section) for name, section in sections.items()))
+        snapshot = dict(zip(sections, results))
+        snapshot["timed_out"] = [name for name, result in snapshot.items() if result["status"] == "timeout"]
+        snapshot["timestamp"] = time.time()
+        return snapshot
+
+    async def _snapshot_time(self) -> dict:
+        reading = await self.read_clock_async()
+        return {
+            "chronos_time": reading.chronos_time,
+            "error_bound_us": reading.error_bound_us,
+            "sync_age": reading.sync_age,
+        }
+
+    async def _push_time(self, _: Optional[str] = None) -> dict:
+        reading = await self.read_clock_async()
+        return {
+            "chronos_time": reading.chronos_time,
+            "chronos_time_us": reading.chronos_time_us,
+            "error_bound_us": reading.error_bound_us,
+        }
+
+    async def _push_status(self, _: Optional[str] = None) -> dict:
+        return (await self.get_network_status_cached_async()).value
+
+    def get_upstream_health(self) -> dict:
+        """
+        Report circuit breaker state, current timeout and latency percentiles per upstream,
+        along with the health of each of its replicas and, over mTLS, their handshake counts.
+        """
+        states = guard_states()
+        for name, pool in self.pools.items():
+            endpoints = pool.snapshot()
+            for endpoint in endpoints:
+                tls = tls_stats(endpoint["base_url"])
+                if tls is not None:
+                    endpoint["tls"] = tls
+            states.setdefault(name, {})["endpoints"] = endpoints
+        return states
+
+    async def start(self) -> None:
+        """
+        Start the orchestrator's background tasks (clock synchronization, transaction batching,
+        the transaction outbox, ledger replication, peer discovery, metrics history).
+        """
+        add_call_observer(self.ai_client.observe_latency)
+        self.clock.start()
+        self.tx_pipeline.start()
+        if self.outbox is not None:
+            self.outbox.start()
+        self.ledger.start()
+        self.discovery.start()
+        if self.metrics_history is not None:
+            self.metrics_history.start()
+
+    async def aclose(self) -> None:
+        """
+        Stop background tasks and release the pooled upstream connections held by the API clients.
+        """
+        await self.clock.stop()
+        # Before the pipeline: the outbox's drainers wait for the submissions they queued there
+        # and record their outcome.
+        if self.outbox is not None:
+            await self.outbox.stop()
+        await self.tx_pipeline.stop()
+        await self.ledger.stop()
+        await self.discovery.stop()
+        if self.metrics_history is not None:
+            await self.metrics_history.stop()
+        await self.push.stop()
+        await self.balance_loader.stop()
+        remove_call_observer(self.ai_client.observe_latency)
+        await close_sessions()
+
 
 # Standalone demo
 if __name__ == "__main__":
+    configure_logging()
     orchestrator = ChronosSystemOrchestrator()
     try:
         print("Current Chronos Time:", orchestrator.sync_time())
@@ -141,4 +617,4 @@ if __name__ == "__main__":
         print("Network Status:", orchestrator.get_network_status())
         print("AI Insights:", orchestrator.get_ai_insights())
     except Exception as e:
-        logging.error(f"Orchestrator demo failed: {e}")
+        logger.error("Orchestrator demo failed: %s", e)
@@ -0,0 +1,454 @@
+import asyncio
+import fcntl
+import logging
+import os
+import random
+import time
+import uuid
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from src.api_clients.resilience import is_transient
+from src.config.settings import settings
+from src.orchestrator.tx_pipeline import PipelineFullError, TransactionPipeline
+from src.storage.outbox_log import OutboxLog
+from src.utils.cache import IdempotencyConflictError
+from src.utils.metrics import REGISTRY, Counter, Gauge, Histogram
+from src.utils.shared_cache import SharedStore
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_PENDING = REGISTRY.register(Gauge(
+    "chronos_outbox_pending", "Accepted transactions not yet settled with the Blockchain API.", ()))
+OUTBOX_COMMIT_SIZE = REGISTRY.register(Histogram(
+    "chronos_outbox_commit_records", "Records made durable per outbox fsync.", (),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)))
+OUTBOX_SETTLED = REGISTRY.register(Counter(
+    "chronos_outbox_settled_total", "Outbox transactions settled, by outcome.", ("status",)))
+OUTBOX_RETRIES = REGISTRY.register(Counter(
+    "chronos_outbox_retries_total", "Outbox submissions retried after a transient failure.", ()))
+
+ACCEPTED, SUBMITTED, FAILED = "accepted", "submitted", "failed"
+
+
+class OutboxUnavailableError(Exception):
+    """
+    Raised when a transaction could not be made durable (write failure or shutdown).
+    """
+
+
+class _Entry:
+    __slots__ = ("id", "key", "fingerprint", "transaction", "status", "accepted_at", "settled_at",
+                 "record", "error", "attempts", "durable")
+
+    def __init__(self, tx_id: str, key: str, fingerprint: str, transaction: dict, accepted_at: float):
+        self.id = tx_id
+        self.key = key
+        self.fingerprint = fingerprint
+        self.transaction = transaction
+        self.status = ACCEPTED
+        self.accepted_at = accepted_at
+        self.settled_at: Optional[float] = None
+        self.record: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.durable: Optional[asyncio.Future] = None   # Set while the accept record is being written
+
+    def accept_record(self) -> dict:
+        return {"op": "accept", "id": self.id, "key": self.key, "fingerprint": self.fingerprint,
+                "transaction": self.transaction, "accepted_at": self.accepted_at}
+
+    def settle_record(self) -> dict:
+        return {"op": "settle", "id": self.id, "status": self.status, "record": self.record,
+                "error": self.error, "settled_at": self.settled_at}
+
+    def view(self) -> dict:
+        return {
+            "transaction_id": self.id,
+            "status": self.status,
+            "transaction": self.transaction,
+            "accepted_at": self.accepted_at,
+            "settled_at": self.settled_at,
+            "attempts": self.attempts,
+            "record": self.record,
+            "error": self.error,
+        }
+
+
+def _try_lock(directory: str) -> Optional[int]:
+    # Exclusive, non-blocking flock on the directory's lock file; the kernel drops it if the
+    # process dies. Returns the descriptor holding the lock, or None if another process has it.
+    os.makedirs(directory, exist_ok=True)
+    fd = os.open(os.path.join(directory, "lock"), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _retryable(e: Exception) -> bool:
+    # Upstream outages, timeouts, open circuits, 5xx/429 and a full pipeline are retried. A
+    # 4xx, or any other error (e.g. a payload the client cannot encode), would recur on every
+    # attempt, so the transaction is marked failed instead of being retried forever.
+    return isinstance(e, PipelineFullError) or is_transient(e)
+
+
+class TransactionOutbox:
+    """
+    Disk-backed outbox between accepting a transaction and submitting it upstream.
+
+    accept() appends the transaction to an append-only log and returns once the record is
+    fsynced; callers are acknowledged at local-disk speed whatever the state of the Blockchain
+    API. A single writer task commits records in groups: everything accepted while the
+    previous fsync was running is written and synced together.
+
+    Durable entries are drained through the transaction pipeline (and so batched) by one
+    task per sender, which submits that sender's transactions one at a time in acceptance
+    order. Transient failures are retried with exponential backoff; a transaction refused by
+    the upstream is marked failed and its sender's queue moves on. Every outcome is logged as
+    well, so after a restart unsettled entries are resent and statuses remain queryable for
+    retention seconds. Delivery is at-least-once: an entry whose submission succeeded just
+    before a crash, but whose outcome was not yet durable, is submitted again.
+
+    Each worker process owns a log of its own: start() claims the first worker-<n>
+    subdirectory of directory that no other process holds an flock on, so workers never
+    append to, compact or resend from the same file. Logs of directories nobody holds (left by
+    workers that no longer run) are taken over at start. Statuses are also published to a
+    store shared by the workers, so any of them can answer for a transaction another accepted.
+    """
+
+    def __init__(self, pipeline: TransactionPipeline, directory: str = None, max_pending: int = None,
+                 max_in_flight: int = None, retention: float = None, compact_bytes: int = None):
+        self.pipeline = pipeline
+        self.directory = directory or settings.OUTBOX_DIR
+        self.max_pending = max_pending or settings.OUTBOX_MAX_PENDING
+        self.max_in_flight = max_in_flight or settings.OUTBOX_MAX_IN_FLIGHT
+        self.retention = retention or settings.OUTBOX_RETENTION
+        self.compact_bytes = compact_bytes or settings.OUTBOX_COMPACT_BYTES
+        self._log: Optional[OutboxLog] = None
+        self._lock_fd: Optional[int] = None
+        self._statuses: Optional[SharedStore] = None
+        self.worker_directory: Optional[str] = None
+        self._entries: Dict[str, _Entry] = {}
+        self._by_key: Dict[str, _Entry] = {}
+        self._queues: Dict[str, Deque[_Entry]] = {}     # sender -> unsettled entries, oldest first
+        self._drainers: Dict[str, asyncio.Task] = {}
+        self._pending = 0
+        self._writes: List[Tuple[dict, Optional[_Entry]]] = []
+        self._write_ready: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._closing = False
+        self._stopping: Optional[asyncio.Event] = None
+        self._drained = False
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._next_compaction = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self) -> None:
+        """
+        Open the log, restore its entries and resume sending the unsettled ones.
+        """
+        if self._writer is not None and not self._writer.done():
+            return
+        if self._log is None:
+            self._open()
+        self._write_ready = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._closing = False
+        self._drained = False
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+        for entry in self._entries.values():
+            if entry.status == ACCEPTED:
+                self._enqueue(entry)
+        logger.info("Transaction outbox started at %s (%s pending)", self.worker_directory, self._pending)
+
+    def _open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        n = 0
+        while self._lock_fd is None:
+            self.worker_directory = os.path.join(self.directory, f"worker-{n}")
+            self._lock_fd = _try_lock(self.worker_directory)
+            n += 1
+        self._log = OutboxLog(os.path.join(self.worker_directory, "outbox.log"))
+        self._restore(self._log.records())
+        self._adopt_orphans()
+        try:
+            self._statuses = SharedStore(os.path.join(self.directory, "status.shm"),
+                                         settings.OUTBOX_STATUS_SLOTS, settings.OUTBOX_STATUS_SLOT_SIZE)
+        except OSError as e:
+            logger.warning("Outbox statuses are not shared between workers: %s", e)
+        self._expire(time.time())
+        self._next_compaction = max(self.compact_bytes, 2 * self._log.size)
+
+    def _adopt_orphans(self) -> None:
+        # A directory whose lock is free belongs to no running worker (e.g. after restarting
+        # with fewer workers); nobody else would ever send its entries.
+        for name in sorted(os.listdir(self.directory)):
+            directory = os.path.join(self.directory, name)
+            if not name.startswith("worker-") or directory == self.worker_directory or not os.path.isdir(directory):
+                continue
+            fd = _try_lock(directory)
+            if fd is None:
+                continue
+            try:
+                path = os.path.join(directory, "outbox.log")
+                if not os.path.exists(path):
+                    continue
+                orphan = OutboxLog(path)
+                records = orphan.records()
+                orphan.close()
+                if records:
+                    # Made durable here before the orphan is removed: a crash in between means
+                    # resending its entries, never losing them.
+                    self._log.append(records)
+                    self._restore(records)
+                os.unlink(path)
+                logger.info("Took over %s outbox records from %s", len(records), directory)
+            finally:
+                os.close(fd)
+
+    def _restore(self, records: List[dict]) -> None:
+        for record in records:
+            if record["op"] == "accept":
+                entry = _Entry(record["id"], record["key"], record["fingerprint"], record["transaction"],
+                               record["accepted_at"])
+                self._entries[entry.id] = entry
+                self._by_key[entry.key] = entry
+            else:
+                entry = self._entries.get(record["id"])
+                if entry is not None:
+                    entry.status, entry.record = record["status"], record["record"]
+                    entry.error, entry.settled_at = record["error"], record["settled_at"]
+
+    async def stop(self) -> None:
+        """
+        Stop sending, write out records still buffered and close the log. Unsettled entries
+        stay in the log and are resent by the next start().
+        """
+        if self._writer is None:
+            return
+        self._closing = True
+        self._stopping.set()
+        # Drainers are not cancelled: each finishes the submission it is waiting on and records
+        # its outcome. Otherwise the pipeline would still submit what they had queued while the
+        # log kept those entries unsettled, and the next start() would send them again.
+        drainers = list(self._drainers.values())
+        await asyncio.gather(*drainers, return_exceptions=True)
+        self._drainers.clear()
+        self._queues.clear()
+        # The writer exits once everything buffered so far is committed.
+        self._drained = True
+        self._write_ready.set()
+        await asyncio.gather(self._writer, return_exceptions=True)
+        self._writer = None
+        self._log.close()
+        self._log = None
+        if self._statuses is not None:
+            self._statuses.close()
+            self._statuses = None
+        os.close(self._lock_fd)
+        self._lock_fd = None
+        self._entries.clear()
+        self._by_key.clear()
+        OUTBOX_PENDING.labels().dec(self._pending)
+        self._pending = 0
+
+    async def accept(self, transaction: dict, key: str, fingerprint: str) -> dict:
+        """
+        Durably record a transaction for submission.
+
+        Returns:
+            The entry's status; "accepted" for a new transaction. A key seen before returns
+            the status of its original entry instead.
+
+        Raises:
+            IdempotencyConflictError: if key was used for a different transaction.
+            PipelineFullError: if max_pending transactions are already waiting.
+            OutboxUnavailableError: if the record could not be written.
+        """
+        if self._writer is None:
+            self.start()
+        elif self._closing:
+            raise OutboxUnavailableError("Transaction outbox is shutting down")
+        elif self._writer.done():
+            # The writer only returns on stop(). Had it died, every accept would wait forever
+            # for a commit; start a new one, which also picks up the records already buffered.
+            error = None if self._writer.cancelled() else self._writer.exception()
+            logger.error("Outbox writer stopped unexpectedly (%s); restarting it", error or "cancelled")
+            self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+            self._write_ready.set()
+        entry = self._by_key.get(key)
+        if entry is None:
+            if self._pending >= self.max_pending:
+                raise PipelineFullError(max(1, int(self._pending / max(self.max_in_flight, 1))))
+            entry = _Entry(uuid.uuid4().hex, key, fingerprint, transaction, time.time())
+            entry.durable = asyncio.get_running_loop().create_future()
+            self._entries[entry.id] = entry
+            self._by_key[key] = entry
+            self._write(entry.accept_record(), entry)
+        elif entry.fingerprint != fingerprint:
+            raise IdempotencyConflictError(f"Idempotency key {key!r} was already used for a different transaction")
+        if entry.durable is not None:
+            # Shielded: a caller that disconnects must not fail the commit its retry will find.
+            await asyncio.shield(entry.durable)
+        return entry.view()
+
+    def status(self, tx_id: str) -> Optional[dict]:
+        """
+        Status of an outbox entry by id, or None if it is unknown or has expired.
+        """
+        entry = self._entries.get(tx_id)
+        if entry is not None:
+            return entry.view()
+        # Accepted by another worker. The shared store keeps recent statuses only: slots are
+        # reused by hash, so an old status may have been replaced.
+        found = self._statuses.get(f"outbox:{tx_id}") if self._statuses is not None else None
+        if found is None or found.value["transaction_id"] != tx_id:
+            return None
+        settled_at = found.value["settled_at"]
+        if settled_at is not None and settled_at < time.time() - self.retention:
+            return None
+        return found.value
+
+    def _publish(self, entry: _Entry) -> None:
+        # Best effort: the entry's own worker answers from memory whatever happens here.
+        if self._statuses is not None:
+            try:
+                self._statuses.put(f"outbox:{entry.id}", entry.view())
+            except OSError as e:
+                logger.warning("Could not share the status of outbox transaction %s: %s", entry.id, e)
+
+    def _write(self, record: dict, entry: Optional[_Entry] = None) -> None:
+        self._writes.append((record, entry))
+        self._write_ready.set()
+
+    async def _write_loop(self) -> None:
+        while True:
+            await self._write_ready.wait()
+            self._write_ready.clear()
+            writes, self._writes = self._writes, []
+            if writes:
+                try:
+                    # Appends made while this fsync runs form the next group.
+                    await asyncio.to_thread(self._log.append, [record for record, _ in writes])
+                except Exception as e:
+                    logger.error("Failed to commit %s outbox records: %s", len(writes), e)
+                    self._committed(writes, e)
+                else:
+                    OUTBOX_COMMIT_SIZE.labels().observe(len(writes))
+                    self._committed(writes)
+                    if self._log.size >= self._next_compaction and not self._closing:
+                        try:
+                            await self._compact()
+                        except Exception as e:
+                            # The log is still whole (see OutboxLog.rewrite); keep committing to it
+                            # and try again once it has grown by another compact_bytes.
+                            logger.error("Failed to compact outbox log %s: %s", self._log.path, e)
+                            self._next_compaction = self._log.size + self.compact_bytes
+            if self._drained and not self._writes:
+                return
+
+    def _committed(self, writes: List[Tuple[dict, Optional[_Entry]]], error: Exception = None) -> None:
+        for _, entry in writes:
+            if entry is None or entry.durable is None:
+                continue
+            if error is not None:
+                # Never acknowledged, so forget it: a retry of the same key starts over.
+                del self._entries[entry.id]
+                if self._by_key.get(entry.key) is entry:
+                    del self._by_key[entry.key]
+                entry.durable.set_exception(OutboxUnavailableError(f"Could not record transaction: {error}"))
+                entry.durable.exception()
+            else:
+                entry.durable.set_result(None)
+                self._publish(entry)
+                if not self._closing:
+                    self._enqueue(entry)
+            entry.durable = None
+
+    def _enqueue(self, entry: _Entry) -> None:
+        sender = entry.transaction["sender"]
+        queue = self._queues.get(sender)
+        if queue is None:
+            queue = self._queues[sender] = deque()
+        queue.append(entry)
+        self._pending += 1
+        OUTBOX_PENDING.labels().inc()
+        if sender not in self._drainers:
+            self._drainers[sender] = asyncio.get_running_loop().create_task(self._drain(sender, queue))
+
+    async def _drain(self, sender: str, queue: Deque[_Entry]) -> None:
+        try:
+            while queue and not self._closing:
+                entry = queue[0]
+                async with self._slots:
+                    if self._closing:
+                        break
+                    try:
+                        record = await self.pipeline.submit(entry.transaction)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        entry.attempts += 1
+                        if not _retryable(e):
+                            logger.warning("Outbox transaction %s was refused: %s", entry.id, e)
+                            self._settle(entry, FAILED, error=str(e))
+                            queue.popleft()
+                            continue
+                        entry.error = str(e)
+                    else:
+                        entry.attempts += 1
+                        self._settle(entry, SUBMITTED, record=record)
+                        queue.popleft()
+                        continue
+                # Back off outside the slot, so other senders keep submitting meanwhile.
+                OUTBOX_RETRIES.labels().inc()
+                delay = min(settings.OUTBOX_RETRY_MAX, settings.OUTBOX_RETRY_BASE * 2 ** (entry.attempts - 1))
+                try:
+                    # Cut short by stop(): the entry stays unsettled and is resent after a restart.
+                    await asyncio.wait_for(self._stopping.wait(), delay * random.uniform(0.5, 1.0))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._drainers.get(sender) is asyncio.current_task():
+                del self._drainers[sender]
+                if self._queues.get(sender) is queue:
+                    del self._queues[sender]
+
+    def _settle(self, entry: _Entry, status: str, record: dict = None, error: str = None) -> None:
+        entry.status, entry.record, entry.error = status, record, error
+        entry.settled_at = time.time()
+        self._pending -= 1
+        OUTBOX_PENDING.labels().dec()
+        OUTBOX_SETTLED.labels(status).inc()
+        self._write(entry.settle_record())
+        self._publish(entry)
+
+    def _expire(self, now: float) -> None:
+        for entry in [entry for entry in self._entries.values()
+                      if entry.settled_at is not None and entry.settled_at < now - self.retention]:
+            del self._entries[entry.id]
+            if self._by_key.get(entry.key) is entry:
+                del self._by_key[entry.key]
+
+    async def _compact(self) -> None:
+        # Rewrite the log with only the entries still unsettled or within retention.
+        self._expire(time.time())
+        records = []
+        for entry in self._entries.values():
+            if entry.durable is not None:
+                continue   # Still being written by a later group
+            records.append(entry.accept_record())
+            if entry.status != ACCEPTED:
+                records.append(entry.settle_record())
+        before = self._log.size
+        # Rewritten off the event loop but not concurrently with appends: this is the writer.
+        await asyncio.to_thread(self._log.rewrite, records)
+        self._next_compaction = max(self.compact_bytes, 2 * self._log.size)
+        logger.info("Compacted outbox log from %s to %s bytes (%s entries)", before, self._log.size, len(self._entries))
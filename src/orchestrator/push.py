@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.config.settings import settings
+from src.utils.metrics import REGISTRY, Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+PUSH_SUBSCRIBERS = REGISTRY.register(Gauge(
+    "chronos_push_subscribers", "Clients currently subscribed to pushed updates.", ()))
+PUSH_POLLS = REGISTRY.register(Counter(
+    "chronos_push_polls_total", "Upstream polls made by push topics, by topic kind and outcome.", ("kind", "result")))
+PUSH_DROPPED = REGISTRY.register(Counter(
+    "chronos_push_dropped_total", "Subscribers disconnected for falling too far behind.", ()))
+
+Fetcher = Callable[[Optional[str]], Awaitable[dict]]
+# (topic, event, data): event is "snapshot" for the full value, "delta" for changed keys only.
+Update = Tuple[str, str, dict]
+
+
+class SubscriberLimitError(Exception):
+    """
+    Raised when PUSH_MAX_SUBSCRIBERS clients are already subscribed.
+    """
+
+
+def diff(previous: dict, current: dict) -> dict:
+    """
+    Top-level keys of current whose values differ from previous; keys that disappeared map to None.
+    """
+    delta = {key: value for key, value in current.items() if key not in previous or previous[key] != value}
+    for key in previous.keys() - current.keys():
+        delta[key] = None
+    return delta
+
+
+class Subscriber:
+    """
+    One client's view of its topics.
+
+    Updates are coalesced rather than queued: at most one pending update per topic is kept,
+    and a new delta is merged into it (a pending snapshot absorbs the delta and stays a
+    snapshot). A consumer that falls behind therefore receives the latest values in fewer
+    events, and its backlog never grows beyond one value per topic.
+    """
+
+    def __init__(self, topics: List[str]):
+        self.topics = topics
+        self._pending: Dict[str, Tuple[str, dict]] = {}
+        self._ready = asyncio.Event()
+        self._waiting_since: Optional[float] = None
+        self.closed = False
+
+    def offer(self, topic: str, event: str, data: dict) -> None:
+        pending = self._pending.get(topic)
+        if pending is None or event == "snapshot":
+            self._pending[topic] = (event, dict(data))
+        else:
+            pending[1].update(data)
+        if self._waiting_since is None:
+            self._waiting_since = time.monotonic()
+        self._ready.set()
+
+    def lag(self, now: float) -> float:
+        """
+        Seconds the oldest undelivered update has been waiting.
+        """
+        return now - self._waiting_since if self._waiting_since is not None else 0.0
+
+    def close(self) -> None:
+        self.closed = True
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> List[Update]:
+        """
+        Wait up to timeout seconds for updates and take all pending ones. An empty list means
+        the wait timed out; check closed before waiting again.
+        """
+        if not self._pending and not self.closed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        self._ready.clear()
+        pending, self._pending = self._pending, {}
+        self._waiting_since = None
+        return [(topic, event, data) for topic, (event, data) in pending.items()]
+
+
+class _Topic:
+    """
+    A polled value and its subscribers. The poller only runs while someone is subscribed.
+    """
+
+    def __init__(self, key: str, fetch: Callable[[], Awaitable[dict]], kind: str):
+        self.key = key
+        self.kind = kind
+        self.fetch = fetch
+        self.value: Optional[dict] = None
+        self.subscribers: List[Subscriber] = []
+        self.task: Optional[asyncio.Task] = None
+
+
+class PushHub:
+    """
+    Fans polled values out to subscribed clients.
+
+    Each topic ("time", "status", "balance:<user_id>") has a single background poller shared
+    by all of its subscribers, so N subscribers cost one upstream poll per interval. Pollers
+    are aligned to interval boundaries so that the balance pollers of different users poll
+    together and their lookups are batched by the balance loader. A subscriber first receives
+    the current value as a snapshot, then only the keys that changed as deltas; subscribers
+    whose updates sit undelivered for max_lag seconds are disconnected.
+    """
+
+    def __init__(self, fetchers: Dict[str, Fetcher], interval: float = None, max_lag: float = None,
+                 max_subscribers: int = None):
+        self.fetchers = fetchers
+        self.interval = interval or settings.PUSH_INTERVAL
+        self.max_lag = max_lag or settings.PUSH_MAX_LAG
+        self.max_subscribers = max_subscribers or settings.PUSH_MAX_SUBSCRIBERS
+        self._topics: Dict[str, _Topic] = {}
+        self._subscribers = 0
+
+    def _fetcher(self, key: str) -> Callable[[], Awaitable[dict]]:
+        kind, _, arg = key.partition(":")
+        fetcher = self.fetchers.get(kind)
+        if fetcher is None or (kind == "balance") != bool(arg):
+            raise ValueError(f"Unknown topic '{key}'")
+        return lambda: fetcher(arg or None)
+
+    def _topic(self, key: str, fetch: Callable[[], Awaitable[dict]]) -> _Topic:
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = self._topics[key] = _Topic(key, fetch, key.partition(":")[0])
+        return topic
+
+    async def subscribe(self, keys: Iterable[str]) -> Subscriber:
+        """
+        Subscribe to the given topics; the current value of each one already polled is queued
+        as the first update.
+
+        Raises:
+            ValueError: for an unknown topic.
+            SubscriberLimitError: when max_subscribers clients are already subscribed.
+        """
+        keys = list(dict.fromkeys(keys))
+        # Everything is checked before any topic is created, so a rejected request leaves none behind.
+        fetchers = [self._fetcher(key) for key in keys]
+        if self._subscribers >= self.max_subscribers:
+            raise SubscriberLimitError(f"Too many subscribers ({self.max_subscribers})")
+        topics = [self._topic(key, fetch) for key, fetch in zip(keys, fetchers)]
+        subscriber = Subscriber(keys)
+        self._subscribers += 1
+        PUSH_SUBSCRIBERS.labels().inc()
+        for topic in topics:
+            topic.subscribers.append(subscriber)
+            if topic.value is not None:
+                subscriber.offer(topic.key, "snapshot", topic.value)
+            if topic.task is None or topic.task.done():
+                topic.task = asyncio.get_running_loop().create_task(self._poll(topic))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        if subscriber.topics is None:
+            return
+        for key in subscriber.topics:
+            topic = self._topics.get(key)
+            if topic is None or subscriber not in topic.subscribers:
+                continue
+            topic.subscribers.remove(subscriber)
+            if not topic.subscribers:
+                if topic.task is not None:
+                    topic.task.cancel()
+                del self._topics[key]
+        subscriber.topics = None
+        subscriber.close()
+        self._subscribers -= 1
+        PUSH_SUBSCRIBERS.labels().dec()
+
+    async def updates(self, subscriber: Subscriber, heartbeat: float = None) -> AsyncIterator[Optional[Update]]:
+        """
+        Yield the subscriber's updates until it is dropped or the consumer stops iterating,
+        then unsubscribe it. None is yielded after heartbeat seconds without updates, so
+        callers can keep idle connections alive.
+        """
+        heartbeat = heartbeat or settings.PUSH_HEARTBEAT
+        try:
+            while not subscriber.closed:
+                batch = await subscriber.next_batch(heartbeat)
+                if not batch:
+                    if not subscriber.closed:
+                        yield None
+                    continue
+                for update in batch:
+                    yield update
+        finally:
+            self.unsubscribe(subscriber)
+
+    async def _poll(self, topic: _Topic) -> None:
+        while topic.subscribers:
+            try:
+                value = await topic.fetch()
+                PUSH_POLLS.labels(topic.kind, "ok").inc()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep serving the last value; subscribers just see no update this round.
+                PUSH_POLLS.labels(topic.kind, "error").inc()
+                logger.warning("Polling push topic %s failed: %s", topic.key, e)
+            else:
+                self._publish(topic, value)
+            await asyncio.sleep(self.interval - time.monotonic() % self.interval)
+
+    def _publish(self, topic: _Topic, value: dict) -> None:
+        previous, topic.value = topic.value, value
+        if previous is None:
+            event, data = "snapshot", value
+        else:
+            event, data = "delta", diff(previous, value)
+            if not data:
+                return
+        now = time.monotonic()
+        for subscriber in list(topic.subscribers):
+            if subscriber.lag(now) > self.max_lag:
+                logger.warning("Dropping push subscriber to %s: updates undelivered for %.0fs",
+                               ", ".join(subscriber.topics), subscriber.lag(now))
+                PUSH_DROPPED.labels().inc()
+                self.unsubscribe(subscriber)
+                continue
+            subscriber.offer(topic.key, event, data)
+
+    async def stop(self) -> None:
+        """
+        Disconnect every subscriber and stop the pollers.
+        """
+        tasks = [topic.task for topic in self._topics.values() if topic.task is not None]
+        for topic in list(self._topics.values()):
+            for subscriber in list(topic.subscribers):
+                self.unsubscribe(subscriber)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+from src.api_clients.time_client import TimeClient
+from src.config.settings import settings
+from src.utils.metrics import cache_result
+from src.utils.shared_cache import SharedStore
+
+logger = logging.getLogger(__name__)
+
+_SHARED_KEY = "clock:estimate"
+
+
+@dataclass(frozen=True)
+class ClockSample:
+    """
+    A single exchange with the Chronos Time API, NTP style.
+    """
+    midpoint: float  # Local monotonic time halfway through the round trip
+    offset: float    # Chronos cunix time minus local monotonic time at the midpoint
+    rtt: float       # Round-trip time of the exchange in seconds
+
+
+@dataclass(frozen=True)
+class ClockReading:
+    """
+    A locally served Chronos time together with its quality indicators.
+    """
+    chronos_time_us: int  # Chronos cunix time in microseconds
+    error_bound_us: int   # Maximum expected deviation from the Time API in microseconds
+    sync_age: float       # Seconds since the estimate was last refreshed from the Time API
+
+    @property
+    def chronos_time(self) -> float:
+        return self.chronos_time_us / 1_000_000
+
+
+class ClockSynchronizer:
+    """
+    Serves Chronos cunix time from the local monotonic clock.
+
+    The Time API is sampled in the background; each sample is compensated for half of its
+    round trip. Only the lowest-RTT samples of the window are trusted, offsets far from their
+    median are rejected as outliers, and the remaining samples are fitted against
+    time.monotonic() to estimate both offset and drift.
+
+    With a shared store, the worker processes of a host elect one sampler through a lease
+    and the others adopt its published estimate. The estimate is expressed against
+    CLOCK_MONOTONIC, which is the same for every process on the host.
+    """
+
+    def __init__(self, time_client: TimeClient,
+                 interval: float = None,
+                 max_age: float = None,
+                 window: int = None,
+                 max_drift_ppm: float = None,
+                 shared: Optional[SharedStore] = None):
+        self.time_client = time_client
+        self.shared = shared
+        self.interval = interval or settings.TIME_SYNC_INTERVAL
+        self.max_age = max_age or settings.TIME_SYNC_MAX_AGE
+        self.max_drift_ppm = max_drift_ppm or settings.TIME_SYNC_MAX_DRIFT_PPM
+        self._samples: Deque[ClockSample] = deque(maxlen=window or settings.TIME_SYNC_WINDOW)
+
+        # Current estimate: chronos(t) = t + offset + drift * (t - ref_time)
+        self._ref_time: Optional[float] = None
+        self._offset = 0.0
+        self._drift = 0.0
+        self._base_error = 0.0
+        self._last_sync: Optional[float] = None
+
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+
+    async def sample(self) -> ClockSample:
+        """
+        Exchange once with the Time API and fold the result into the estimate.
+        """
+        t0 = time.monotonic()
+        server_time = await self.time_client.get_current_time_async()
+        t1 = time.monotonic()
+        midpoint = (t0 + t1) / 2
+        sample = ClockSample(midpoint=midpoint, offset=server_time - midpoint, rtt=t1 - t0)
+        self._samples.append(sample)
+        self._update_estimate()
+        return sample
+
+    def _update_estimate(self) -> None:
+        samples = list(self._samples)
+
+        # Min-RTT filtering: queueing delay only ever adds to the RTT, so the fastest
+        # exchanges carry the least asymmetric error.
+        min_rtt = min(s.rtt for s in samples)
+        candidates = [s for s in samples if s.rtt <= 2 * min_rtt + 0.001]
+
+        # Outlier rejection around the median offset (median absolute deviation).
+        if len(candidates) >= 3:
+            median = statistics.median(s.offset for s in candidates)
+            mad = statistics.median(abs(s.offset - median) for s in candidates)
+            limit = max(3 * mad, min_rtt / 2)
+            candidates = [s for s in candidates if abs(s.offset - median) <= limit]
+
+        best = min(candidates, key=lambda s: s.rtt)
+        drift = 0.0
+        if len(candidates) >= 3:
+            xs = [s.midpoint for s in candidates]
+            span = max(xs) - min(xs)
+            limit = self.max_drift_ppm * 1e-6
+            # Drift is only observable once the window is long enough for the largest
+            # tolerated drift to exceed the round-trip noise.
+            if span * limit >= min_rtt:
+                mean_x = statistics.fmean(xs)
+                mean_y = statistics.fmean(s.offset for s in candidates)
+                sxx = sum((x - mean_x) ** 2 for x in xs)
+                sxy = sum((s.midpoint - mean_x) * (s.offset - mean_y) for s in candidates)
+                drift = max(-limit, min(limit, sxy / sxx))
+
+        dispersion = max(abs(s.offset - best.offset - drift * (s.midpoint - best.midpoint)) for s in candidates)
+        self._ref_time = best.midpoint
+        self._offset = best.offset
+        self._drift = drift
+        self._base_error = best.rtt / 2 + dispersion
+        self._last_sync = samples[-1].midpoint
+        if self.shared is not None:
+            self.shared.put(_SHARED_KEY, (self._ref_time, self._offset, self._drift, self._base_error, self._last_sync))
+
+    def _adopt_shared(self) -> bool:
+        """
+        Take over the estimate published by the sampling worker if it is newer than ours.
+        """
+        found = self.shared.get(_SHARED_KEY) if self.shared is not None else None
+        if found is None:
+            return False
+        last_sync = found.value[4]
+        if self._last_sync is not None and last_sync <= self._last_sync:
+            return False
+        self._ref_time, self._offset, self._drift, self._base_error, self._last_sync = found.value
+        return True
+
+    def _adopt_shared_fresh(self) -> bool:
+        return self._adopt_shared() and not self.is_stale()
+
+    @property
+    def is_synchronized(self) -> bool:
+        return self._ref_time is not None
+
+    def sync_age(self, now: float = None) -> float:
+        if self._last_sync is None:
+            return float("inf")
+        return (now if now is not None else time.monotonic()) - self._last_sync
+
+    def is_stale(self) -> bool:
+        return self.sync_age() > self.max_age
+
+    def read(self) -> ClockReading:
+        """
+        Serve the current Chronos time from the local estimate without any I/O.
+        """
+        if self._ref_time is None:
+            raise RuntimeError("Clock has not been synchronized with the Time API yet")
+        now = time.monotonic()
+        elapsed = now - self._ref_time
+        chronos = now + self._offset + self._drift * elapsed
+        error = self._base_error + abs(elapsed) * self.max_drift_ppm * 1e-6
+        return ClockReading(
+            chronos_time_us=int(round(chronos * 1_000_000)),
+            error_bound_us=int(error * 1_000_000) + 1,
+            sync_age=now - self._last_sync,
+        )
+
+    async def now(self) -> ClockReading:
+        """
+        Return the current Chronos time, falling back to a live fetch only when the
+        local estimate is missing or stale.
+        """
+        if (self._ref_time is None or self.is_stale()) and not self._adopt_shared_fresh():
+            cache_result("clock", "miss")
+            if self._refresh_lock is None:
+                self._refresh_lock = asyncio.Lock()
+            async with self._refresh_lock:
+                # Another caller may have refreshed while we waited for the lock.
+                if self._ref_time is None or self.is_stale():
+                    await self.sample()
+        else:
+            cache_result("clock", "hit")
+        return self.read()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # The lease outlives one interval, so the sampling worker keeps renewing it and
+                # another worker only takes over if the sampler stops.
+                if self.shared is None or self.shared.acquire_lease(_SHARED_KEY, 2 * self.interval):
+                    await self.sample()
+                elif not self._adopt_shared() and self._ref_time is None:
+                    await self.sample()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Clock sync sample failed: %s", e)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """
+        Start periodic background sampling on the running event loop.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logger.info("Clock synchronizer started (interval=%ss, max_age=%ss)", self.interval, self.max_age)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
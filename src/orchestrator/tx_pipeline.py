@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import math
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from src.api_clients.resilience import is_failure
+from src.config.settings import settings
+
+if TYPE_CHECKING:
+    # PipelineFullError is imported by the API module; keep the client stack off that path.
+    from src.api_clients.blockchain_client import BlockchainClient
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineFullError(Exception):
+    """
+    Raised when the submission queue is full. Callers should retry after retry_after seconds.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Transaction queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def _refused(e: Exception) -> bool:
+    # A 4xx other than 429: the upstream rejected the request itself and processed none of it.
+    return not is_failure(e) and getattr(getattr(e, "response", None), "status_code", None) != 429
+
+
+class TransactionPipeline:
+    """
+    Groups submitted transactions into bulk submissions to the Chronos Blockchain API.
+
+    Transactions wait in a bounded queue until either max_batch_size of them are pending or
+    the oldest has lingered for linger seconds; the batch is then submitted in one request.
+    Each caller awaits a future that resolves to its own transaction record. A batch the
+    upstream refuses as a whole (4xx) is split into single submissions, so only the offending
+    transactions fail.
+    """
+
+    def __init__(self, blockchain_client: "BlockchainClient",
+                 max_queue_depth: int = None,
+                 max_batch_size: int = None,
+                 linger: float = None,
+                 max_in_flight_batches: int = None):
+        self.blockchain_client = blockchain_client
+        self.max_queue_depth = max_queue_depth or settings.TX_QUEUE_MAX_DEPTH
+        self.max_batch_size = max_batch_size or settings.TX_BATCH_MAX_SIZE
+        self.linger = linger if linger is not None else settings.TX_BATCH_LINGER
+        self.max_in_flight_batches = max_in_flight_batches or settings.TX_MAX_IN_FLIGHT_BATCHES
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._in_flight: set = set()
+        self._held: List[Tuple[dict, asyncio.Future]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """
+        Start the batching worker on the running event loop.
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue_depth)
+            self._slots = asyncio.Semaphore(self.max_in_flight_batches)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+            logger.info("Transaction pipeline started (queue=%s, batch=%s, linger=%ss)",
+                        self.max_queue_depth, self.max_batch_size, self.linger)
+
+    async def stop(self) -> None:
+        """
+        Stop accepting work, submit whatever is still queued and wait for in-flight batches.
+        """
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        held, self._held = self._held, []
+        if held:
+            await self._submit_batch(held)
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait() for _ in range(min(self.max_batch_size, self._queue.qsize()))]
+            await self._submit_batch(batch)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def submit(self, transaction_data: dict) -> dict:
+        """
+        Queue a transaction for bulk submission and wait for its record.
+
+        Raises:
+            PipelineFullError: if the queue is full (backpressure).
+            Exception: if the blockchain rejects the batch or this transaction.
+        """
+        if self._worker is None:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((transaction_data, future))
+        except asyncio.QueueFull:
+            raise PipelineFullError(self._retry_after())
+        return await future
+
+    def _retry_after(self) -> int:
+        # Time for the backlog to drain if every in-flight slot keeps submitting full batches.
+        batches = self.depth / (self.max_batch_size * self.max_in_flight_batches)
+        return max(1, math.ceil(batches * max(self.linger, 0.05)))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.linger
+                while len(batch) < self.max_batch_size:
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    # Not wait_for: on 3.11 it can drop a cancellation that races with the get.
+                    getter = loop.create_task(self._queue.get())
+                    try:
+                        await asyncio.wait((getter,), timeout=remaining)
+                    finally:
+                        # A get that is cancelled leaves its item in the queue.
+                        if not getter.cancel():
+                            batch.append(getter.result())
+                await self._slots.acquire()
+                task = loop.create_task(self._submit_batch(batch, release_slot=True))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+                batch = []
+        finally:
+            # Cancelled by stop() while holding transactions already taken off the queue: hand
+            # them back so they are submitted rather than left with unresolved futures.
+            self._held = batch
+
+    async def _submit_batch(self, batch: List[Tuple[dict, asyncio.Future]], release_slot: bool = False) -> None:
+        try:
+            try:
+                results = await self.blockchain_client.submit_transactions_async([tx for tx, _ in batch])
+            except Exception as e:
+                if len(batch) > 1 and _refused(e):
+                    logger.warning("Batch of %s transactions was refused (%s); submitting them one by one",
+                                   len(batch), e)
+                    results = await asyncio.gather(
+                        *(self.blockchain_client.submit_transaction_async(tx) for tx, _ in batch),
+                        return_exceptions=True)
+                else:
+                    results = [e] * len(batch)
+        finally:
+            if release_slot:
+                self._slots.release()
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
@@ -0,0 +1,132 @@
+import hashlib
+import math
+import time
+from typing import Callable, Iterable, List, Union
+
+from src.config.settings import settings
+
+_FIELDS = ("sender", "receiver", "amount", "timestamp")
+_ALLOWED = frozenset(_FIELDS)
+_NUMBER_TYPES = (int, float)
+_MISSING = object()   # Tells an absent field apart from one sent as null
+
+
+class TransactionValidationError(ValueError):
+    """
+    Raised when a transaction is rejected locally. errors lists every problem found.
+    """
+
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+class ValidatedTransaction:
+    """
+    Compact record of a transaction that passed validation.
+    """
+    __slots__ = _FIELDS
+
+    def __init__(self, sender: str, receiver: str, amount: float, timestamp: float):
+        self.sender = sender
+        self.receiver = receiver
+        self.amount = amount
+        self.timestamp = timestamp
+
+    def fingerprint(self) -> str:
+        """
+        Content hash of the transaction, identifying retries of the same submission.
+        """
+        content = f"{self.sender}\x1f{self.receiver}\x1f{self.amount!r}\x1f{self.timestamp!r}"
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+    def to_dict(self) -> dict:
+        return {"sender": self.sender, "receiver": self.receiver, "amount": self.amount, "timestamp": self.timestamp}
+
+
+class TransactionValidator:
+    """
+    Rejects malformed transactions before they reach the Chronos Blockchain API.
+
+    A transaction must carry exactly the fields of the Transaction model: non-empty sender and
+    receiver ids that differ, a finite amount in (0, max_amount], and a timestamp no more than
+    max_past_skew seconds old nor max_future_skew seconds ahead of the local clock.
+    """
+
+    def __init__(self, max_amount: float = None, max_past_skew: float = None, max_future_skew: float = None,
+                 clock: Callable[[], float] = time.time):
+        self.max_amount = max_amount or settings.TX_MAX_AMOUNT
+        self.max_past_skew = max_past_skew if max_past_skew is not None else settings.TX_MAX_PAST_SKEW
+        self.max_future_skew = max_future_skew if max_future_skew is not None else settings.TX_MAX_FUTURE_SKEW
+        self.clock = clock
+
+    def validate(self, data: dict) -> ValidatedTransaction:
+        """
+        Validate one transaction.
+
+        Raises:
+            TransactionValidationError: listing every problem found.
+        """
+        result = self._check(data, self.clock())
+        if isinstance(result, list):
+            raise TransactionValidationError(result)
+        return result
+
+    def validate_batch(self, items: Iterable[dict]) -> List[Union[ValidatedTransaction, TransactionValidationError]]:
+        """
+        Validate many transactions in one pass against a single clock reading.
+
+        Returns:
+            One entry per input, in order: the validated record or the error rejecting it.
+        """
+        now = self.clock()
+        check = self._check
+        results = []
+        for data in items:
+            result = check(data, now)
+            results.append(TransactionValidationError(result) if isinstance(result, list) else result)
+        return results
+
+    def _check(self, data, now: float) -> Union[ValidatedTransaction, List[str]]:
+        if type(data) is not dict:
+            return ["transaction must be a JSON object"]
+        errors = []
+        unknown = data.keys() - _ALLOWED
+        if unknown:
+            errors.append(f"unknown field(s): {', '.join(sorted(map(str, unknown)))}")
+        missing = [field for field in _FIELDS if field not in data]
+        if missing:
+            errors.append(f"missing field(s): {', '.join(missing)}")
+
+        sender = data.get("sender", _MISSING)
+        receiver = data.get("receiver", _MISSING)
+        amount = data.get("amount", _MISSING)
+        timestamp = data.get("timestamp", _MISSING)
+        for name, value in (("sender", sender), ("receiver", receiver)):
+            if value is not _MISSING and (type(value) is not str or not value):
+                errors.append(f"{name} must be a non-empty string")
+        if type(sender) is str and sender and sender == receiver:
+            errors.append("sender and receiver must differ")
+
+        if amount is not _MISSING:
+            # bool is an int subclass; the exact type check keeps true/false out. Only floats go
+            # through isfinite: it converts ints to float, which overflows for huge ones, while
+            # the comparisons below are exact for ints of any size.
+            if type(amount) not in _NUMBER_TYPES or (type(amount) is float and not math.isfinite(amount)):
+                errors.append("amount must be a finite number")
+            elif amount <= 0:
+                errors.append("amount must be positive")
+            elif amount > self.max_amount:
+                errors.append(f"amount exceeds the maximum of {self.max_amount:g}")
+
+        if timestamp is not _MISSING:
+            if type(timestamp) not in _NUMBER_TYPES or (type(timestamp) is float and not math.isfinite(timestamp)):
+                errors.append("timestamp must be a finite number")
+            elif timestamp < now - self.max_past_skew:
+                errors.append(f"timestamp is more than {self.max_past_skew:g}s in the past")
+            elif timestamp > now + self.max_future_skew:
+                errors.append(f"timestamp is more than {self.max_future_skew:g}s in the future")
+
+        if errors:
+            return errors
+        return ValidatedTransaction(sender, receiver, float(amount), float(timestamp))
@@ -0,0 +1,225 @@
+import bisect
+import fcntl
+import json
+import logging
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_LENGTH = struct.Struct("<I")   # Record header in blocks.dat: payload length
+_OFFSET = struct.Struct("<Q")   # Entry in blocks.idx: offset of block <height> in blocks.dat
+
+
+class BlockStore:
+    """
+    Append-only on-disk store of blockchain blocks with in-memory lookup indexes.
+
+    Layout of the store directory:
+        blocks.dat  length-prefixed compact JSON blocks, appended in height order
+        blocks.idx  one little-endian uint64 offset into blocks.dat per block
+        lock        flock held by the one process allowed to append
+
+    Both files are memory-mapped for reads. Indexes by transaction id and by sender/receiver
+    are rebuilt from the mapped data when the store is opened and updated on every append.
+
+    Several processes may open the same directory (one per uvicorn worker): the first to take
+    the exclusive lock is the writer, the others open it read-only and pick up the writer's
+    appends with refresh(). A reader whose refresh finds the lock free (the writer has exited)
+    becomes the writer.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._lock_fd = os.open(os.path.join(directory, "lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        self.writable = self._try_lock()
+        self._data = open(os.path.join(directory, "blocks.dat"), "a+b")
+        self._index = open(os.path.join(directory, "blocks.idx"), "a+b")
+        self._data_map: Optional[mmap.mmap] = None
+        self._index_map: Optional[mmap.mmap] = None
+
+        # tx_id -> (height, position in block); party -> sorted list of (height, position)
+        self._by_tx_id: Dict[str, Tuple[int, int]] = {}
+        self._by_party: Dict[str, List[Tuple[int, int]]] = {}
+
+        if self.writable:
+            self._recover()
+        else:
+            self._index_size = self._visible_index_size(0)
+        self._remap()
+        for height in range(self.height):
+            self._index_block(height, self.get_block(height))
+        logger.info("BlockStore opened at %s with %s blocks (%s)", directory, self.height,
+                    "writer" if self.writable else "reader")
+
+    @property
+    def height(self) -> int:
+        """
+        Number of blocks stored; also the height of the next block to fetch.
+        """
+        return self._index_size // _OFFSET.size
+
+    def _try_lock(self) -> bool:
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _block_end(self, entry: int, data_size: int) -> Optional[int]:
+        # End offset of the block indexed by entry, or None if it is not entirely in blocks.dat.
+        self._index.seek(entry * _OFFSET.size)
+        offset, = _OFFSET.unpack(self._index.read(_OFFSET.size))
+        self._data.seek(offset)
+        header = self._data.read(_LENGTH.size)
+        if len(header) < _LENGTH.size or offset + _LENGTH.size + _LENGTH.unpack(header)[0] > data_size:
+            return None
+        return offset + _LENGTH.size + _LENGTH.unpack(header)[0]
+
+    def _visible_index_size(self, known: int) -> int:
+        # Readers never truncate: they only count the index entries, beyond the known size, that
+        # the writer has finished (a whole offset whose block is entirely in blocks.dat).
+        size = os.fstat(self._index.fileno()).st_size // _OFFSET.size * _OFFSET.size
+        data_size = os.fstat(self._data.fileno()).st_size
+        while size > known and self._block_end(size // _OFFSET.size - 1, data_size) is None:
+            size -= _OFFSET.size
+        return max(size, known)
+
+    def refresh(self) -> List[dict]:
+        """
+        Pick up the blocks appended by the writing process since the last refresh, taking
+        over as writer if it has exited. A no-op for the writer.
+
+        Returns:
+            The new blocks, in height order.
+        """
+        if self.writable:
+            return []
+        start = self.height
+        if self._try_lock():
+            self.writable = True
+            self._recover()
+            logger.info("BlockStore at %s taken over for writing at height %s", self.directory, self.height)
+        else:
+            self._index_size = self._visible_index_size(self._index_size)
+        if self.height <= start:
+            return []
+        self._remap()
+        blocks = [self.get_block(height) for height in range(start, self.height)]
+        for height, block in enumerate(blocks, start):
+            self._index_block(height, block)
+        return blocks
+
+    def _recover(self) -> None:
+        # Drop a torn tail left by a crash between the data and the index write.
+        self._index_size = os.fstat(self._index.fileno()).st_size // _OFFSET.size * _OFFSET.size
+        data_size = os.fstat(self._data.fileno()).st_size
+        while self._index_size:
+            end = self._block_end(self._index_size // _OFFSET.size - 1, data_size)
+            if end is not None:
+                data_size = end
+                break
+            self._index_size -= _OFFSET.size
+        else:
+            data_size = 0
+        self._index.truncate(self._index_size)
+        self._data.truncate(data_size)
+
+    def _remap(self) -> None:
+        # The previous maps are not closed but dropped: a thread still reading an older block
+        # through them (LedgerReplica's history build, or an account-history query answered
+        # while it runs) keeps a valid view, and they are unmapped once the last reference goes.
+        self._data.flush()
+        self._index.flush()
+        data_size = os.fstat(self._data.fileno()).st_size
+        self._data_map = mmap.mmap(self._data.fileno(), 0, access=mmap.ACCESS_READ) if data_size else None
+        self._index_map = mmap.mmap(self._index.fileno(), 0, access=mmap.ACCESS_READ) if self._index_size else None
+
+    def _index_block(self, height: int, block: dict) -> None:
+        for position, tx in enumerate(block.get("transactions", [])):
+            location = (height, position)
+            tx_id = tx.get("transaction_id")
+            if tx_id is not None:
+                self._by_tx_id[tx_id] = location
+            for party in {tx.get("sender"), tx.get("receiver")} - {None}:
+                self._by_party.setdefault(party, []).append(location)
+
+    def append(self, blocks: List[dict]) -> int:
+        """
+        Append blocks in height order and index their transactions.
+
+        Returns:
+            The new height of the store.
+        """
+        if not self.writable:
+            raise PermissionError(f"BlockStore at {self.directory} is open read-only; another process writes it")
+        if not blocks:
+            return self.height
+        self._data.seek(0, os.SEEK_END)
+        offset = self._data.tell()
+        start = self.height
+        offsets = bytearray()
+        for block in blocks:
+            payload = json.dumps(block, separators=(",", ":")).encode()
+            self._data.write(_LENGTH.pack(len(payload)) + payload)
+            offsets += _OFFSET.pack(offset)
+            offset += _LENGTH.size + len(payload)
+        # Data first, then index: a crash in between leaves only unindexed bytes, trimmed on open.
+        self._data.flush()
+        os.fsync(self._data.fileno())
+        self._index.write(offsets)
+        self._index.flush()
+        os.fsync(self._index.fileno())
+        self._index_size += len(offsets)
+        self._remap()
+        for height, block in enumerate(blocks, start):
+            self._index_block(height, block)
+        return self.height
+
+    def get_block(self, height: int) -> dict:
+        """
+        Read one block by height from the memory-mapped store.
+        """
+        if not 0 <= height < self.height:
+            raise IndexError(f"Block {height} is not stored (height {self.height})")
+        index_map, data_map = self._index_map, self._data_map
+        offset, = _OFFSET.unpack_from(index_map, height * _OFFSET.size)
+        length, = _LENGTH.unpack_from(data_map, offset)
+        start = offset + _LENGTH.size
+        return json.loads(data_map[start:start + length])
+
+    def iter_blocks(self, start: int = 0, end: int = None) -> Iterator[dict]:
+        for height in range(start, self.height if end is None else end):
+            yield self.get_block(height)
+
+    def _transaction_at(self, location: Tuple[int, int]) -> dict:
+        height, position = location
+        return self.get_block(height)["transactions"][position]
+
+    def find_transaction(self, tx_id: str) -> Optional[dict]:
+        """
+        Look up a transaction by id without scanning the ledger.
+        """
+        location = self._by_tx_id.get(tx_id)
+        return self._transaction_at(location) if location is not None else None
+
+    def transactions_for(self, user_id: str, from_height: int = 0, limit: int = None) -> List[dict]:
+        """
+        Return the transactions in which user_id is sender or receiver, oldest first,
+        starting at block from_height.
+        """
+        locations = self._by_party.get(user_id, [])
+        start = bisect.bisect_left(locations, (from_height, 0))
+        end = len(locations) if limit is None else min(len(locations), start + limit)
+        return [self._transaction_at(location) for location in locations[start:end]]
+
+    def close(self) -> None:
+        for m in (self._data_map, self._index_map):
+            if m is not None:
+                m.close()
+        self._data.close()
+        self._index.close()
+        os.close(self._lock_fd)
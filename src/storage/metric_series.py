@@ -0,0 +1,199 @@
+import logging
+import math
+import warnings
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+def parse_tiers(spec: str) -> List[Tuple[float, int]]:
+    """
+    Parse a tier specification of the form "1:3600,60:1440" into (resolution seconds, slots)
+    pairs, finest first.
+    """
+    tiers = []
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        resolution, _, slots = item.partition(":")
+        tiers.append((float(resolution), int(slots)))
+    if not tiers or any(resolution <= 0 or slots <= 0 for resolution, slots in tiers):
+        raise ValueError(f"Invalid metrics history tiers '{spec}'")
+    return sorted(tiers)
+
+
+class _Tier:
+    """
+    One resolution: a ring of buckets, each holding the count, sum, min and max of every
+    field over its interval. Bucket n (time // resolution) lives in slot n % slots.
+    """
+
+    def __init__(self, resolution: float, slots: int, fields: int):
+        self.resolution = resolution
+        self.slots = slots
+        self.bucket = np.full(slots, -1, dtype=np.int64)
+        self.count = np.zeros((slots, fields), dtype=np.int32)
+        self.sum = np.zeros((slots, fields), dtype=np.float64)
+        self.min = np.zeros((slots, fields), dtype=np.float64)
+        self.max = np.zeros((slots, fields), dtype=np.float64)
+
+    def add(self, timestamp: float, present: np.ndarray, values: np.ndarray) -> None:
+        bucket = int(timestamp // self.resolution)
+        slot = bucket % self.slots
+        if self.bucket[slot] != bucket:
+            # The slot still holds a bucket that has aged out of the ring: reuse it.
+            self.bucket[slot] = bucket
+            self.count[slot] = 0
+            self.sum[slot] = 0.0
+            self.min[slot] = np.inf
+            self.max[slot] = -np.inf
+        self.count[slot] += present
+        self.sum[slot] += np.where(present, values, 0.0)
+        np.minimum(self.min[slot], np.where(present, values, np.inf), out=self.min[slot])
+        np.maximum(self.max[slot], np.where(present, values, -np.inf), out=self.max[slot])
+
+    def retention(self) -> float:
+        return self.resolution * self.slots
+
+
+class MetricSeries:
+    """
+    Fixed-size history of numeric metrics at several resolutions.
+
+    Every sample is folded into each tier's current bucket (count, sum, min and max per
+    field), so coarser tiers are downsampled as samples arrive rather than by a separate
+    rollup pass. Tiers are ring buffers of preallocated arrays, so memory is fixed by the tier
+    sizes and max_fields no matter how long the series runs; fields first seen after
+    max_fields are ignored.
+
+    Queries read the finest tier that still covers the requested range and aggregate its
+    buckets with array operations. Percentiles are taken over the bucket averages, which at
+    the finest tier are the samples themselves when sampling once per bucket.
+    """
+
+    def __init__(self, tiers: Sequence[Tuple[float, int]], max_fields: int = 16):
+        self.max_fields = max_fields
+        self._fields: Dict[str, int] = {}
+        self._tiers = [_Tier(resolution, slots, max_fields) for resolution, slots in sorted(tiers)]
+        self._ignored: set = set()
+        self.last_timestamp: Optional[float] = None
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._fields)
+
+    @property
+    def resolutions(self) -> List[float]:
+        return [tier.resolution for tier in self._tiers]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for tier in self._tiers
+                   for array in (tier.bucket, tier.count, tier.sum, tier.min, tier.max))
+
+    def add(self, timestamp: float, sample: Dict[str, float]) -> None:
+        """
+        Record the numeric values of sample (others, and booleans, are skipped) at timestamp.
+        """
+        present = np.zeros(self.max_fields, dtype=bool)
+        values = np.zeros(self.max_fields, dtype=np.float64)
+        for name, value in sample.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            column = self._fields.get(name)
+            if column is None:
+                if len(self._fields) >= self.max_fields:
+                    if name not in self._ignored:
+                        self._ignored.add(name)
+                        logger.warning("Metrics history is full (%s fields); ignoring '%s'", self.max_fields, name)
+                    continue
+                column = self._fields[name] = len(self._fields)
+            present[column] = True
+            values[column] = value
+        if not present.any():
+            return
+        for tier in self._tiers:
+            tier.add(timestamp, present, values)
+        self.last_timestamp = timestamp
+
+    def _tier_for(self, since: float, now: float, resolution: Optional[float]) -> _Tier:
+        if resolution is not None:
+            for tier in self._tiers:
+                if tier.resolution >= resolution:
+                    return tier
+            return self._tiers[-1]
+        for tier in self._tiers:
+            if now - since <= tier.retention():
+                return tier
+        return self._tiers[-1]
+
+    def query(self, since: float, until: float, now: float, fields: Sequence[str] = None,
+              resolution: float = None) -> dict:
+        """
+        Buckets and aggregates of fields (default: all) within [since, until).
+
+        Returns:
+            {"resolution": seconds, "since": ..., "until": ..., "fields": {name: {"count",
+            "min", "max", "avg", "p50", "p90", "p99", "points"}}} where points are
+            [bucket start, avg, min, max] rows, oldest first, for buckets holding the field.
+            Aggregates are None for a field with no data in the range.
+
+        Raises:
+            ValueError: if since or until is not finite.
+        """
+        if not (math.isfinite(since) and math.isfinite(until)):
+            raise ValueError("since and until must be finite")
+        tier = self._tier_for(since, now, resolution)
+        names = [name for name in (fields if fields is not None else self._fields) if name in self._fields]
+        # Only buckets still in the ring, up to the current one, can hold data; clamping to them
+        # also bounds the arrays below whatever range is asked for.
+        current = int(now // tier.resolution)
+        first = int(max(since // tier.resolution, current - tier.slots + 1))
+        last = int(min(math.ceil(until / tier.resolution) - 1, current))
+        buckets = np.arange(first, last + 1, dtype=np.int64) if last >= first else np.empty(0, dtype=np.int64)
+        slots = buckets % tier.slots
+        valid = tier.bucket[slots] == buckets
+        buckets, slots = buckets[valid], slots[valid]
+        columns = [self._fields[name] for name in names]
+        count = tier.count[np.ix_(slots, columns)]
+        total = tier.sum[np.ix_(slots, columns)]
+        low = tier.min[np.ix_(slots, columns)]
+        high = tier.max[np.ix_(slots, columns)]
+        has = count > 0
+        starts = buckets * tier.resolution
+        totals = count.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            average = np.where(has, total / count, np.nan)
+            mean = total.sum(axis=0) / totals
+        lowest = np.where(has, low, np.inf).min(axis=0, initial=np.inf)
+        highest = np.where(has, high, -np.inf).max(axis=0, initial=-np.inf)
+        if len(slots):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)   # All-NaN columns: fields without data
+                percentiles = np.nanpercentile(average, _PERCENTILES, axis=0)
+        else:
+            percentiles = np.full((len(_PERCENTILES), len(names)), np.nan)
+
+        result = {}
+        for j, name in enumerate(names):
+            if not totals[j]:
+                result[name] = {"count": 0, "min": None, "max": None, "avg": None, "p50": None,
+                                "p90": None, "p99": None, "points": []}
+                continue
+            rows = has[:, j]
+            p50, p90, p99 = percentiles[:, j].tolist()
+            result[name] = {
+                "count": int(totals[j]),
+                "min": float(lowest[j]),
+                "max": float(highest[j]),
+                "avg": float(mean[j]),
+                "p50": p50,
+                "p90": p90,
+                "p99": p99,
+                "points": np.column_stack([starts[rows], average[rows, j], low[rows, j], high[rows, j]]).tolist(),
+            }
+        return {"resolution": tier.resolution, "since": since, "until": until, "fields": result}
@@ -0,0 +1,126 @@
+import json
+import logging
+import os
+import struct
+import zlib
+from typing import Iterable, List
+
+logger = logging.getLogger(__name__)
+
+_HEADER = struct.Struct("<II")   # Record header: payload length, CRC32 of the payload
+
+
+class OutboxLog:
+    """
+    Append-only, checksummed log of outbox records.
+
+    Each record is a compact JSON object prefixed by its length and CRC32. append() writes
+    any number of records and makes them durable with a single fsync, so callers can commit
+    records in groups. A torn or corrupt tail left by a crash is truncated when the log is
+    opened; everything before it is kept.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = self._open()
+        self._records = self._recover()
+        self.size = self._file.tell()
+
+    def _open(self):
+        # Unbuffered: a failed append must not leave bytes in a userspace buffer to be flushed later.
+        return open(self.path, "a+b", buffering=0)
+
+    def _recover(self) -> List[dict]:
+        self._file.seek(0)
+        data = self._file.read()
+        records = []
+        offset = 0
+        while offset + _HEADER.size <= len(data):
+            length, checksum = _HEADER.unpack_from(data, offset)
+            start = offset + _HEADER.size
+            payload = data[start:start + length]
+            if len(payload) != length or zlib.crc32(payload) != checksum:
+                break
+            records.append(json.loads(payload))
+            offset = start + length
+        if offset != len(data):
+            logger.warning("Truncating %s bytes of incomplete outbox records in %s", len(data) - offset, self.path)
+            self._file.truncate(offset)
+        self._file.seek(0, os.SEEK_END)
+        return records
+
+    def records(self) -> List[dict]:
+        """
+        The records found when the log was opened, oldest first. Only available once.
+        """
+        records, self._records = self._records, []
+        return records
+
+    @staticmethod
+    def _encode(records: Iterable[dict]) -> bytes:
+        chunks = []
+        for record in records:
+            payload = json.dumps(record, separators=(",", ":")).encode()
+            chunks.append(_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        return b"".join(chunks)
+
+    def append(self, records: List[dict]) -> None:
+        """
+        Append records and fsync once; they are durable when this returns. If the write or
+        fsync fails, the log is truncated back to its previous size before the error is raised,
+        so a partial record never sits in front of later appends.
+        """
+        data = self._encode(records)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[self._file.write(view):]
+            os.fsync(self._file.fileno())
+        except BaseException:
+            self._rollback()
+            raise
+        self.size += len(data)
+
+    def _rollback(self) -> None:
+        try:
+            os.ftruncate(self._file.fileno(), self.size)
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            # The file cannot be trusted past self.size: reopen it and recover as on startup.
+            logger.error("Could not roll back a failed outbox append in %s: %s", self.path, e)
+            self._file.close()
+            self._file = self._open()
+            self._recover()
+            self.size = self._file.tell()
+
+    def rewrite(self, records: List[dict]) -> None:
+        """
+        Atomically replace the log with records (used to drop settled entries). If this fails,
+        the log is either untouched or already replaced, and appends keep going to the current one.
+        """
+        temporary = self.path + ".tmp"
+        try:
+            with open(temporary, "wb") as f:
+                f.write(self._encode(records))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, self.path)
+        except BaseException:
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+            raise
+        # Reopened before anything else can fail, so appends never go to the replaced file.
+        self._file.close()
+        self._file = self._open()
+        self.size = self._file.seek(0, os.SEEK_END)
+        directory = os.open(os.path.dirname(os.path.abspath(self.path)), os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+    def close(self) -> None:
+        self._file.close()
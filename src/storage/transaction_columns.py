@@ -0,0 +1,223 @@
+import logging
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_INITIAL_CAPACITY = 1024
+# The tail index (rows appended since the last merge) is merged into the main index once it
+# exceeds this fraction of the store (and _MIN_REINDEX rows); until then appends only merge
+# into the smaller tail index.
+_REINDEX_FRACTION = 0.125
+_MIN_REINDEX = 65536
+_ROW_MASK = 0xFFFFFFFF
+
+
+def _merge(keys: np.ndarray, new: np.ndarray) -> np.ndarray:
+    # Merging sorted keys is linear; re-sorting on every append would not be.
+    return np.insert(keys, np.searchsorted(keys, new), new)
+
+
+class TransactionColumns:
+    """
+    In-memory columnar store of ledger transactions for per-account analytics.
+
+    Transactions are held in four parallel numpy arrays (sender id, receiver id, amount,
+    timestamp) that grow by doubling; user ids are interned to dense integers. Rows are only
+    ever appended, in ledger order.
+
+    Per-user queries use a sorted (user, row) index, so their cost depends on the user's own
+    transaction count rather than on the size of the ledger. The index covers a prefix of the
+    rows; rows appended since go into a second, smaller index of the same form, which is merged
+    into the main one once it grows past _REINDEX_FRACTION of the store.
+    """
+
+    def __init__(self):
+        self._user_ids: Dict[str, int] = {}
+        self._users: List[str] = []
+        self._size = 0
+        self._sender = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._receiver = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._amount = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._timestamp = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        # Index over rows [0, _indexed): sorted (user << 32 | row) keys, and the rows of user u
+        # are _index_rows[_index_offsets[u]:_index_offsets[u + 1]].
+        self._indexed = 0
+        self._index_keys = np.empty(0, dtype=np.int64)
+        self._index_rows = np.empty(0, dtype=np.int64)
+        self._index_offsets = np.zeros(1, dtype=np.int64)
+        # Sorted (user << 32 | row) keys of rows [_indexed, _size).
+        self._tail_keys = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def user_count(self) -> int:
+        return len(self._users)
+
+    def _intern(self, user: str) -> int:
+        user_id = self._user_ids.get(user)
+        if user_id is None:
+            user_id = self._user_ids[user] = len(self._users)
+            self._users.append(user)
+        return user_id
+
+    def _reserve(self, rows: int) -> None:
+        needed = self._size + rows
+        capacity = len(self._amount)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("_sender", "_receiver", "_amount", "_timestamp"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            setattr(self, name, grown)
+
+    def append(self, transactions: Iterable[dict]) -> int:
+        """
+        Append transactions (dicts with sender, receiver, amount and timestamp); entries missing
+        a field, or whose amount or timestamp is not a number, are skipped.
+
+        Returns:
+            The number of rows added.
+        """
+        intern = self._intern
+        senders, receivers, amounts, timestamps = [], [], [], []
+        for tx in transactions:
+            try:
+                # Converted here, so a bad row is skipped alone instead of failing the chunk's
+                # column assignment below.
+                amount, timestamp = float(tx["amount"]), float(tx["timestamp"])
+                sender_id, receiver_id = intern(tx["sender"]), intern(tx["receiver"])
+            except (KeyError, TypeError, ValueError, OverflowError):
+                continue
+            senders.append(sender_id)
+            receivers.append(receiver_id)
+            amounts.append(amount)
+            timestamps.append(timestamp)
+        count = len(amounts)
+        if not count:
+            return 0
+        self._reserve(count)
+        start, end = self._size, self._size + count
+        self._sender[start:end] = senders
+        self._receiver[start:end] = receivers
+        self._amount[start:end] = amounts
+        self._timestamp[start:end] = timestamps
+        self._size = end
+        self._tail_keys = _merge(self._tail_keys, self._keys(start, end))
+        tail = self._size - self._indexed
+        if tail >= _MIN_REINDEX and tail >= _REINDEX_FRACTION * self._size:
+            self._merge_tail()
+        return count
+
+    def _keys(self, start: int, end: int) -> np.ndarray:
+        # Sorted keys of rows [start, end): one per (user, row) pair for both roles; a
+        # self-transfer gets a single key.
+        rows = np.arange(start, end, dtype=np.int64)
+        senders = self._sender[start:end].astype(np.int64)
+        receivers = self._receiver[start:end].astype(np.int64)
+        other = receivers != senders
+        return np.sort(np.concatenate([(senders << 32) | rows, (receivers[other] << 32) | rows[other]]))
+
+    def _merge_tail(self) -> None:
+        keys = _merge(self._index_keys, self._tail_keys)
+        self._index_keys = keys
+        self._index_rows = keys & _ROW_MASK
+        self._index_offsets = np.searchsorted(keys >> 32, np.arange(len(self._users) + 1, dtype=np.int64))
+        self._indexed = self._size
+        self._tail_keys = np.empty(0, dtype=np.int64)
+
+    def _rows_of(self, user_id: int) -> np.ndarray:
+        """
+        Row numbers of the user's transactions, in ledger order.
+        """
+        if user_id + 1 < len(self._index_offsets):
+            indexed = self._index_rows[self._index_offsets[user_id]:self._index_offsets[user_id + 1]]
+        else:
+            indexed = self._index_rows[:0]
+        keys = self._tail_keys
+        low, high = np.searchsorted(keys, [user_id << 32, (user_id + 1) << 32])
+        if low == high:
+            return indexed
+        tail = keys[low:high] & _ROW_MASK
+        return np.concatenate([indexed, tail]) if len(indexed) else tail
+
+    def _window(self, user_id: int, since: Optional[float], until: Optional[float]) -> np.ndarray:
+        rows = self._rows_of(user_id)
+        if since is not None or until is not None:
+            timestamps = self._timestamp[rows]
+            mask = np.ones(len(rows), dtype=bool)
+            if since is not None:
+                mask &= timestamps >= since
+            if until is not None:
+                mask &= timestamps < until
+            rows = rows[mask]
+        return rows
+
+    def history(self, user: str, since: float = None, until: float = None, limit: int = 100,
+                top: int = 10) -> dict:
+        """
+        Everything the store knows about one user within [since, until).
+
+        Returns:
+            A dictionary with "summary" (counts and totals sent and received, and the net
+            flow), "top_counterparties" (up to top users by volume exchanged with this user)
+            and "transactions" (up to limit of the most recent ones, newest first).
+        """
+        user_id = self._user_ids.get(user, -1)
+        rows = self._window(user_id, since, until) if user_id >= 0 else np.empty(0, dtype=np.int64)
+        senders = self._sender[rows]
+        amounts = self._amount[rows]
+        sent = senders == user_id
+        received = self._receiver[rows] == user_id
+        sent_total = float(amounts[sent].sum())
+        received_total = float(amounts[received].sum())
+        return {
+            "summary": {
+                "sent_count": int(sent.sum()),
+                "sent_total": sent_total,
+                "received_count": int(received.sum()),
+                "received_total": received_total,
+                "net": received_total - sent_total,
+            },
+            "top_counterparties": self._top_counterparties(rows, sent, amounts, top) if top > 0 else [],
+            "transactions": self._records(rows[::-1][:limit]) if limit > 0 else [],
+        }
+
+    def _top_counterparties(self, rows: np.ndarray, sent: np.ndarray, amounts: np.ndarray, top: int) -> List[dict]:
+        if not len(rows):
+            return []
+        counterparties = np.where(sent, self._receiver[rows], self._sender[rows])
+        # Group by counterparty: sort, then reduce over the runs of equal ids.
+        order = np.argsort(counterparties, kind="stable")
+        grouped = counterparties[order]
+        starts = np.flatnonzero(np.concatenate([[True], grouped[1:] != grouped[:-1]]))
+        ids = grouped[starts]
+        counts = np.diff(np.append(starts, len(grouped)))
+        sent_volume = np.add.reduceat(np.where(sent, amounts, 0.0)[order], starts)
+        received_volume = np.add.reduceat(np.where(sent, 0.0, amounts)[order], starts)
+        volume = sent_volume + received_volume
+        order = np.argsort(-volume, kind="stable")[:top]
+        return [
+            {
+                "user_id": self._users[ids[i]],
+                "count": int(counts[i]),
+                "sent": float(sent_volume[i]),
+                "received": float(received_volume[i]),
+            }
+            for i in order
+        ]
+
+    def _records(self, rows: np.ndarray) -> List[dict]:
+        users = self._users
+        return [
+            {"sender": users[sender], "receiver": users[receiver], "amount": amount, "timestamp": timestamp}
+            for sender, receiver, amount, timestamp in zip(
+                self._sender[rows].tolist(), self._receiver[rows].tolist(),
+                self._amount[rows].tolist(), self._timestamp[rows].tolist())
+        ]
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from src.config.settings import settings
+from src.utils.metrics import REGISTRY, Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "chronos_admission_queue_depth", "Requests waiting for admission, by priority class.", ("priority",)))
+ADMISSION_ACTIVE = REGISTRY.register(Gauge(
+    "chronos_admission_active", "Admitted requests currently running, by route class.", ("route",)))
+ADMISSION_WAIT = REGISTRY.register(Histogram(
+    "chronos_admission_wait_seconds", "Time requests spent queued before admission.", ("priority",)))
+ADMISSION_SHED = REGISTRY.register(Counter(
+    "chronos_admission_shed_total", "Requests rejected by admission control, by route class and reason.",
+    ("route", "reason")))
+
+# Priority classes, most important first. Critical work is never shed for queueing delay.
+CRITICAL, HIGH, NORMAL, LOW = 0, 1, 2, 3
+PRIORITY_NAMES = ("critical", "high", "normal", "low")
+
+# route class -> (priority, default concurrency limit; None means only the global limit applies)
+ROUTE_CLASSES: Dict[str, Tuple[int, Optional[int]]] = {
+    "transaction": (CRITICAL, None),
+    "balance": (HIGH, 32),
+    "ledger": (NORMAL, 16),
+    "time": (NORMAL, 16),
+    "status": (LOW, 8),
+    "snapshot": (LOW, 8),
+    "insights": (LOW, 4),
+}
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is not admitted. status_code is 429 when the queue is full and 503
+    when the request was shed or waited too long; retry_after is in seconds.
+    """
+
+    def __init__(self, route: str, reason: str, status_code: int, retry_after: int = 1):
+        super().__init__(f"Request for '{route}' rejected by admission control: {reason}")
+        self.route = route
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("route", "future", "enqueued_at")
+
+    def __init__(self, route: str, future: asyncio.Future, enqueued_at: float):
+        self.route = route
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+
+class _Delay:
+    """
+    CoDel state of one priority class: whether its queueing delay has stayed above target
+    for a whole interval.
+    """
+    __slots__ = ("first_above", "dropping")
+
+    def __init__(self):
+        self.first_above = 0.0
+        self.dropping = False
+
+
+class AdmissionController:
+    """
+    Bounds how much work the API runs at once and decides what waits and what is turned away.
+
+    A request runs immediately if fewer than max_concurrency requests are running and its
+    route class is under its own limit; otherwise it queues. Freed slots go to the waiting
+    request of the most important priority class whose route is under its limit.
+
+    Shedding follows CoDel: queueing delay is measured when a request leaves the queue, and
+    once a class's delay has stayed above target_delay for a full interval, that class is in
+    the dropping state. Its queued requests that have waited longer than target are shed with
+    503 and new arrivals are rejected straight away, until a request gets through under the
+    target again. Critical requests are never shed this way. Every request waits at most
+    max_wait seconds (503), and a full queue rejects new arrivals with 429.
+    """
+
+    def __init__(self, max_concurrency: int = None, target_delay: float = None, interval: float = None,
+                 max_wait: float = None, max_queue: int = None, route_limits: Dict[str, int] = None):
+        self.max_concurrency = max_concurrency or settings.ADMISSION_MAX_CONCURRENCY
+        self.target_delay = target_delay or settings.ADMISSION_TARGET_DELAY
+        self.interval = interval or settings.ADMISSION_INTERVAL
+        self.max_wait = max_wait or settings.ADMISSION_MAX_WAIT
+        self.max_queue = max_queue or settings.ADMISSION_MAX_QUEUE
+        self.limits = {route: limit for route, (_, limit) in ROUTE_CLASSES.items()}
+        self.limits.update(route_limits if route_limits is not None else parse_limits(settings.ADMISSION_ROUTE_LIMITS))
+        self._active = 0
+        self._route_active: Dict[str, int] = {route: 0 for route in ROUTE_CLASSES}
+        # One FIFO per route class, visited most important first when a slot frees up.
+        self._waiting: Dict[str, Deque[_Waiter]] = {
+            route: deque() for route in sorted(ROUTE_CLASSES, key=lambda route: ROUTE_CLASSES[route][0])}
+        self._queued = [0] * len(PRIORITY_NAMES)
+        self._delays = [_Delay() for _ in PRIORITY_NAMES]
+
+    def _has_room(self, route: str) -> bool:
+        limit = self.limits.get(route)
+        return self._active < self.max_concurrency and (limit is None or self._route_active[route] < limit)
+
+    def _start(self, route: str) -> None:
+        self._active += 1
+        self._route_active[route] += 1
+        ADMISSION_ACTIVE.labels(route).inc()
+
+    def _reject(self, route: str, reason: str, status_code: int) -> AdmissionRejected:
+        ADMISSION_SHED.labels(route, reason).inc()
+        return AdmissionRejected(route, reason, status_code, retry_after=max(1, int(self.max_wait + 0.999)))
+
+    async def acquire(self, route: str) -> None:
+        """
+        Wait for a slot for route.
+
+        Raises:
+            AdmissionRejected: if the request is shed, times out or finds the queue full.
+        """
+        priority = ROUTE_CLASSES[route][0]
+        waiting = self._waiting[route]
+        # Nobody of this route class is waiting, and waiters of other classes are only ever
+        # left queued while their own class is at its limit, so taking a free slot jumps no one.
+        if not waiting and self._has_room(route):
+            self._start(route)
+            return
+        if priority != CRITICAL and self._delays[priority].dropping:
+            raise self._reject(route, "overload", 503)
+        if sum(self._queued) >= self.max_queue:
+            raise self._reject(route, "queue_full", 429)
+
+        waiter = _Waiter(route, asyncio.get_running_loop().create_future(), time.monotonic())
+        waiting.append(waiter)
+        self._queued[priority] += 1
+        ADMISSION_QUEUE_DEPTH.labels(PRIORITY_NAMES[priority]).inc()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.max_wait)
+        except asyncio.TimeoutError:
+            if waiter.future.done():
+                if waiter.future.exception() is not None:
+                    raise waiter.future.exception()
+                return   # Admitted just as the wait expired
+            self._abandon(waiter, priority)
+            raise self._reject(route, "timeout", 503)
+        except asyncio.CancelledError:
+            if waiter.future.done():
+                if waiter.future.exception() is None:
+                    self.release(route)
+            else:
+                self._abandon(waiter, priority)
+            raise
+
+    def _abandon(self, waiter: _Waiter, priority: int) -> None:
+        waiter.future.cancel()
+        self._waiting[waiter.route].remove(waiter)
+        self._dequeued(priority)
+
+    def release(self, route: str) -> None:
+        self._active -= 1
+        self._route_active[route] -= 1
+        ADMISSION_ACTIVE.labels(route).dec()
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        for route, waiting in self._waiting.items():
+            if self._active >= self.max_concurrency:
+                return
+            priority = ROUTE_CLASSES[route][0]
+            while waiting and self._has_room(route):
+                waiter = waiting.popleft()
+                self._dequeued(priority)
+                sojourn = now - waiter.enqueued_at
+                ADMISSION_WAIT.labels(PRIORITY_NAMES[priority]).observe(sojourn)
+                if self._should_shed(priority, sojourn, now):
+                    waiter.future.set_exception(self._reject(route, "overload", 503))
+                    continue
+                self._start(route)
+                waiter.future.set_result(None)
+
+    def _dequeued(self, priority: int) -> None:
+        self._queued[priority] -= 1
+        ADMISSION_QUEUE_DEPTH.labels(PRIORITY_NAMES[priority]).dec()
+        if not self._queued[priority]:
+            # As in CoDel, an empty queue ends the dropping state.
+            self._leave_dropping(priority)
+
+    def _leave_dropping(self, priority: int) -> None:
+        state = self._delays[priority]
+        state.first_above = 0.0
+        if state.dropping:
+            state.dropping = False
+            logger.info("Admission control stopped shedding %s requests", PRIORITY_NAMES[priority])
+
+    def _should_shed(self, priority: int, sojourn: float, now: float) -> bool:
+        state = self._delays[priority]
+        if sojourn < self.target_delay:
+            self._leave_dropping(priority)
+            return False
+        if state.first_above == 0.0:
+            state.first_above = now + self.interval
+            return False
+        if now < state.first_above or priority == CRITICAL:
+            return False
+        if not state.dropping:
+            state.dropping = True
+            logger.warning("Admission control shedding %s requests: queueing delay above %.0fms for %.1fs",
+                           PRIORITY_NAMES[priority], self.target_delay * 1000, self.interval)
+        return True
+
+    @asynccontextmanager
+    async def slot(self, route: str) -> AsyncIterator[None]:
+        """
+        Hold an admission slot for route for the duration of the block.
+        """
+        await self.acquire(route)
+        try:
+            yield
+        finally:
+            self.release(route)
+
+    def snapshot(self) -> dict:
+        return {
+            "enabled": settings.ADMISSION_ENABLED,
+            "active": self._active,
+            "max_concurrency": self.max_concurrency,
+            "routes": {route: {"active": self._route_active[route], "limit": self.limits.get(route),
+                               "priority": PRIORITY_NAMES[ROUTE_CLASSES[route][0]]}
+                       for route in ROUTE_CLASSES},
+            "queued": {name: self._queued[i] for i, name in enumerate(PRIORITY_NAMES)},
+            "shedding": [name for i, name in enumerate(PRIORITY_NAMES) if self._delays[i].dropping],
+        }
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """
+    Parse per-route limit overrides of the form "balance=64,status=4".
+    """
+    limits = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        route, _, value = item.partition("=")
+        route = route.strip()
+        if route not in ROUTE_CLASSES or not value.strip().isdigit():
+            raise ValueError(f"Invalid admission limit '{item.strip()}'")
+        limits[route] = int(value)
+    return limits
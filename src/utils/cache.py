@@ -0,0 +1,289 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+from src.config.settings import settings
+from src.utils.metrics import cache_result
+from src.utils.shared_cache import SharedStore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedValue:
+    """
+    A value served from the cache together with its age in seconds.
+    """
+    value: object
+    age: float
+
+
+class SharedLoadError(Exception):
+    """
+    Raised when another worker process failed to load a shared key within negative_ttl;
+    carries that worker's error message.
+    """
+
+
+class _Entry:
+    __slots__ = ("value", "has_value", "fetched_at", "error", "retry_at")
+
+    def __init__(self):
+        self.value = None
+        self.has_value = False
+        self.fetched_at = 0.0    # When the current value was loaded
+        self.error = None        # Last upstream error, cleared by the next successful load
+        self.retry_at = 0.0      # No refresh is attempted before this time after an error
+
+
+class SWRCache:
+    """
+    Per-key TTL cache with stale-while-revalidate semantics and bounded LRU eviction.
+
+    - Fresh entries (younger than ttl) are served directly.
+    - Stale entries (younger than ttl + max_stale) are served immediately while a single
+      background task refreshes the key.
+    - Upstream errors are cached for negative_ttl so a failing upstream is not hammered;
+      if a usable value exists it keeps being served in the meantime.
+    - With a shared store, loads first look for a fresh value published by another worker
+      process, and only the worker holding the key's lease calls the loader. Its failures are
+      published too, so the other workers fail fast instead of waiting out the lease.
+    """
+
+    def __init__(self, name: str, ttl: float, max_stale: float, negative_ttl: float, max_entries: int,
+                 shared: Optional[SharedStore] = None):
+        self.name = name
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[object]]) -> CachedValue:
+        """
+        Return the cached value for key, loading it with loader() on a miss.
+
+        Raises:
+            Exception: the (possibly cached) upstream error when no usable value exists.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            age = now - entry.fetched_at
+            if entry.has_value and age < self.ttl:
+                cache_result(self.name, "hit")
+                return CachedValue(entry.value, age)
+            if entry.has_value and age < self.ttl + self.max_stale:
+                cache_result(self.name, "stale")
+                if now >= entry.retry_at:
+                    self._refresh(key, loader)
+                return CachedValue(entry.value, age)
+            if entry.error is not None and now < entry.retry_at:
+                cache_result(self.name, "negative")
+                raise entry.error
+
+        cache_result(self.name, "miss")
+        # Shielded: a caller that gives up (e.g. on a deadline) must not cancel the shared refresh.
+        await asyncio.shield(self._refresh(key, loader))
+        entry = self._entries.get(key)
+        if entry is None or entry.error is not None:
+            raise entry.error if entry is not None else LookupError(f"{key!r} was evicted while loading")
+        return CachedValue(entry.value, time.monotonic() - entry.fetched_at)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[object]]) -> asyncio.Task:
+        task = self._refreshing.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._load(key, loader))
+            self._refreshing[key] = task
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[object]]) -> None:
+        entry = self._entries.get(key) or _Entry()
+        try:
+            if self.shared is not None:
+                entry.value, age = await self._load_shared(key, loader)
+            else:
+                entry.value, age = await loader(), 0.0
+            entry.has_value = True
+            entry.fetched_at = time.monotonic() - age
+            entry.error = None
+        except Exception as e:
+            entry.error = e
+            entry.retry_at = time.monotonic() + self.negative_ttl
+            if entry.has_value:
+                logger.warning("Refresh of %r failed, serving stale data: %s", key, e)
+        finally:
+            self._refreshing.pop(key, None)
+        self._store(key, entry)
+
+    async def _load_shared(self, key: Hashable, loader: Callable[[], Awaitable[object]]):
+        shared_key = f"{self.name}:{key}"
+        error_key = f"{shared_key}:error"
+        lease = settings.SHARED_CACHE_LEASE
+        deadline = time.monotonic() + lease
+        while True:
+            found = self.shared.get(shared_key)
+            if found is not None and found.age < self.ttl:
+                cache_result(self.name, "shared")
+                return found.value, found.age
+            failed = self.shared.get(error_key)
+            if failed is not None and failed.age < self.negative_ttl and (found is None or failed.age < found.age):
+                cache_result(self.name, "shared_negative")
+                raise SharedLoadError(failed.value)
+            if self.shared.acquire_lease(shared_key, lease):
+                try:
+                    value = await loader()
+                    self.shared.put(shared_key, value)
+                    return value, 0.0
+                except Exception as e:
+                    self.shared.put(error_key, str(e) or type(e).__name__)
+                    raise
+                finally:
+                    self.shared.release_lease(shared_key)
+            if time.monotonic() >= deadline:
+                logger.warning("No worker published %r within %ss; loading it here", shared_key, lease)
+                return await loader(), 0.0
+            # Another worker is refreshing this key: wait until it publishes a value or an error,
+            # or gives the lease up, then look again.
+            while self.shared.lease_held(shared_key) and time.monotonic() < deadline:
+                await asyncio.sleep(0.01)
+
+    def _store(self, key: Hashable, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop one key, or every key when none is given.
+        """
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class IdempotencyConflictError(Exception):
+    """
+    Raised when an idempotency key is reused for a different request.
+    """
+
+
+class _Submission:
+    __slots__ = ("fingerprint", "task", "result", "expires_at")
+
+    def __init__(self, fingerprint: Hashable, task: Optional[asyncio.Task] = None):
+        self.fingerprint = fingerprint
+        self.task = task          # Running submission; None once it has completed
+        self.result = None
+        self.expires_at = None    # Set once the submission has completed successfully
+
+
+class IdempotencyCache:
+    """
+    Bounded, expiring record of in-flight and completed submissions, keyed by idempotency key.
+
+    - The first request for a key starts the submission; concurrent duplicates await the same task.
+    - Once it succeeds, duplicates within ttl get the stored result without submitting anything.
+    - Failures are not remembered, so a client retry after an error is submitted again.
+    - A key reused with a different fingerprint (request content) is a conflict.
+    """
+
+    def __init__(self, name: str, ttl: float, max_entries: int):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, _Submission]" = OrderedDict()
+
+    async def run(self, key: Hashable, fingerprint: Hashable, submit: Callable[[], Awaitable[object]]) -> object:
+        """
+        Return the result of submit() for key, running it at most once while the key is remembered.
+
+        Raises:
+            IdempotencyConflictError: if key was used with a different fingerprint.
+            Exception: whatever submit() raised, for the first request and its concurrent duplicates.
+        """
+        entry = self._lookup(key, fingerprint)
+        if entry is not None and entry.task is None:
+            cache_result(self.name, "hit")
+            return entry.result
+        if entry is not None:
+            cache_result(self.name, "coalesced")
+        else:
+            cache_result(self.name, "miss")
+            entry = _Submission(fingerprint)
+            entry.task = asyncio.get_running_loop().create_task(self._submit(key, entry, submit))
+            # The failure reaches the callers; retrieve it here too in case they have all gone.
+            entry.task.add_done_callback(lambda task: task.cancelled() or task.exception())
+            self._store(key, entry)
+        # Shielded: a caller that disconnects must not cancel the submission its retry will look up.
+        return await asyncio.shield(entry.task)
+
+    async def _submit(self, key: Hashable, entry: _Submission, submit: Callable[[], Awaitable[object]]) -> object:
+        try:
+            result = await submit()
+        except BaseException:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            raise
+        entry.result = result
+        entry.expires_at = time.monotonic() + self.ttl
+        entry.task = None
+        return result
+
+    def get(self, key: Hashable, fingerprint: Hashable) -> Optional[object]:
+        """
+        Return the stored result for key if its submission has completed, without waiting.
+
+        Raises:
+            IdempotencyConflictError: if key was used with a different fingerprint.
+        """
+        entry = self._lookup(key, fingerprint)
+        if entry is None or entry.task is not None:
+            return None
+        cache_result(self.name, "hit")
+        return entry.result
+
+    def remember(self, key: Hashable, fingerprint: Hashable, result: object) -> None:
+        """
+        Store the result of a submission made outside run(), e.g. by a blocking call.
+        """
+        entry = _Submission(fingerprint)
+        entry.result = result
+        entry.expires_at = time.monotonic() + self.ttl
+        self._store(key, entry)
+
+    def _lookup(self, key: Hashable, fingerprint: Hashable) -> Optional[_Submission]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        if entry.fingerprint != fingerprint:
+            raise IdempotencyConflictError(f"Idempotency key {key!r} was already used for a different request")
+        return entry
+
+    def _store(self, key: Hashable, entry: _Submission) -> None:
+        self._entries[key] = entry
+        now = time.monotonic()
+        # Oldest first: drop expired entries, then whatever exceeds max_entries.
+        while self._entries:
+            oldest_key, oldest = next(iter(self._entries.items()))
+            expired = oldest.expires_at is not None and oldest.expires_at <= now
+            if not expired and (len(self._entries) <= self.max_entries or oldest is entry):
+                break
+            del self._entries[oldest_key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -2,8 +2,13 @@ import time
 import json
 import logging
 
-# Configure logging for the helper module.
-logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(asctime)s - %(message)s')
+from src.utils.logging_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+# (second, formatted) of the most recent format_timestamp call; responses within the same
+# second reuse the string instead of calling localtime/strftime again.
+_last_formatted = (None, "")
 
 
 def format_timestamp(ts: float) -> str:
@@ -16,7 +21,13 @@ def format_timestamp(ts: float) -> str:
     Returns:
         str: The timestamp formatted as "YYYY-MM-DD HH:MM:SS".
     """
-    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+    global _last_formatted
+    second = int(ts // 1)
+    cached_second, formatted = _last_formatted
+    if second != cached_second:
+        formatted = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        _last_formatted = (second, formatted)
+    return formatted
 
 
 def json_response(success: bool, data=None, message: str = "") -> dict:
@@ -41,9 +52,10 @@ def json_response(success: bool, data=None, message: str = "") -> dict:
 
 # Example usage for quick testing.
 if __name__ == "__main__":
+    configure_logging()
     now = time.time()
     formatted_now = format_timestamp(now)
-    logging.info(f"Formatted timestamp: {formatted_now}")
+    logger.info("Formatted timestamp: %s", formatted_now)
 
     sample_response = json_response(True, data={"sample": "value"}, message="Operation successful")
-    logging.info(f"Sample JSON response: {json.dumps(sample_response, indent=2)}")
+    logger.info("Sample JSON response: %s", json.dumps(sample_response, indent=2))
@@ -0,0 +1,120 @@
+import json
+import re
+from typing import List, Optional
+
+# Bytes that can change the parser state; everything else is skipped in bulk.
+_SIGNIFICANT = re.compile(rb'[\[\]{},:"\\]')
+
+
+class JsonArrayStream:
+    """
+    Incrementally extracts the elements of one array from a JSON document as it arrives.
+
+    Given the key of a top-level member holding an array (e.g. "chain" in
+    {"chain": [...], "length": n}), feed() accepts the document in arbitrary byte chunks and
+    returns every array element completed so far, already decoded. Only the element currently
+    being received is buffered, so memory stays proportional to the largest element rather
+    than to the whole document.
+    """
+
+    def __init__(self, key: str):
+        self.key = key.encode()
+        self._depth = 0
+        self._in_string = False
+        self._skip_next = False          # Previous chunk ended on a backslash inside a string
+        self._array_depth: Optional[int] = None
+        self._done = False
+        self._element = bytearray()      # Bytes of the array element in progress
+        self._string = bytearray()       # Bytes of the top-level string (member key) in progress
+        self._last_key: Optional[bytes] = None
+        self._expect_array = False       # Saw "<key>": and the value has not started yet
+
+    def feed(self, chunk: bytes) -> List[object]:
+        """
+        Consume the next chunk of the document.
+
+        Returns:
+            The array elements completed by this chunk, decoded, in document order.
+        """
+        items = []
+        if self._done or not chunk:
+            return items
+        in_array = self._array_depth is not None
+        segment_start = 0
+        string_start = 0
+        skip_pos = 0 if self._skip_next else -1
+        self._skip_next = False
+
+        for match in _SIGNIFICANT.finditer(chunk):
+            pos = match.start()
+            if pos == skip_pos:
+                continue
+            char = chunk[pos]
+            if self._in_string:
+                if char == 0x5C:  # backslash: the next byte is escaped
+                    if pos + 1 == len(chunk):
+                        self._skip_next = True
+                    skip_pos = pos + 1
+                elif char == 0x22:  # closing quote
+                    self._in_string = False
+                    if self._depth == 1 and not in_array:
+                        self._string += chunk[string_start:pos]
+                        self._last_key = bytes(self._string)
+                continue
+
+            if char == 0x22:  # opening quote
+                self._in_string = True
+                if self._depth == 1 and not in_array:
+                    self._string.clear()
+                    string_start = pos + 1
+                continue
+
+            if in_array:
+                if char in (0x5B, 0x7B):  # [ {
+                    self._depth += 1
+                elif char in (0x5D, 0x7D):  # ] }
+                    if self._depth == self._array_depth:
+                        self._emit(items, chunk[segment_start:pos])
+                        in_array = False
+                        self._array_depth = None
+                        self._done = True
+                        return items
+                    self._depth -= 1
+                elif char == 0x2C and self._depth == self._array_depth:  # element separator
+                    self._emit(items, chunk[segment_start:pos])
+                    segment_start = pos + 1
+                continue
+
+            if char == 0x3A and self._depth == 1:  # colon after a top-level key
+                self._expect_array = self._last_key == self.key
+            elif char == 0x5B and self._depth == 1 and self._expect_array:
+                self._depth += 1
+                self._array_depth = self._depth
+                in_array = True
+                segment_start = pos + 1
+            elif char in (0x5B, 0x7B):
+                self._depth += 1
+                self._expect_array = False
+            elif char in (0x5D, 0x7D):
+                self._depth -= 1
+            elif char == 0x2C:
+                self._expect_array = False
+
+        if in_array:
+            self._element += chunk[segment_start:]
+        elif self._in_string and self._depth == 1:
+            self._string += chunk[string_start:]
+        return items
+
+    def _emit(self, items: List[object], tail: bytes) -> None:
+        self._element += tail
+        if self._element.strip():
+            items.append(json.loads(self._element))
+        self._element.clear()
+
+    @property
+    def finished(self) -> bool:
+        """
+        True once the closing bracket of the target array has been seen.
+        """
+        return self._done
@@ -0,0 +1,111 @@
+import atexit
+import copy
+import itertools
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Optional
+
+from src.config.settings import settings
+
+LOG_FORMAT = '[%(levelname)s] %(asctime)s - %(name)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_success_counter = itertools.count()
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves all formatting to the listener's thread.
+
+    The stock prepare() formats each record where it is logged (interpolating its arguments,
+    rendering PayloadSummary, formatting tracebacks) so that it could be pickled to another
+    process. This queue never leaves the process, so records are queued as they are and the
+    logging call only pays for a copy. The flip side: objects passed as arguments are rendered
+    later and must not be mutated after the call.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+
+def configure_logging(level: str = None, stream=None) -> None:
+    """
+    Configure process-wide logging once. Safe to call repeatedly; only the first call has an effect.
+
+    Records are queued unformatted by a DeferredQueueHandler on the calling thread; a background
+    QueueListener formats them and writes them to stderr, so request handlers pay neither for
+    message formatting nor for log I/O.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(stream or sys.stderr)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel((level or settings.LOG_LEVEL).upper())
+    # Per-request INFO lines from the HTTP stack would defeat success sampling.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+class PayloadSummary:
+    """
+    Lazy, bounded description of a response payload for log messages.
+
+    Nothing is computed unless the record is actually formatted, and the result never exceeds
+    LOG_PAYLOAD_MAX characters: large lists are reported by length, not by content.
+    """
+    __slots__ = ("payload",)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        text = _describe(self.payload, depth=0)
+        limit = settings.LOG_PAYLOAD_MAX
+        return text if len(text) <= limit else text[:limit - 3] + "..."
+
+    __repr__ = __str__
+
+
+def summarize(payload) -> PayloadSummary:
+    """
+    Wrap a payload for logging, e.g. logger.info("Fetched: %s", summarize(data)).
+    """
+    return PayloadSummary(payload)
+
+
+def _describe(value, depth: int) -> str:
+    if isinstance(value, dict):
+        if depth >= 2:
+            return f"{{...{len(value)} keys}}"
+        items = list(itertools.islice(value.items(), 8))
+        body = ", ".join(f"{k}: {_describe(v, depth + 1)}" for k, v in items)
+        more = f", ...{len(value) - len(items)} more" if len(value) > len(items) else ""
+        return f"{{{body}{more}}}"
+    if isinstance(value, (list, tuple)):
+        return f"[{len(value)} items]"
+    if isinstance(value, str) and len(value) > 64:
+        return repr(value[:61] + "...")
+    return repr(value)
+
+
+def log_success(logger: logging.Logger, msg: str, *args) -> None:
+    """
+    Log a successful-call message at INFO, keeping only one in LOG_SUCCESS_SAMPLE_EVERY calls.
+    Arguments are formatted lazily by the logging module, and only for the sampled calls.
+    """
+    every = settings.LOG_SUCCESS_SAMPLE_EVERY
+    if every <= 0 or next(_success_counter) % every:
+        return
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(msg, *args)
@@ -0,0 +1,250 @@
+import asyncio
+import bisect
+import functools
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond local hits to slow upstream calls.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Sharded:
+    """
+    Per-thread storage for a metric child. Each thread only ever writes its own shard, so the
+    hot path takes no lock; a lock is only taken the first time a thread touches the metric.
+    Readers sum the shards.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._shards: Dict[int, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def shard(self) -> List[float]:
+        ident = threading.get_ident()
+        shard = self._shards.get(ident)
+        if shard is None:
+            with self._lock:
+                shard = self._shards.setdefault(ident, [0.0] * self._size)
+        return shard
+
+    def totals(self) -> List[float]:
+        totals = [0.0] * self._size
+        for shard in list(self._shards.values()):
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class CounterChild(_Sharded):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.shard()[0] += amount
+
+    def value(self) -> float:
+        return self.totals()[0]
+
+
+class GaugeChild(_Sharded):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.shard()[0] += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.shard()[0] -= amount
+
+    def value(self) -> float:
+        return self.totals()[0]
+
+
+class HistogramChild(_Sharded):
+    def __init__(self, buckets: Sequence[float]):
+        # Layout: one slot per bucket, +Inf slot, then sum.
+        super().__init__(len(buckets) + 2)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float) -> None:
+        shard = self.shard()
+        shard[bisect.bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+
+class Metric:
+    """
+    A named metric family with fixed label names; children are created per label value tuple.
+    """
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _label_text(self, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def expose(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._expose_child(values, child))
+        return lines
+
+    def _expose_child(self, values, child) -> List[str]:
+        return [f"{self.name}{self._label_text(values)} {_number(child.value())}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return CounterChild()
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return GaugeChild()
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return HistogramChild(self.buckets)
+
+    def _expose_child(self, values, child) -> List[str]:
+        totals = child.totals()
+        lines, cumulative = [], 0.0
+        for bound, count in zip(self.buckets + (math.inf,), totals[:-1]):
+            cumulative += count
+            le = 'le="%s"' % ("+Inf" if bound == math.inf else _number(bound))
+            lines.append(f"{self.name}_bucket{self._label_text(values, le)} {_number(cumulative)}")
+        lines.append(f"{self.name}_sum{self._label_text(values)} {_number(totals[-1])}")
+        lines.append(f"{self.name}_count{self._label_text(values)} {_number(cumulative)}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Registry:
+    """
+    Holds every metric of the process and renders them in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def expose(self) -> str:
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.expose())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+CALL_DURATION = REGISTRY.register(Histogram(
+    "chronos_call_duration_seconds", "Latency of orchestrator and API client calls.", ("component", "method")))
+CALL_ERRORS = REGISTRY.register(Counter(
+    "chronos_call_errors_total", "Failed orchestrator and API client calls by exception type.",
+    ("component", "method", "error_type")))
+CALLS_IN_FLIGHT = REGISTRY.register(Gauge(
+    "chronos_calls_in_flight", "Orchestrator and API client calls currently in progress.", ("component", "method")))
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    "chronos_cache_requests_total", "Cache lookups by outcome (hit, stale, miss, negative).", ("cache", "result")))
+
+
+def instrumented(component: str) -> Callable:
+    """
+    Decorator recording latency, in-flight count and errors of a sync or async method
+    under the given component and the method's name.
+    """
+    def decorator(fn: Callable) -> Callable:
+        method = fn.__name__
+        duration = CALL_DURATION.labels(component, method)
+        in_flight = CALLS_IN_FLIGHT.labels(component, method)
+
+        def record_error(e: BaseException) -> None:
+            CALL_ERRORS.labels(component, method, type(e).__name__).inc()
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                in_flight.inc()
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception as e:
+                    record_error(e)
+                    raise
+                finally:
+                    duration.observe(time.perf_counter() - started)
+                    in_flight.dec()
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            in_flight.inc()
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                record_error(e)
+                raise
+            finally:
+                duration.observe(time.perf_counter() - started)
+                in_flight.dec()
+        return wrapper
+    return decorator
+
+
+def cache_result(cache: str, result: str) -> None:
+    """
+    Count one cache lookup with the given outcome.
+    """
+    CACHE_REQUESTS.labels(cache, result).inc()
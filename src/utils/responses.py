@@ -0,0 +1,35 @@
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode plain JSON data (dicts, lists, numbers, strings) to compact UTF-8 bytes,
+    using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response that serializes its content exactly once.
+
+    Pydantic models are dumped straight to bytes by their compiled serializer; any other
+    content goes through dumps(). Routes should return this response directly, so FastAPI
+    skips jsonable_encoder and the stdlib json pass it otherwise applies to plain returns.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        return dumps(content)
@@ -0,0 +1,300 @@
+import fcntl
+import hashlib
+import json
+import logging
+import mmap
+import os
+import stat
+import struct
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from src.config.settings import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"CHRSHM01"
+# File header: magic, slot count, slot size.
+_HEADER = struct.Struct("<8sII")
+_HEADER_SIZE = 64
+# Slot header: sequence, key hash, stored_at, lease_until, lease_owner, payload length.
+_SLOT = struct.Struct("<QQddII")
+_SEQ = struct.Struct("<Q")
+_LEASE = struct.Struct("<dI")
+_LEASE_OFFSET = 24
+_SLOT_HEADER_SIZE = 48
+_READ_ATTEMPTS = 64
+_OPEN_ATTEMPTS = 8
+
+_store: Optional["SharedStore"] = None
+_store_opened = False
+
+
+@dataclass(frozen=True)
+class SharedValue:
+    """
+    A value read from the shared store together with its age in seconds.
+    """
+    value: object
+    age: float
+
+
+class SharedStore:
+    """
+    Key/value store in a memory-mapped file, shared by every worker process on the host.
+
+    The file is a fixed array of slots and each key maps to one slot by hash, so a colliding
+    key simply replaces the previous one. Readers take no lock: every slot carries a sequence
+    number that writers make odd while they write, and a reader retries until it sees the same
+    even number before and after copying the slot. Writers serialize on a per-slot fcntl
+    record lock, which the kernel releases if a worker dies mid-write.
+
+    Leases let workers agree that only one of them refreshes a key at a time.
+
+    Values are stored as JSON, never pickled, and the file must belong to the current user
+    and be inaccessible to anyone else, so another local user cannot plant data in it.
+    """
+
+    def __init__(self, path: str, slots: int, slot_size: int):
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self._pid = os.getpid()
+        self._fd = self._open(_HEADER_SIZE + slots * slot_size)
+        try:
+            self._map = mmap.mmap(self._fd, _HEADER_SIZE + slots * slot_size)
+        except Exception:
+            os.close(self._fd)
+            raise
+
+    def _open(self, size: int) -> int:
+        header = _HEADER.pack(_MAGIC, self.slots, self.slot_size)
+        for _ in range(_OPEN_ATTEMPTS):
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+            try:
+                _check_private(fd, self.path)
+                fcntl.lockf(fd, fcntl.LOCK_EX, _HEADER_SIZE, 0)
+                if not _same_file(fd, self.path):
+                    # Replaced by another process between open and lock: use the new file.
+                    os.close(fd)
+                    continue
+                info = os.fstat(fd)
+                if info.st_size == 0:
+                    # Brand new: nobody can have mapped an empty file, so it is sized in place.
+                    os.ftruncate(fd, size)
+                    os.pwrite(fd, header, 0)
+                elif info.st_size < size or os.pread(fd, _HEADER.size, 0) != header:
+                    # Laid out for another configuration. Workers may still have it mapped, and
+                    # shrinking it under them would SIGBUS them: start over in a new file instead.
+                    replacement = self._replace(size, header)
+                    os.close(fd)
+                    return replacement
+                fcntl.lockf(fd, fcntl.LOCK_UN, _HEADER_SIZE, 0)
+                return fd
+            except BaseException:
+                os.close(fd)
+                raise
+        raise OSError(f"Shared store {self.path} kept being replaced while opening it")
+
+    def _replace(self, size: int, header: bytes) -> int:
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(temporary, os.O_RDWR | os.O_CREAT | os.O_EXCL | os.O_NOFOLLOW, 0o600)
+        try:
+            os.ftruncate(fd, size)
+            os.pwrite(fd, header, 0)
+            os.rename(temporary, self.path)
+        except BaseException:
+            os.close(fd)
+            try:
+                os.unlink(temporary)
+            except OSError:
+                pass
+            raise
+        logger.warning("Shared store %s had a different layout; replaced it with an empty one", self.path)
+        return fd
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        # Python's hash() is salted per process; every worker must agree on the slot.
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little") or 1
+
+    def _offset(self, key_hash: int) -> int:
+        return _HEADER_SIZE + (key_hash % self.slots) * self.slot_size
+
+    def get(self, key: str) -> Optional[SharedValue]:
+        """
+        Read key without locking. Returns None if the key is absent or the slot kept changing.
+        """
+        key_hash = self._hash(key)
+        offset = self._offset(key_hash)
+        m = self._map
+        for _ in range(_READ_ATTEMPTS):
+            seq, slot_hash, stored_at, _, _, length = _SLOT.unpack_from(m, offset)
+            if seq & 1:
+                continue
+            if slot_hash != key_hash or length == 0:
+                payload = None
+            else:
+                start = offset + _SLOT_HEADER_SIZE
+                payload = m[start:start + length]
+            if _SEQ.unpack_from(m, offset)[0] != seq:
+                continue
+            if payload is None:
+                return None
+            return SharedValue(_loads(payload), max(0.0, time.time() - stored_at))
+        return None
+
+    def put(self, key: str, value: object) -> bool:
+        """
+        Store value under key. Returns False if the value does not fit in a slot or is not
+        plain JSON data (tuples are read back as lists).
+        """
+        try:
+            payload = _dumps(value)
+        except (TypeError, ValueError) as e:
+            logger.warning("Value for %r cannot be shared: %s", key, e)
+            return False
+        if len(payload) > self.slot_size - _SLOT_HEADER_SIZE:
+            logger.warning("Value for %r is %s bytes, larger than a shared cache slot; not shared",
+                           key, len(payload))
+            return False
+        key_hash = self._hash(key)
+        offset = self._offset(key_hash)
+        m = self._map
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, self.slot_size, offset)
+        try:
+            seq, slot_hash, _, lease_until, lease_owner, _ = _SLOT.unpack_from(m, offset)
+            if slot_hash != key_hash:
+                lease_until, lease_owner = 0.0, 0
+            # A writer that died mid-write leaves the sequence odd; normalize before bumping.
+            writing = (seq | 1) + 2 if seq & 1 else seq + 1
+            _SEQ.pack_into(m, offset, writing)
+            start = offset + _SLOT_HEADER_SIZE
+            m[start:start + len(payload)] = payload
+            _SLOT.pack_into(m, offset, writing, key_hash, time.time(), lease_until, lease_owner, len(payload))
+            _SEQ.pack_into(m, offset, writing + 1)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, self.slot_size, offset)
+        return True
+
+    def acquire_lease(self, key: str, duration: float) -> bool:
+        """
+        Try to become the one worker allowed to refresh key for the next duration seconds.
+        Succeeds if nobody holds the lease, it has expired, or this process already holds it.
+        """
+        key_hash = self._hash(key)
+        offset = self._offset(key_hash)
+        m = self._map
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, self.slot_size, offset)
+        try:
+            _, slot_hash, _, lease_until, lease_owner, _ = _SLOT.unpack_from(m, offset)
+            now = time.time()
+            if slot_hash == key_hash and lease_owner != self._pid and lease_until > now:
+                return False
+            if slot_hash != key_hash:
+                # Claim the slot for this key; readers see an empty value until put().
+                seq = _SEQ.unpack_from(m, offset)[0]
+                writing = (seq | 1) + 2 if seq & 1 else seq + 1
+                _SEQ.pack_into(m, offset, writing)
+                _SLOT.pack_into(m, offset, writing, key_hash, 0.0, 0.0, 0, 0)
+                _SEQ.pack_into(m, offset, writing + 1)
+            _LEASE.pack_into(m, offset + _LEASE_OFFSET, now + duration, self._pid)
+            return True
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, self.slot_size, offset)
+
+    def lease_held(self, key: str) -> bool:
+        """
+        Whether some process currently holds an unexpired lease on key. Read without locking.
+        """
+        key_hash = self._hash(key)
+        offset = self._offset(key_hash)
+        _, slot_hash, _, lease_until, lease_owner, _ = _SLOT.unpack_from(self._map, offset)
+        return slot_hash == key_hash and lease_owner != 0 and lease_until > time.time()
+
+    def release_lease(self, key: str) -> None:
+        """
+        Give up a lease held by this process.
+        """
+        key_hash = self._hash(key)
+        offset = self._offset(key_hash)
+        m = self._map
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, self.slot_size, offset)
+        try:
+            _, slot_hash, _, _, lease_owner, _ = _SLOT.unpack_from(m, offset)
+            if slot_hash == key_hash and lease_owner == self._pid:
+                _LEASE.pack_into(m, offset + _LEASE_OFFSET, 0.0, 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, self.slot_size, offset)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+def _dumps(value: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, allow_nan=False, separators=(",", ":")).encode()
+
+
+def _loads(payload: bytes) -> object:
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
+
+
+def _check_private(fd: int, path: str) -> None:
+    info = os.fstat(fd)
+    if info.st_uid != os.geteuid() or info.st_mode & 0o077 or not stat.S_ISREG(info.st_mode):
+        raise PermissionError(f"{path} must be a regular file owned by uid {os.geteuid()} with mode 0600")
+
+
+def _same_file(fd: int, path: str) -> bool:
+    try:
+        current = os.stat(path, follow_symlinks=False)
+    except FileNotFoundError:
+        return False
+    info = os.fstat(fd)
+    return (info.st_dev, info.st_ino) == (current.st_dev, current.st_ino)
+
+
+def _default_path() -> str:
+    # A per-user 0700 directory: a fixed path in a world-writable directory could be created
+    # first by another user.
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    directory = os.path.join(base, f"chronos_orchestrator-{os.geteuid()}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.geteuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{directory} must be a directory owned by uid {os.geteuid()} with mode 0700")
+    return os.path.join(directory, "cache")
+
+
+def get_shared_store() -> Optional[SharedStore]:
+    """
+    Return the process's handle on the host-wide shared store, opening it on first use.
+    Returns None when SHARED_CACHE_ENABLED is off or the store cannot be opened, in which
+    case callers keep caching per process.
+    """
+    global _store, _store_opened
+    if not _store_opened:
+        _store_opened = True
+        if settings.SHARED_CACHE_ENABLED:
+            path = settings.SHARED_CACHE_PATH
+            try:
+                path = path or _default_path()
+                _store = SharedStore(path, settings.SHARED_CACHE_SLOTS, settings.SHARED_CACHE_SLOT_SIZE)
+                logger.info("Shared cache attached at %s (%s slots of %s bytes)",
+                            path, settings.SHARED_CACHE_SLOTS, settings.SHARED_CACHE_SLOT_SIZE)
+            except OSError as e:
+                logger.warning("Shared cache unavailable at %s, caching per process: %s", path, e)
+    return _store
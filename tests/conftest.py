@@ -0,0 +1,11 @@
+import asyncio
+import inspect
+
+
+def pytest_pyfunc_call(pyfuncitem):
+    # Coroutine tests run on a fresh event loop each; pytest-asyncio is not a dependency.
+    if inspect.iscoroutinefunction(pyfuncitem.obj):
+        arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+        asyncio.run(pyfuncitem.obj(**arguments))
+        return True
+    return None
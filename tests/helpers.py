@@ -0,0 +1,19 @@
+import asyncio
+from typing import Callable
+
+
+def factory(build: Callable, *args, **defaults) -> Callable:
+    """
+    Return a function calling build(*args, **defaults), where each call may override defaults.
+    """
+    def make(**overrides):
+        return build(*args, **{**defaults, **overrides})
+    return make
+
+
+async def settle(rounds: int = 5) -> None:
+    """
+    Let tasks scheduled on the running loop take a few steps.
+    """
+    for _ in range(rounds):
+        await asyncio.sleep(0)
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from src.utils.admission import AdmissionController, AdmissionRejected, parse_limits
+from tests.helpers import factory
+
+make_controller = factory(AdmissionController, max_concurrency=2, target_delay=0.005, interval=0.02, max_wait=1.0,
+                          max_queue=10, route_limits={})
+
+
+async def test_requests_run_immediately_under_the_limits():
+    controller = make_controller()
+    await controller.acquire("balance")
+    await controller.acquire("status")
+    snapshot = controller.snapshot()
+    controller.release("balance")
+    controller.release("status")
+    assert snapshot["active"] == 2
+    assert snapshot["routes"]["balance"]["active"] == 1
+    assert controller.snapshot()["active"] == 0
+
+
+async def test_freed_slots_go_to_the_most_important_waiter():
+    controller = make_controller(max_concurrency=1)
+    order = []
+
+    async def request(route):
+        async with controller.slot(route):
+            order.append(route)
+            await asyncio.sleep(0)
+
+    await controller.acquire("status")
+    waiters = [asyncio.ensure_future(request(route)) for route in ("insights", "status", "balance", "transaction")]
+    await asyncio.sleep(0)
+    controller.release("status")
+    await asyncio.gather(*waiters)
+    assert order == ["transaction", "balance", "status", "insights"]
+
+
+async def test_route_limit_does_not_block_other_routes():
+    controller = make_controller(max_concurrency=4, route_limits={"status": 1})
+    await controller.acquire("status")
+    blocked = asyncio.ensure_future(controller.acquire("status"))
+    await controller.acquire("balance")
+    await asyncio.sleep(0)
+    assert controller.snapshot()["queued"]["low"] == 1
+    controller.release("status")
+    await blocked
+
+
+async def test_full_queue_rejects_with_429():
+    controller = make_controller(max_concurrency=1, max_queue=1)
+    await controller.acquire("ledger")
+    waiter = asyncio.ensure_future(controller.acquire("ledger"))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("ledger")
+    waiter.cancel()
+    await asyncio.gather(waiter, return_exceptions=True)
+    assert (rejected.value.status_code, rejected.value.reason) == (429, "queue_full")
+    assert controller.snapshot()["queued"]["normal"] == 0
+
+
+async def test_waiting_past_max_wait_is_rejected_with_503():
+    controller = make_controller(max_concurrency=1, max_wait=0.01)
+    await controller.acquire("time")
+    with pytest.raises(AdmissionRejected) as rejected:
+        await controller.acquire("time")
+    assert (rejected.value.status_code, rejected.value.reason) == (503, "timeout")
+    snapshot = controller.snapshot()
+    assert snapshot["queued"]["normal"] == 0 and snapshot["active"] == 1
+
+
+async def test_sustained_queueing_delay_sheds_low_priority_but_not_critical():
+    controller = make_controller(max_concurrency=1, max_wait=5.0)
+    await controller.acquire("transaction")
+    outcomes = {}
+
+    async def request(name, route):
+        try:
+            await controller.acquire(route)
+        except AdmissionRejected as e:
+            outcomes[name] = e.status_code
+            return
+        outcomes[name] = "admitted"
+        await asyncio.sleep(0.03)   # Hold the slot long enough for the next waiter to exceed the target
+        controller.release(route)
+
+    tasks = [asyncio.ensure_future(request(f"status{i}", "status")) for i in range(4)]
+    tasks += [asyncio.ensure_future(request(f"tx{i}", "transaction")) for i in range(2)]
+    await asyncio.sleep(0.03)
+    controller.release("transaction")
+    await asyncio.gather(*tasks)
+    assert outcomes["tx0"] == outcomes["tx1"] == "admitted"
+    assert 503 in [outcomes[f"status{i}"] for i in range(4)]
+
+
+def test_parse_limits():
+    assert parse_limits("balance=64, status=4") == {"balance": 64, "status": 4}
+    assert parse_limits("") == {}
+    for spec in ("unknown=1", "balance=-1", "balance"):
+        with pytest.raises(ValueError):
+            parse_limits(spec)
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from src.utils.cache import IdempotencyCache, IdempotencyConflictError, SWRCache
+from tests.helpers import factory, settle
+
+
+class Loader:
+    """
+    Counts its calls; each call returns (or raises) the next queued result, the last one repeating.
+    """
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+make_cache = factory(SWRCache, "test", ttl=10, max_stale=10, negative_ttl=5, max_entries=100)
+make_submissions = factory(IdempotencyCache, "test", ttl=60, max_entries=10)
+
+
+def age(cache: SWRCache, key, seconds: float) -> None:
+    # Backdate an entry instead of sleeping through its TTL.
+    entry = cache._entries[key]
+    entry.fetched_at -= seconds
+    entry.retry_at -= seconds
+
+
+async def test_swr_fresh_values_are_served_from_cache():
+    cache, loader = make_cache(), Loader("v1")
+    assert (await cache.get("k", loader)).value == "v1"
+    assert (await cache.get("k", loader)).value == "v1"
+    assert loader.calls == 1
+
+
+async def test_swr_concurrent_misses_share_one_load():
+    cache, loader = make_cache(), Loader("v1")
+    results = await asyncio.gather(*(cache.get("k", loader) for _ in range(5)))
+    assert [result.value for result in results] == ["v1"] * 5
+    assert loader.calls == 1
+
+
+async def test_swr_stale_value_is_served_while_refreshing():
+    cache, loader = make_cache(), Loader("v1", "v2")
+    await cache.get("k", loader)
+    age(cache, "k", 15)
+    stale = await cache.get("k", loader)
+    assert stale.value == "v1" and stale.age >= 15
+    await settle()
+    fresh = await cache.get("k", loader)
+    assert fresh.value == "v2" and fresh.age < 1
+    assert loader.calls == 2
+
+
+async def test_swr_expired_value_is_reloaded():
+    cache, loader = make_cache(), Loader("v1", "v2")
+    await cache.get("k", loader)
+    age(cache, "k", 25)
+    assert (await cache.get("k", loader)).value == "v2"
+
+
+async def test_swr_errors_are_cached_for_negative_ttl():
+    cache, loader = make_cache(), Loader(RuntimeError("down"), "v1")
+    for _ in range(2):
+        with pytest.raises(RuntimeError, match="down"):
+            await cache.get("k", loader)
+    assert loader.calls == 1
+    age(cache, "k", 6)
+    assert (await cache.get("k", loader)).value == "v1"
+
+
+async def test_swr_failed_refresh_keeps_serving_stale_value():
+    cache, loader = make_cache(), Loader("v1", RuntimeError("down"))
+    await cache.get("k", loader)
+    age(cache, "k", 15)
+    await cache.get("k", loader)
+    await settle()
+    assert (await cache.get("k", loader)).value == "v1"
+    assert loader.calls == 2
+
+
+async def test_swr_cancelled_caller_does_not_cancel_the_load():
+    cache, loader = make_cache(), Loader("v1")
+    caller = asyncio.ensure_future(cache.get("k", loader))
+    await asyncio.sleep(0)
+    caller.cancel()
+    await settle()
+    assert (await cache.get("k", loader)).value == "v1"
+    assert loader.calls == 1
+
+
+async def test_swr_evicts_least_recently_used():
+    cache = make_cache(max_entries=2)
+    for key in ("a", "b", "a", "c"):
+        await cache.get(key, Loader(key))
+    assert sorted(cache._entries) == ["a", "c"]
+
+
+async def test_idempotency_duplicates_share_one_submission():
+    cache, submit = make_submissions(), Loader({"id": 1})
+    results = await asyncio.gather(*(cache.run("key", "fp", submit) for _ in range(3)))
+    assert results == [{"id": 1}] * 3
+    assert await cache.run("key", "fp", submit) == cache.get("key", "fp") == {"id": 1}
+    assert submit.calls == 1
+
+
+async def test_idempotency_key_reuse_with_other_content_conflicts():
+    cache = make_submissions()
+    await cache.run("key", "fp", Loader("ok"))
+    with pytest.raises(IdempotencyConflictError):
+        await cache.run("key", "other", Loader("ok"))
+    with pytest.raises(IdempotencyConflictError):
+        cache.get("key", "other")
+
+
+async def test_idempotency_failures_are_not_remembered():
+    cache, submit = make_submissions(), Loader(RuntimeError("down"), "ok")
+    with pytest.raises(RuntimeError):
+        await cache.run("key", "fp", submit)
+    assert await cache.run("key", "fp", submit) == "ok"
+    assert submit.calls == 2
+
+
+async def test_idempotency_submission_survives_a_cancelled_caller():
+    cache, submit = make_submissions(), Loader("ok")
+    caller = asyncio.ensure_future(cache.run("key", "fp", submit))
+    await asyncio.sleep(0)
+    caller.cancel()
+    assert await cache.run("key", "fp", submit) == "ok"
+    assert submit.calls == 1
+
+
+def test_idempotency_results_expire_and_are_bounded():
+    cache = make_submissions(max_entries=2)
+    for key, result in (("a", 1), ("b", 2), ("c", 3)):
+        cache.remember(key, "fp", result)
+    assert (cache.get("a", "fp"), cache.get("c", "fp"), len(cache)) == (None, 3, 2)
+    cache._entries["c"].expires_at -= 61
+    assert cache.get("c", "fp") is None
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from src.orchestrator.coalescing import CoalescingLoader
+from tests.helpers import factory, settle
+
+
+class Batches:
+    """
+    Batch function recording each batch; keys starting with "bad" fail alone.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def __call__(self, keys: list) -> dict:
+        self.calls.append(sorted(keys))
+        await self.gate.wait()
+        return {key: ValueError(key) if key.startswith("bad") else key.upper() for key in keys if key != "missing"}
+
+
+@pytest.fixture
+def batches():
+    return Batches()
+
+
+@pytest.fixture
+def make_loader(batches):
+    return factory(CoalescingLoader, "test", batch_fn=batches, window=0.01, max_batch_size=10)
+
+
+async def test_concurrent_lookups_share_one_batch(make_loader, batches):
+    loader = make_loader()
+    results = await asyncio.gather(*(loader.load(key) for key in ("a", "b", "a", "c", "a")))
+    assert results == ["A", "B", "A", "C", "A"]
+    assert batches.calls == [["a", "b", "c"]]
+
+
+async def test_full_batch_is_flushed_without_waiting(make_loader, batches):
+    loader = make_loader(window=60, max_batch_size=2)
+    assert await asyncio.gather(loader.load("a"), loader.load("b")) == ["A", "B"]
+    assert batches.calls == [["a", "b"]]
+
+
+async def test_failures_are_returned_per_key(make_loader):
+    loader = make_loader()
+    results = await loader.load_many(["a", "bad", "missing", "a"])
+    assert list(results) == ["a", "bad", "missing"]
+    assert results["a"] == "A"
+    assert isinstance(results["bad"], ValueError) and isinstance(results["missing"], LookupError)
+
+
+async def test_failing_batch_function_fails_every_caller(make_loader):
+    async def broken(keys):
+        return list(keys)
+
+    loader = make_loader(batch_fn=broken)
+    results = await loader.load_many(["a", "b"])
+    assert all(isinstance(result, TypeError) for result in results.values())
+
+
+async def test_cancelled_caller_does_not_cancel_the_lookup(make_loader, batches):
+    loader = make_loader()
+    batches.gate.clear()
+    impatient, patient = asyncio.ensure_future(loader.load("a")), asyncio.ensure_future(loader.load("a"))
+    await asyncio.sleep(0.02)
+    impatient.cancel()
+    batches.gate.set()
+    assert await patient == "A"
+
+
+async def test_stop_answers_every_waiting_caller(make_loader, batches):
+    loader = make_loader(window=60, max_batch_size=2)
+    batches.gate.clear()
+    # "a" and "b" form a batch stuck upstream; "c" still waits for the window.
+    callers = [asyncio.ensure_future(loader.load(key)) for key in ("a", "b", "c")]
+    await settle()
+    assert batches.calls == [["a", "b"]]
+    await loader.stop()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert loader._in_flight == {} and not loader._batches
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from src.utils.json_stream import JsonArrayStream
+
+BLOCKS = [
+    {"index": 0, "transactions": []},
+    {"index": 1, "transactions": [{"sender": "a\\\"]}", "receiver": "b,[{", "amount": 1.5}]},
+    {"index": 2, "nested": [[1, 2], {"chain": [3]}], "text": "tab\té \\"},
+]
+DOCUMENT = json.dumps({"meta": {"chain": ["decoy"]}, "label": "chain", "chain": BLOCKS, "length": 3}).encode()
+
+
+def parse(chunks) -> list:
+    parser = JsonArrayStream("chain")
+    items = []
+    for chunk in chunks:
+        items.extend(parser.feed(chunk))
+    assert parser.finished
+    return items
+
+
+def test_whole_document():
+    assert parse([DOCUMENT]) == BLOCKS
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_any_chunking_gives_the_same_elements(size):
+    chunks = [DOCUMENT[i:i + size] for i in range(0, len(DOCUMENT), size)]
+    assert parse(chunks) == BLOCKS
+
+
+def test_every_split_point():
+    # Splits inside escapes, keys and between a backslash and the byte it escapes.
+    for split in range(1, len(DOCUMENT)):
+        assert parse([DOCUMENT[:split], DOCUMENT[split:]]) == BLOCKS
+
+
+def test_elements_are_returned_as_soon_as_complete():
+    parser = JsonArrayStream("chain")
+    first = json.dumps(BLOCKS[0]).encode()
+    assert parser.feed(b'{"chain": [' + first + b", ") == [BLOCKS[0]]
+    assert parser.feed(b'{"index": 1') == []
+    assert parser.feed(b'}]') == [{"index": 1}]
+    assert parser.finished
+    assert parser.feed(b', "length": 2}') == []
+
+
+def test_empty_and_missing_arrays():
+    assert parse([b'{"chain": [], "length": 0}']) == []
+    parser = JsonArrayStream("chain")
+    assert parser.feed(b'{"blocks": [1, 2]}') == []
+    assert not parser.finished
+
+
+def test_scalar_elements():
+    assert parse([b'{"chain": [1, "two", null, true, 2.5]}']) == [1, "two", None, True, 2.5]
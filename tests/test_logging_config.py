@@ -0,0 +1,59 @@
+import io
+import logging
+import logging.handlers
+import queue
+import threading
+
+from src.config.settings import settings
+from src.utils.logging_config import DeferredQueueHandler, log_success, summarize
+
+
+class Rendered:
+    """
+    Log argument that records the threads it was rendered on.
+    """
+
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self) -> str:
+        self.threads.append(threading.current_thread().name)
+        return "rendered"
+
+
+def test_records_are_formatted_on_the_listener_thread():
+    log_queue = queue.SimpleQueue()
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    logger = logging.getLogger("tests.deferred")
+    logger.propagate = False
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    argument = Rendered()
+    try:
+        logger.warning("value: %s", argument)
+        assert argument.threads == []   # Queued unformatted
+        listener.start()
+    finally:
+        listener.stop()
+        logger.handlers.clear()
+    assert stream.getvalue() == "WARNING value: rendered\n"
+    assert argument.threads and threading.main_thread().name not in argument.threads
+
+
+def test_payload_summaries_are_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "LOG_PAYLOAD_MAX", 40)
+    assert str(summarize({"chain": list(range(10 ** 5)), "length": 10 ** 5})) == "{chain: [100000 items], length: 100000}"
+    assert str(summarize({"nested": {"deeper": {"deepest": 1}}})) == "{nested: {deeper: {...1 keys}}}"
+    long = str(summarize({f"k{i}": "x" * 100 for i in range(20)}))
+    assert len(long) == 40 and long.endswith("...")
+
+
+def test_success_logs_are_sampled(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "LOG_SUCCESS_SAMPLE_EVERY", 10)
+    logger = logging.getLogger("tests.sampled")
+    with caplog.at_level(logging.INFO, logger="tests.sampled"):
+        for i in range(100):
+            log_success(logger, "call %s", i)
+    assert len(caplog.records) == 10
@@ -0,0 +1,58 @@
+import pytest
+
+from src.storage.metric_series import MetricSeries, parse_tiers
+
+NOW = 1_000_000.0
+
+
+def make_series() -> MetricSeries:
+    # 1s buckets for 60s, 10s buckets for an hour.
+    series = MetricSeries([(1.0, 60), (10.0, 360)], max_fields=4)
+    for second in range(120):
+        series.add(NOW - 119 + second, {"tps": float(second), "online": True, "label": "x"})
+    return series
+
+
+def test_query_aggregates_the_finest_covering_tier():
+    result = make_series().query(NOW - 10, NOW + 1, now=NOW)
+    tps = result["fields"]["tps"]
+    assert result["resolution"] == 1.0
+    assert list(result["fields"]) == ["tps"]   # Booleans and strings are not recorded
+    assert tps["count"] == 11
+    assert (tps["min"], tps["max"], tps["avg"]) == (109.0, 119.0, 114.0)
+    assert [point[0] for point in tps["points"]] == [NOW - 10 + i for i in range(11)]
+
+
+def test_older_ranges_use_a_coarser_tier():
+    result = make_series().query(NOW - 100, NOW + 1, now=NOW)
+    assert result["resolution"] == 10.0
+    assert result["fields"]["tps"]["count"] == 101
+
+
+def test_query_range_is_clamped_to_the_ring():
+    series = make_series()
+    # Far outside the stored range: answered from the buckets that exist, with bounded work.
+    everything = series.query(-1e15, 1e15, now=NOW, resolution=1.0)
+    assert everything["fields"]["tps"]["count"] == 60
+    assert everything["since"] == -1e15 and everything["until"] == 1e15
+    future = series.query(NOW + 1000, NOW + 2000, now=NOW)
+    assert future["fields"]["tps"]["count"] == 0 and future["fields"]["tps"]["points"] == []
+    empty = series.query(NOW, NOW - 10, now=NOW)
+    assert empty["fields"]["tps"]["avg"] is None
+
+
+@pytest.mark.parametrize("since, until", [(float("nan"), NOW), (0.0, float("inf")), (-float("inf"), NOW)])
+def test_non_finite_bounds_are_rejected(since, until):
+    with pytest.raises(ValueError):
+        make_series().query(since, until, now=NOW)
+
+
+def test_fields_beyond_max_fields_are_ignored():
+    series = MetricSeries([(1.0, 10)], max_fields=2)
+    series.add(NOW, {"a": 1, "b": 2, "c": 3})
+    assert series.fields == ["a", "b"]
+    assert list(series.query(NOW - 5, NOW + 1, now=NOW, fields=["a", "c"])["fields"]) == ["a"]
+
+
+def test_parse_tiers():
+    assert parse_tiers("1:60,10:360") == [(1.0, 60), (10.0, 360)]
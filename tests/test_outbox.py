@@ -0,0 +1,183 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.config.settings import settings
+from src.orchestrator.outbox import FAILED, SUBMITTED, OutboxUnavailableError, TransactionOutbox
+from src.utils.cache import IdempotencyConflictError
+from tests.helpers import factory, settle
+
+
+class FakePipeline:
+    """
+    Records submissions in order; outcomes[amount] lists what successive attempts raise or
+    return (default: a record echoing the transaction).
+    """
+
+    def __init__(self, outcomes: dict = None):
+        self.outcomes = outcomes or {}
+        self.submitted = []
+
+    async def submit(self, transaction: dict) -> dict:
+        self.submitted.append(transaction["amount"])
+        await asyncio.sleep(0)
+        pending = self.outcomes.get(transaction["amount"])
+        if pending:
+            outcome = pending.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+        return {"transaction_id": f"tx-{transaction['amount']}"}
+
+
+def refused(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://blockchain/blockchain/transaction")
+    return httpx.HTTPStatusError("refused", request=request, response=httpx.Response(status, request=request))
+
+
+def transaction(amount: int, sender: str = "alice") -> dict:
+    return {"sender": sender, "receiver": "bob", "amount": amount, "timestamp": 1.0}
+
+
+@pytest.fixture(autouse=True)
+def quick_outbox(monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_RETRY_BASE", 0.001)
+    monkeypatch.setattr(settings, "OUTBOX_RETRY_MAX", 0.001)
+    monkeypatch.setattr(settings, "OUTBOX_STATUS_SLOTS", 64)
+
+
+@pytest.fixture
+def make_outbox(tmp_path):
+    return factory(TransactionOutbox, directory=str(tmp_path / "outbox"))
+
+
+async def accept(outbox: TransactionOutbox, amount: int, sender: str = "alice", key: str = None) -> dict:
+    return await outbox.accept(transaction(amount, sender), key or f"key-{amount}", f"fp-{amount}")
+
+
+async def until_settled(outbox: TransactionOutbox) -> None:
+    for _ in range(500):
+        if not outbox.pending:
+            return
+        await asyncio.sleep(0.001)
+    raise AssertionError(f"{outbox.pending} outbox entries never settled")
+
+
+async def test_accepted_transactions_are_submitted(make_outbox):
+    pipeline = FakePipeline()
+    outbox = make_outbox(pipeline=pipeline)
+    accepted = await accept(outbox, 1)
+    assert accepted["status"] == "accepted"
+    await until_settled(outbox)
+    status = outbox.status(accepted["transaction_id"])
+    assert status["status"] == SUBMITTED and status["record"] == {"transaction_id": "tx-1"}
+    assert pipeline.submitted == [1]
+    await outbox.stop()
+
+
+async def test_duplicate_keys_return_the_original_entry(make_outbox):
+    outbox = make_outbox(pipeline=FakePipeline())
+    first = await accept(outbox, 1)
+    assert (await accept(outbox, 1))["transaction_id"] == first["transaction_id"]
+    with pytest.raises(IdempotencyConflictError):
+        await outbox.accept(transaction(2), "key-1", "fp-2")
+    await outbox.stop()
+
+
+async def test_transient_failures_are_retried_and_refusals_settle_failed(make_outbox):
+    pipeline = FakePipeline({1: [refused(503), asyncio.TimeoutError()], 2: [refused(400)]})
+    outbox = make_outbox(pipeline=pipeline)
+    ok, bad = await accept(outbox, 1), await accept(outbox, 2)
+    await until_settled(outbox)
+    assert outbox.status(ok["transaction_id"])["attempts"] == 3
+    assert outbox.status(ok["transaction_id"])["status"] == SUBMITTED
+    assert outbox.status(bad["transaction_id"])["status"] == FAILED
+    # One sender's transactions go out in acceptance order, each after the previous settled.
+    assert pipeline.submitted == [1, 1, 1, 2]
+    await outbox.stop()
+
+
+async def test_unsettled_entries_are_resent_after_restart(make_outbox):
+    blocked = FakePipeline({1: [refused(503)] * 1000})
+    outbox = make_outbox(pipeline=blocked)
+    accepted = await accept(outbox, 1)
+    await asyncio.sleep(0.01)
+    await outbox.stop()
+
+    pipeline = FakePipeline()
+    restarted = make_outbox(pipeline=pipeline)
+    restarted.start()
+    await until_settled(restarted)
+    assert pipeline.submitted == [1]
+    assert restarted.status(accepted["transaction_id"])["status"] == SUBMITTED
+    await restarted.stop()
+
+    # Settled entries stay queryable and are not sent again.
+    again = make_outbox(pipeline=FakePipeline())
+    again.start()
+    assert again.pending == 0
+    assert again.status(accepted["transaction_id"])["status"] == SUBMITTED
+    await again.stop()
+
+
+async def test_workers_claim_separate_logs_and_share_statuses(make_outbox):
+    first, second = make_outbox(pipeline=FakePipeline()), make_outbox(pipeline=FakePipeline())
+    first.start()
+    second.start()
+    assert first.worker_directory != second.worker_directory
+    accepted = await accept(first, 1)
+    await until_settled(first)
+    assert second.status(accepted["transaction_id"])["status"] == SUBMITTED
+    await first.stop()
+    await second.stop()
+
+
+async def test_failed_compaction_does_not_stop_the_writer(make_outbox, monkeypatch):
+    outbox = make_outbox(pipeline=FakePipeline(), compact_bytes=1)
+    outbox.start()
+
+    def no_space(records):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(outbox._log, "rewrite", no_space)
+    for amount in range(1, 4):
+        await asyncio.wait_for(accept(outbox, amount), 1)
+    await until_settled(outbox)
+    assert not outbox._writer.done()
+    await outbox.stop()
+
+
+async def test_failed_commit_is_reported_and_forgotten(make_outbox, monkeypatch):
+    outbox = make_outbox(pipeline=FakePipeline())
+    outbox.start()
+
+    def disk_full(records):
+        raise OSError(28, "No space left on device")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(outbox._log, "append", disk_full)
+        with pytest.raises(OutboxUnavailableError):
+            await accept(outbox, 1)
+    # The key was never acknowledged, so a retry is accepted afresh.
+    assert (await accept(outbox, 1))["status"] == "accepted"
+    await outbox.stop()
+
+
+async def test_dead_writer_is_restarted_by_accept(make_outbox):
+    outbox = make_outbox(pipeline=FakePipeline())
+    outbox.start()
+    outbox._writer.cancel()
+    await settle()
+    assert (await asyncio.wait_for(accept(outbox, 1), 1))["status"] == "accepted"
+    await until_settled(outbox)
+    await outbox.stop()
+
+
+async def test_accept_after_stop_begins_is_refused(make_outbox):
+    outbox = make_outbox(pipeline=FakePipeline())
+    outbox.start()
+    stopping = asyncio.ensure_future(outbox.stop())
+    await asyncio.sleep(0)
+    with pytest.raises(OutboxUnavailableError):
+        await accept(outbox, 1)
+    await stopping
@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from src.storage.outbox_log import OutboxLog
+
+
+def test_records_survive_reopening(tmp_path):
+    path = str(tmp_path / "outbox.log")
+    log = OutboxLog(path)
+    log.append([{"id": 1}, {"id": 2}])
+    log.append([{"id": 3}])
+    log.close()
+
+    reopened = OutboxLog(path)
+    assert reopened.records() == [{"id": 1}, {"id": 2}, {"id": 3}]
+    assert reopened.records() == []
+    reopened.close()
+
+
+def test_torn_tail_is_truncated_on_open(tmp_path):
+    path = str(tmp_path / "outbox.log")
+    log = OutboxLog(path)
+    log.append([{"id": 1}])
+    intact = log.size
+    log.append([{"id": 2, "payload": "x" * 100}])
+    log.close()
+    # A crash in the middle of the second record.
+    os.truncate(path, intact + 20)
+
+    recovered = OutboxLog(path)
+    assert recovered.records() == [{"id": 1}]
+    assert recovered.size == os.path.getsize(path) == intact
+    # New records go after the last intact one and are readable again.
+    recovered.append([{"id": 3}])
+    recovered.close()
+    assert OutboxLog(path).records() == [{"id": 1}, {"id": 3}]
+
+
+def test_corrupt_record_and_everything_after_it_is_dropped(tmp_path):
+    path = str(tmp_path / "outbox.log")
+    log = OutboxLog(path)
+    log.append([{"id": 1}])
+    first = log.size
+    log.append([{"id": 2}, {"id": 3}])
+    log.close()
+    with open(path, "r+b") as f:
+        f.seek(first + 10)   # Inside the payload of record 2: its checksum no longer matches
+        f.write(b"#")
+
+    recovered = OutboxLog(path)
+    assert recovered.records() == [{"id": 1}]
+    assert os.path.getsize(path) == first
+    recovered.close()
+
+
+def test_rewrite_replaces_the_log(tmp_path):
+    path = str(tmp_path / "outbox.log")
+    log = OutboxLog(path)
+    log.append([{"id": 1}, {"id": 2}])
+    log.rewrite([{"id": 2}])
+    log.append([{"id": 4}])
+    log.close()
+    assert OutboxLog(path).records() == [{"id": 2}, {"id": 4}]
+
+
+class TornFile:
+    """
+    Wraps the log's file so that the next write stores only part of its data, then fails.
+    """
+
+    def __init__(self, file):
+        self.file = file
+
+    def write(self, data):
+        self.file.write(data[:len(data) // 2])
+        raise OSError("disk full")
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+
+def test_failed_append_is_rolled_back(tmp_path):
+    path = str(tmp_path / "outbox.log")
+    log = OutboxLog(path)
+    log.append([{"id": 1}])
+    size = log.size
+
+    log._file = TornFile(log._file)
+    with pytest.raises(OSError):
+        log.append([{"id": 2}])
+    log._file = log._file.file
+    assert log.size == os.path.getsize(path) == size
+
+    log.append([{"id": 3}])
+    log.close()
+    assert OutboxLog(path).records() == [{"id": 1}, {"id": 3}]
+
+
+def test_failed_rewrite_keeps_the_log(tmp_path, monkeypatch):
+    path = str(tmp_path / "outbox.log")
+    log = OutboxLog(path)
+    log.append([{"id": 1}, {"id": 2}])
+
+    def no_space(source, destination):
+        raise OSError(28, "No space left on device")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(os, "replace", no_space)
+        with pytest.raises(OSError):
+            log.rewrite([{"id": 2}])
+    assert not os.path.exists(path + ".tmp")
+    log.append([{"id": 3}])
+    log.close()
+    assert OutboxLog(path).records() == [{"id": 1}, {"id": 2}, {"id": 3}]
@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from src.orchestrator.push import PushHub, SubscriberLimitError, diff
+from tests.helpers import settle
+
+
+class Upstream:
+    """
+    Fetchers serving whatever values the test sets, counting polls per topic.
+    """
+
+    def __init__(self):
+        self.values = {"time": {"epoch": 1, "zone": "UTC"}, "status": {"online": True}}
+        self.polls = {}
+
+    def fetcher(self, kind: str):
+        async def fetch(arg):
+            key = f"{kind}:{arg}" if arg else kind
+            self.polls[key] = self.polls.get(key, 0) + 1
+            return dict(self.values.get(key, {"balance": 0}))
+        return fetch
+
+
+@pytest.fixture
+def upstream():
+    return Upstream()
+
+
+@pytest.fixture
+def make_hub(upstream):
+    def make(**options) -> PushHub:
+        fetchers = {kind: upstream.fetcher(kind) for kind in ("time", "status", "balance")}
+        return PushHub(fetchers, **{"interval": 0.01, "max_lag": 5.0, "max_subscribers": 4, **options})
+    return make
+
+
+def test_diff_reports_changed_and_removed_keys():
+    assert diff({"a": 1, "b": 2, "c": 3}, {"a": 1, "b": 5, "d": 4}) == {"b": 5, "d": 4, "c": None}
+    assert diff({"a": 1}, {"a": 1}) == {}
+
+
+async def test_snapshot_then_only_changed_keys(make_hub, upstream):
+    hub = make_hub()
+    subscriber = await hub.subscribe(["time"])
+    assert await subscriber.next_batch(1.0) == [("time", "snapshot", {"epoch": 1, "zone": "UTC"})]
+    upstream.values["time"] = {"epoch": 2, "zone": "UTC"}
+    assert await subscriber.next_batch(1.0) == [("time", "delta", {"epoch": 2})]
+    await hub.stop()
+
+
+async def test_subscribers_share_one_poller_per_topic(make_hub, upstream):
+    hub = make_hub()
+    first = await hub.subscribe(["status"])
+    await first.next_batch(1.0)
+    second = await hub.subscribe(["status", "status"])
+    assert second.topics == ["status"]
+    assert await second.next_batch(1.0) == [("status", "snapshot", {"online": True})]
+    await asyncio.sleep(0.05)
+    # One poll per interval, not one per subscriber.
+    assert upstream.polls["status"] <= 8
+    await hub.stop()
+
+
+async def test_rejected_subscription_creates_no_topics(make_hub, upstream):
+    hub = make_hub(max_subscribers=1)
+    for keys in (["time", "weather"], ["balance"], ["time:utc"]):
+        with pytest.raises(ValueError):
+            await hub.subscribe(keys)
+    assert hub._topics == {} and hub._subscribers == 0
+    await hub.subscribe(["time"])
+    with pytest.raises(SubscriberLimitError):
+        await hub.subscribe(["balance:alice"])
+    assert list(hub._topics) == ["time"]
+    await settle()
+    assert "balance:alice" not in upstream.polls
+    await hub.stop()
+
+
+async def test_unsubscribing_the_last_subscriber_stops_the_poller(make_hub):
+    hub = make_hub()
+    first, second = await hub.subscribe(["balance:alice"]), await hub.subscribe(["balance:alice"])
+    task = hub._topics["balance:alice"].task
+    hub.unsubscribe(first)
+    hub.unsubscribe(first)   # Idempotent
+    assert not task.done() and hub._subscribers == 1
+    hub.unsubscribe(second)
+    await settle()
+    assert task.cancelled() and hub._topics == {} and hub._subscribers == 0
+    assert second.closed and await second.next_batch(1.0) == []
+
+
+async def test_slow_subscriber_is_dropped_and_its_updates_coalesced(make_hub, upstream):
+    hub = make_hub(max_lag=0.05)
+    slow, fast = await hub.subscribe(["time"]), await hub.subscribe(["time"])
+    await fast.next_batch(1.0)
+    upstream.values["time"] = {"epoch": 2, "zone": "UTC"}
+    await fast.next_batch(1.0)
+    # Snapshot and delta wait as one pending snapshot rather than a growing queue.
+    assert len(slow._pending) == 1 and slow._pending["time"][0] == "snapshot"
+    for epoch in range(3, 20):
+        upstream.values["time"] = {"epoch": epoch, "zone": "UTC"}
+        await fast.next_batch(1.0)
+        if slow.closed:
+            break
+    assert slow.closed and not fast.closed
+    assert hub._topics["time"].subscribers == [fast]
+    await hub.stop()
+
+
+async def test_updates_unsubscribe_when_the_consumer_stops(make_hub):
+    hub = make_hub()
+    subscriber = await hub.subscribe(["time"])
+    updates = hub.updates(subscriber, heartbeat=1.0)
+    assert (await updates.__anext__())[1] == "snapshot"
+    await updates.aclose()
+    assert subscriber.closed and hub._topics == {}
@@ -0,0 +1,91 @@
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from src.api_clients.blockchain_client import BlockchainClient
+from src.api_clients.currency_client import CurrencyClient
+from src.api_clients.network_client import NetworkClient
+from src.api_clients.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, UpstreamGuard, is_transient
+from src.config.settings import settings
+
+
+def status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "http://upstream/")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+def test_latency_percentiles_follow_the_window():
+    tracker, window = LatencyTracker(window=64), []
+    rng = random.Random(3)
+    assert tracker.percentile(50) is None
+    for _ in range(500):
+        sample = rng.random()
+        tracker.record(sample)
+        window = (window + [sample])[-64:]
+        ordered = sorted(window)
+        for p in (50, 95, 99):
+            assert tracker.percentile(p) == ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+    assert len(tracker) == 64
+
+
+def test_adaptive_timeout_tracks_tail_latency(monkeypatch):
+    monkeypatch.setattr(settings, "RESILIENCE_MIN_SAMPLES", 10)
+    adaptive, fixed = UpstreamGuard("test-read"), UpstreamGuard("test-write", adaptive=False)
+    for guard in (adaptive, fixed):
+        assert guard.timeout() == settings.SOCKET_TIMEOUT
+        for _ in range(20):
+            guard.latency.record(0.1)
+    assert adaptive.timeout() == pytest.approx(0.1 * settings.RESILIENCE_TIMEOUT_MULTIPLIER)
+    assert fixed.timeout() == settings.SOCKET_TIMEOUT
+
+
+@pytest.mark.parametrize("client, write_guard", [
+    (BlockchainClient, "blockchain_write"), (CurrencyClient, "currency_write"), (NetworkClient, "network_write")])
+def test_writes_use_a_separate_fixed_timeout_guard(client, write_guard):
+    instance = client("http://upstream")
+    assert instance.write_guard.name == write_guard
+    assert instance.write_guard is not instance.guard
+    assert not instance.write_guard.adaptive and instance.guard.adaptive
+
+
+async def test_breaker_opens_after_consecutive_failures_and_probes_once(monkeypatch):
+    monkeypatch.setattr(settings, "BREAKER_FAILURE_THRESHOLD", 2)
+    guard = UpstreamGuard("test-breaker")
+
+    async def failing():
+        raise status_error(503)
+
+    async def ok():
+        return "ok"
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await guard.call(failing)
+    assert guard.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        await guard.call(ok)
+
+    guard.breaker.opened_at -= guard.breaker.reset_timeout
+    assert await guard.call(ok) == "ok"
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_client_errors_do_not_trip_the_breaker(monkeypatch):
+    monkeypatch.setattr(settings, "BREAKER_FAILURE_THRESHOLD", 1)
+    guard = UpstreamGuard("test-4xx")
+
+    async def not_found():
+        raise status_error(404)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await guard.call(not_found)
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize("error, transient", [
+    (status_error(500), True), (status_error(429), True), (status_error(400), False),
+    (asyncio.TimeoutError(), True), (httpx.ConnectError("refused"), True), (ValueError("bad"), False)])
+def test_is_transient(error, transient):
+    assert is_transient(error) is transient
@@ -0,0 +1,136 @@
+import asyncio
+import os
+
+import pytest
+
+from src.config.settings import settings
+from src.utils.cache import SharedLoadError, SWRCache
+from src.utils.shared_cache import SharedStore
+from tests.helpers import factory
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache")
+
+
+@pytest.fixture
+def make_store(path):
+    stores = []
+
+    def make(slots: int = 16, slot_size: int = 512, pid: int = None) -> SharedStore:
+        store = SharedStore(path, slots, slot_size)
+        if pid is not None:
+            store._pid = pid   # Stands in for another worker process on the same file
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def test_values_are_shared_between_handles(make_store):
+    writer, reader = make_store(), make_store()
+    assert writer.put("status", {"peers": [1, 2], "pair": (3, 4)})
+    found = reader.get("status")
+    assert found.value == {"peers": [1, 2], "pair": [3, 4]} and found.age < 1
+    assert reader.get("other") is None
+
+
+def test_values_that_do_not_fit_or_are_not_json_are_refused(make_store):
+    store = make_store(slot_size=128)
+    assert not store.put("big", "x" * 200)
+    assert not store.put("object", object())
+    assert store.get("big") is None and store.get("object") is None
+
+
+def test_file_must_be_private(path, make_store):
+    with open(path, "wb"):
+        pass
+    os.chmod(path, 0o644)
+    with pytest.raises(PermissionError):
+        make_store()
+
+
+def test_symlinks_are_not_followed(path, tmp_path, make_store):
+    os.symlink(str(tmp_path / "elsewhere"), path)
+    with pytest.raises(OSError):
+        make_store()
+    assert not os.path.exists(tmp_path / "elsewhere")
+
+
+def test_other_layout_is_replaced_without_breaking_existing_handles(make_store):
+    old = make_store(slots=16)
+    old.put("key", 1)
+    new = make_store(slots=32)
+    assert new.get("key") is None
+    new.put("key", 2)
+    # The old handle keeps its own (now unlinked) mapping instead of faulting on a shrunk file.
+    assert old.get("key").value == 1
+
+
+def test_one_lease_holder_at_a_time(make_store):
+    first, second = make_store(pid=1001), make_store(pid=1002)
+    assert first.acquire_lease("key", 5)
+    assert first.acquire_lease("key", 5)   # Re-entrant for its holder
+    assert not second.acquire_lease("key", 5)
+    assert second.lease_held("key")
+    first.release_lease("key")
+    assert not second.lease_held("key")
+    assert second.acquire_lease("key", 5)
+    assert not first.acquire_lease("key", 5)
+    assert first.acquire_lease("expired", -1) and second.acquire_lease("expired", 5)
+
+
+@pytest.fixture
+def short_lease(monkeypatch):
+    monkeypatch.setattr(settings, "SHARED_CACHE_LEASE", 0.5)
+
+
+async def test_workers_load_a_shared_key_once(make_store, short_lease):
+    make_cache = factory(SWRCache, "test", ttl=10, max_stale=0, negative_ttl=5, max_entries=10)
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"value": 1}
+
+    caches = [make_cache(shared=make_store(pid=pid)) for pid in (2001, 2002, 2003)]
+    results = await asyncio.gather(*(cache.get("k", load) for cache in caches))
+    assert [result.value for result in results] == [{"value": 1}] * 3
+    assert len(calls) == 1
+
+
+async def test_waiting_workers_fail_fast_with_the_loaders_error(make_store, short_lease):
+    make_cache = factory(SWRCache, "test", ttl=10, max_stale=0, negative_ttl=5, max_entries=10)
+    holder, waiter = make_cache(shared=make_store(pid=3001)), make_cache(shared=make_store(pid=3002))
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("upstream down")
+
+    async def unused():
+        raise AssertionError("the waiting worker must not load the key itself")
+
+    loading = asyncio.ensure_future(holder.get("k", failing))
+    await asyncio.sleep(0.01)
+    started = asyncio.get_running_loop().time()
+    with pytest.raises(SharedLoadError, match="upstream down"):
+        await waiter.get("k", unused)
+    assert asyncio.get_running_loop().time() - started < 0.3
+    with pytest.raises(RuntimeError):
+        await loading
+
+
+async def test_waiting_worker_loads_itself_once_the_lease_lapses(make_store, short_lease):
+    make_cache = factory(SWRCache, "test", ttl=10, max_stale=0, negative_ttl=5, max_entries=10)
+    stuck = make_store(pid=4001)
+    assert stuck.acquire_lease("test:k", 0.1)   # A worker that took the lease and went away
+    waiter = make_cache(shared=make_store(pid=4002))
+
+    async def load():
+        return "local"
+
+    assert (await waiter.get("k", load)).value == "local"
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from src.orchestrator.ledger_replica import summarize_history
+from src.storage import transaction_columns
+from src.storage.transaction_columns import TransactionColumns
+
+USERS = [f"user{i}" for i in range(12)]
+
+
+def ledger(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [{"sender": rng.choice(USERS), "receiver": rng.choice(USERS), "amount": round(rng.uniform(1, 100), 2),
+             "timestamp": 1000.0 + i, "transaction_id": f"{i:08x}"} for i in range(count)]
+
+
+def assert_same_history(actual: dict, expected: dict) -> None:
+    assert actual["summary"] == pytest.approx(expected["summary"])
+    assert [c["user_id"] for c in actual["top_counterparties"]] == [c["user_id"] for c in expected["top_counterparties"]]
+    for got, want in zip(actual["top_counterparties"], expected["top_counterparties"]):
+        assert got == pytest.approx(want)
+    assert actual["transactions"] == expected["transactions"]
+
+
+@pytest.mark.parametrize("chunk", [1, 37, 5000])
+def test_history_matches_the_plain_python_summary(chunk, monkeypatch):
+    # A small reindex threshold exercises both the main and the tail index.
+    monkeypatch.setattr(transaction_columns, "_MIN_REINDEX", 64)
+    transactions = ledger(2000)
+    columns = TransactionColumns()
+    for start in range(0, len(transactions), chunk):
+        columns.append(transactions[start:start + chunk])
+    assert len(columns) == 2000
+    for user in ("user0", "user5"):
+        mine = [tx for tx in transactions if user in (tx["sender"], tx["receiver"])]
+        for since, until, limit, top in ((None, None, 100, 10), (1500.0, 1800.0, 5, 3), (None, 1200.0, 0, 0)):
+            assert_same_history(columns.history(user, since, until, limit, top),
+                                summarize_history(mine, user, since, until, limit, top))
+
+
+def test_self_transfers_count_once_each_way():
+    columns = TransactionColumns()
+    columns.append([{"sender": "a", "receiver": "a", "amount": 5, "timestamp": 1}])
+    summary = columns.history("a")["summary"]
+    assert (summary["sent_count"], summary["received_count"], summary["net"]) == (1, 1, 0.0)
+    assert len(columns.history("a")["transactions"]) == 1
+
+
+def test_unknown_user_has_an_empty_history():
+    columns = TransactionColumns()
+    columns.append(ledger(10))
+    history = columns.history("nobody")
+    assert history["summary"]["sent_count"] == 0
+    assert history["top_counterparties"] == history["transactions"] == []
+
+
+def test_malformed_rows_are_skipped_alone():
+    rows = [
+        {"sender": "a", "receiver": "b", "amount": "x", "timestamp": 1},
+        {"sender": "a", "receiver": "b", "amount": 1, "timestamp": None},
+        {"sender": "a", "receiver": "b", "amount": 10 ** 400, "timestamp": 1},
+        {"sender": "a", "receiver": "b", "timestamp": 1},
+        "not a transaction",
+        {"sender": "a", "receiver": "c", "amount": "2.5", "timestamp": 2},
+    ]
+    columns = TransactionColumns()
+    assert columns.append(rows) == 1
+    assert columns.user_count == 2
+    expected = summarize_history(rows[:4] + rows[5:], "a")
+    assert_same_history(columns.history("a"), expected)
+    assert columns.history("a")["transactions"] == [{"sender": "a", "receiver": "c", "amount": 2.5, "timestamp": 2.0}]
@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.orchestrator.tx_pipeline import PipelineFullError, TransactionPipeline
+from tests.helpers import factory, settle
+
+
+def refused(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://blockchain/blockchain/transactions")
+    return httpx.HTTPStatusError("refused", request=request, response=httpx.Response(status, request=request))
+
+
+class FakeBlockchain:
+    """
+    Records bulk and single submissions; a bulk call containing a negative amount is refused
+    as a whole, and a single call with one is refused alone. Bulk calls wait for gate.
+    """
+
+    def __init__(self):
+        self.batches = []
+        self.singles = []
+        self.gate = asyncio.Event()
+        self.gate.set()
+
+    async def submit_transactions_async(self, transactions: list) -> list:
+        self.batches.append([tx["amount"] for tx in transactions])
+        await self.gate.wait()
+        if any(tx["amount"] < 0 for tx in transactions):
+            raise refused(400)
+        return [{"transaction_id": f"tx-{tx['amount']}"} for tx in transactions]
+
+    async def submit_transaction_async(self, transaction: dict) -> dict:
+        self.singles.append(transaction["amount"])
+        if transaction["amount"] < 0:
+            raise refused(400)
+        return {"transaction_id": f"tx-{transaction['amount']}"}
+
+
+@pytest.fixture
+def blockchain():
+    return FakeBlockchain()
+
+
+@pytest.fixture
+def make_pipeline(blockchain):
+    return factory(TransactionPipeline, blockchain, max_queue_depth=100, max_batch_size=4, linger=0.01,
+                   max_in_flight_batches=2)
+
+
+async def test_transactions_are_submitted_in_batches(make_pipeline, blockchain):
+    pipeline = make_pipeline()
+    results = await asyncio.gather(*(pipeline.submit({"amount": i}) for i in range(10)))
+    await pipeline.stop()
+    assert [r["transaction_id"] for r in results] == [f"tx-{i}" for i in range(10)]
+    assert [len(batch) for batch in blockchain.batches] == [4, 4, 2]
+    assert blockchain.singles == []
+
+
+async def test_refused_batch_is_split_so_only_the_offender_fails(make_pipeline, blockchain):
+    pipeline = make_pipeline()
+    results = await asyncio.gather(*(pipeline.submit({"amount": a}) for a in (1, -1, 2)), return_exceptions=True)
+    await pipeline.stop()
+    assert results[0]["transaction_id"] == "tx-1" and results[2]["transaction_id"] == "tx-2"
+    assert isinstance(results[1], httpx.HTTPStatusError)
+    assert sorted(blockchain.singles) == [-1, 1, 2]
+
+
+async def test_stop_submits_a_batch_still_lingering(make_pipeline, blockchain):
+    pipeline = make_pipeline(linger=60)
+    pending = [asyncio.ensure_future(pipeline.submit({"amount": i})) for i in range(2)]
+    await settle()
+    assert blockchain.batches == []
+    await pipeline.stop()
+    assert [(await future)["transaction_id"] for future in pending] == ["tx-0", "tx-1"]
+    assert blockchain.batches == [[0, 1]]
+
+
+async def test_full_queue_pushes_back(make_pipeline, blockchain):
+    pipeline = make_pipeline(max_queue_depth=2, max_batch_size=1, linger=0, max_in_flight_batches=1)
+    blockchain.gate.clear()
+    # One batch in flight and one taken by the worker waiting for a slot; the rest stay queued.
+    pending = []
+    for i in range(4):
+        pending.append(asyncio.ensure_future(pipeline.submit({"amount": i})))
+        await settle()
+    assert pipeline.depth == 2
+    with pytest.raises(PipelineFullError) as raised:
+        await pipeline.submit({"amount": 4})
+    assert raised.value.retry_after >= 1
+    blockchain.gate.set()
+    assert len(await asyncio.gather(*pending)) == 4
+    await pipeline.stop()
@@ -0,0 +1,93 @@
+import pytest
+
+from src.orchestrator.validation import TransactionValidationError, TransactionValidator
+from tests.helpers import factory
+
+NOW = 1_700_000_000.0
+
+make_validator = factory(TransactionValidator, max_amount=1000, max_past_skew=60, max_future_skew=5,
+                         clock=lambda: NOW)
+
+
+def transaction(**overrides) -> dict:
+    return {"sender": "alice", "receiver": "bob", "amount": 50, "timestamp": NOW, **overrides}
+
+
+def errors_of(tx) -> list:
+    with pytest.raises(TransactionValidationError) as raised:
+        make_validator().validate(tx)
+    return raised.value.errors
+
+
+def test_valid_transaction_is_normalized():
+    validated = make_validator().validate(transaction(amount=50))
+    assert validated.to_dict() == {"sender": "alice", "receiver": "bob", "amount": 50.0, "timestamp": NOW}
+    assert type(validated.amount) is float
+
+
+def test_fingerprint_identifies_identical_content():
+    validator = make_validator()
+    first = validator.validate(transaction())
+    assert first.fingerprint() == validator.validate(transaction()).fingerprint()
+    assert first.fingerprint() != validator.validate(transaction(amount=51)).fingerprint()
+
+
+def test_every_problem_is_reported():
+    assert errors_of({"sender": "", "amount": -1, "extra": 1}) == [
+        "unknown field(s): extra",
+        "missing field(s): receiver, timestamp",
+        "sender must be a non-empty string",
+        "amount must be positive",
+    ]
+
+
+def test_non_object_is_rejected():
+    assert errors_of(["alice", "bob"]) == ["transaction must be a JSON object"]
+
+
+def test_sender_and_receiver_must_differ():
+    assert errors_of(transaction(receiver="alice")) == ["sender and receiver must differ"]
+
+
+@pytest.mark.parametrize("field", ["sender", "receiver"])
+@pytest.mark.parametrize("value", [None, "", 7])
+def test_parties_must_be_non_empty_strings(field, value):
+    assert errors_of(transaction(**{field: value})) == [f"{field} must be a non-empty string"]
+
+
+@pytest.mark.parametrize("amount", [None, True, "50", [50], float("nan"), float("inf"), -float("inf")])
+def test_amount_must_be_a_finite_number(amount):
+    assert errors_of(transaction(amount=amount)) == ["amount must be a finite number"]
+
+
+@pytest.mark.parametrize("timestamp", [None, False, "now", float("nan")])
+def test_timestamp_must_be_a_finite_number(timestamp):
+    assert errors_of(transaction(timestamp=timestamp)) == ["timestamp must be a finite number"]
+
+
+def test_amount_bounds():
+    assert errors_of(transaction(amount=0)) == ["amount must be positive"]
+    assert errors_of(transaction(amount=1000.5)) == ["amount exceeds the maximum of 1000"]
+    assert make_validator().validate(transaction(amount=1000)).amount == 1000.0
+
+
+def test_huge_integers_are_validation_errors_not_overflows():
+    # 10**400 cannot be converted to float; it must be rejected by the bounds, not raise OverflowError.
+    assert errors_of(transaction(amount=10 ** 400)) == ["amount exceeds the maximum of 1000"]
+    assert errors_of(transaction(amount=-10 ** 400)) == ["amount must be positive"]
+    assert errors_of(transaction(timestamp=10 ** 400)) == ["timestamp is more than 5s in the future"]
+    assert errors_of(transaction(timestamp=-10 ** 400)) == ["timestamp is more than 60s in the past"]
+
+
+def test_timestamp_skew():
+    assert errors_of(transaction(timestamp=NOW - 61)) == ["timestamp is more than 60s in the past"]
+    assert errors_of(transaction(timestamp=NOW + 6)) == ["timestamp is more than 5s in the future"]
+
+
+def test_validate_batch_reports_each_item():
+    results = make_validator().validate_batch(
+        [transaction(), transaction(amount=0), "nope", transaction(amount=None, sender=None)])
+    assert results[0].amount == 50.0
+    assert results[1].errors == ["amount must be positive"]
+    assert results[2].errors == ["transaction must be a JSON object"]
+    assert results[3].errors == ["sender must be a non-empty string", "amount must be a finite number"]